@@ -0,0 +1,75 @@
+"""
+Benchmark of the startup cost of short-lived processes which use datetime_matcher,
+as reported by `python -X importtime`, and as wall time of whole processes.
+
+Each statement runs in a fresh interpreter, so that nothing is already imported or cached.
+
+Run from the repository root with:
+    python benchmarks/bench_import.py
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "import": "import datetime_matcher",
+    "construct": "from datetime_matcher import DatetimeMatcher; DatetimeMatcher()",
+    "compile": (
+        "from datetime_matcher import DatetimeMatcher; "
+        "DatetimeMatcher().compile(r'%Y-%m-%d %H:%M:%S')"
+    ),
+    "compile names": (
+        "from datetime_matcher import DatetimeMatcher; "
+        "DatetimeMatcher().compile(r'%a, %d %b %Y')"
+    ),
+}
+
+NUM_RUNS = 15
+
+
+def get_import_time_us(statement: str) -> int:
+    """Returns the total time spent importing modules while running statement, in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only count top-level imports, since nested ones are included in their cumulative time
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total
+
+
+def get_wall_time_ms(statement: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    baseline_ms = statistics.median(get_wall_time_ms("pass") for _ in range(NUM_RUNS))
+    print(f"bare interpreter: {baseline_ms:.1f} ms")
+    for label, statement in STATEMENTS.items():
+        import_ms = (
+            statistics.median(get_import_time_us(statement) for _ in range(NUM_RUNS))
+            / 1000
+        )
+        wall_ms = statistics.median(
+            get_wall_time_ms(statement) for _ in range(NUM_RUNS)
+        )
+        print(
+            f"{label:>14}: imports {import_ms:6.1f} ms, "
+            f"process {wall_ms:6.1f} ms (+{wall_ms - baseline_ms:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
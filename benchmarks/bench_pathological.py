@@ -0,0 +1,56 @@
+"""
+Benchmark of near-miss inputs which make the regexes generated from some dfregexes backtrack
+heavily, comparing the default mode with safe mode (DatetimeMatcher(is_safe=True)).
+
+Each dfregex is first checked to find the same match in both modes on a valid input,
+so that the timings compare the same pattern with and without the backtracking.
+
+Run from the repository root with:
+    python benchmarks/bench_pathological.py
+"""
+
+import timeit
+
+from datetime_matcher import DatetimeMatcher
+
+# (dfregex, valid text, near-miss text) triples, where the near-miss text contains the dfregex's
+# required literals so that the literal prefilter does not skip the regex scan. In the default mode,
+# every start position in its run of digits is tried, and each scans to the end of the text.
+CASES = [
+    (r"%-d[^!]*!", "day 5 done!", "!" + "1" * 5_000 + " ?"),
+    (r"%-m%-d%-H%-M[^!]*!", "at 12251030 ok!", "!" + "1" * 2_000 + " ?"),
+    (r"%-j%-H[^;]*;", "day 3651 end;", ";" + "1" * 3_000 + " ."),
+]
+
+
+def main() -> None:
+    default_matcher = DatetimeMatcher()
+    safe_matcher = DatetimeMatcher(is_safe=True)
+    for dfregex, valid_text, near_miss_text in CASES:
+        default_pattern = default_matcher.compile(dfregex)
+        safe_pattern = safe_matcher.compile(dfregex)
+        default_match = default_pattern.search(valid_text)
+        safe_match = safe_pattern.search(valid_text)
+        assert default_match is not None and safe_match is not None, dfregex
+        assert default_match.span() == safe_match.span(), dfregex
+        assert default_pattern.extract_datetime(
+            valid_text
+        ) == safe_pattern.extract_datetime(valid_text), dfregex
+        default_seconds = min(
+            timeit.repeat(
+                lambda: default_pattern.search(near_miss_text), number=1, repeat=3
+            )
+        )
+        safe_seconds = min(
+            timeit.repeat(
+                lambda: safe_pattern.search(near_miss_text), number=1, repeat=3
+            )
+        )
+        print(
+            f"{dfregex!r:<24} ({len(near_miss_text)} characters): "
+            f"default {default_seconds:.4f}s, safe {safe_seconds:.4f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
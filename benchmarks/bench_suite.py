@@ -0,0 +1,342 @@
+"""
+Benchmark suite covering each stage of datetime_matcher: lexing, regex generation,
+compiling, matching, extraction and substitution, over synthetic corpora of filenames,
+syslog lines, ISO timestamps and near-miss adversarial inputs, from small to very large texts.
+
+For each benchmark, reports the best time per call (with timeit), and the peak and retained
+memory allocated by one call (with tracemalloc). Results can be saved as a JSON baseline,
+and later runs compared against it, failing if any benchmark regressed by more than a threshold.
+Only the standard library is needed.
+
+Run from the repository root with, e.g.:
+    python benchmarks/bench_suite.py                                  # run and print
+    python benchmarks/bench_suite.py --save baseline.json             # store a baseline
+    python benchmarks/bench_suite.py --compare baseline.json          # gate on a baseline
+    python benchmarks/bench_suite.py --filter sub --quick             # a quick subset
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from datetime_matcher.datetime_extractor import DatetimeExtractor
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.dfregex_lexer import DfregexLexer
+from datetime_matcher.regex_generator import RegexGenerator
+
+FILENAME_DFREGEX = r"(\w+)_%Y%m%d_%H%M%S\.jpg"
+SYSLOG_DFREGEX = r"(?m)^%b +%-d %H:%M:%S (\S+) (\w+)\[(\d+)\]: "
+ISO_DFREGEX = r"%Y-%m-%dT%H:%M:%S\.%f%z"
+NEAR_MISS_DFREGEX = r"%Y-%m-%d %H:%M"
+LONG_FORM_DFREGEX = r"%A, %B %-d, %Y at %-I:%M %p"
+
+DFREGEXES = {
+    "filename": FILENAME_DFREGEX,
+    "syslog": SYSLOG_DFREGEX,
+    "iso": ISO_DFREGEX,
+    "near_miss": NEAR_MISS_DFREGEX,
+    "long_form": LONG_FORM_DFREGEX,
+}
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+
+
+class BenchmarkResult(NamedTuple):
+    seconds: float
+    peak_bytes: int
+    retained_bytes: int
+
+
+# ==================== synthetic corpora ====================
+
+
+def _random_datetimes(rng: random.Random, num: int) -> List[datetime]:
+    start = datetime(2000, 1, 1)
+    return [
+        start + timedelta(seconds=rng.randrange(30 * 365 * 24 * 3600))
+        for _ in range(num)
+    ]
+
+
+def make_filenames(rng: random.Random, num: int) -> List[str]:
+    words = ["IMG", "VID", "scan", "photo", "backup", "export"]
+    return [
+        f"{rng.choice(words)}_{dt:%Y%m%d_%H%M%S}.jpg"
+        for dt in _random_datetimes(rng, num)
+    ]
+
+
+def make_syslog_lines(rng: random.Random, num: int) -> List[str]:
+    hosts = ["web01", "web02", "db01", "cache", "gateway"]
+    daemons = ["sshd", "cron", "kernel", "nginx", "systemd"]
+    return [
+        f"{dt:%b} {dt.day:2} {dt:%H:%M:%S} {rng.choice(hosts)} {rng.choice(daemons)}[{rng.randrange(1, 65536)}]: "
+        f"session {rng.randrange(10 ** 6)} opened for user u{rng.randrange(1000)}"
+        for dt in _random_datetimes(rng, num)
+    ]
+
+
+def make_iso_timestamps(rng: random.Random, num: int) -> List[str]:
+    return [
+        f"event={rng.randrange(10 ** 6)} at={dt:%Y-%m-%dT%H:%M:%S}.{rng.randrange(10 ** 6):06}"
+        f"{rng.choice(['+', '-'])}{rng.randrange(13):02}{rng.choice(['00', '30'])} ok"
+        for dt in _random_datetimes(rng, num)
+    ]
+
+
+def make_near_misses(rng: random.Random, num: int) -> List[str]:
+    """Lines full of things which almost match %Y-%m-%d %H:%M, and rarely do."""
+    lines = []
+    for idx in range(num):
+        parts = [
+            f"{rng.randrange(10 ** 4):04}-{rng.randrange(13, 99)}-{rng.randrange(10, 32)}",
+            f"{rng.randrange(1000, 9999)}-{rng.randrange(1, 13):02}-{rng.randrange(32, 99)} 12:34",
+            f"{rng.randrange(1000, 9999)}-{rng.randrange(1, 13):02}-{rng.randrange(1, 29):02} 24:{rng.randrange(60):02}",
+            "1" * rng.randrange(20, 60) + "-01-01 " + "9" * rng.randrange(5, 20),
+        ]
+        if idx % 100 == 0:
+            parts.append("2021-06-15 08:30")
+        lines.append(" ".join(parts))
+    return lines
+
+
+def make_long_form_lines(rng: random.Random, num: int) -> List[str]:
+    return [
+        f"Scheduled for {dt:%A, %B} {dt.day}, {dt.year} at {dt.hour % 12 or 12}:{dt:%M %p} in room {rng.randrange(100)}"
+        for dt in _random_datetimes(rng, num)
+    ]
+
+
+def make_corpora(seed: int = 0) -> Dict[str, List[str]]:
+    """Returns the lines of each corpus, keyed like DFREGEXES."""
+    rng = random.Random(seed)
+    return {
+        "filename": make_filenames(rng, 10_000),
+        "syslog": make_syslog_lines(rng, 10_000),
+        "iso": make_iso_timestamps(rng, 10_000),
+        "near_miss": make_near_misses(rng, 2_000),
+        "long_form": make_long_form_lines(rng, 10_000),
+    }
+
+
+# ==================== benchmarks ====================
+
+
+def make_benchmarks(corpora: Dict[str, List[str]]) -> List[Benchmark]:
+    lexer = DfregexLexer()
+    generator = RegexGenerator()
+    extractor = DatetimeExtractor()
+    uncached_matcher = DatetimeMatcher(cache_size=0)
+    matcher = DatetimeMatcher()
+    benchmarks = []
+    for corpus_name, dfregex in DFREGEXES.items():
+        lines = corpora[corpus_name]
+        tokens = list(lexer.tokenize(dfregex))
+        pattern = matcher.compile(dfregex)
+        small_text = lines[0]
+        medium_text = "\n".join(lines[:100])
+        large_text = "\n".join(lines)
+        # Bind the loop variables as defaults, since the lambdas run later
+        benchmarks += [
+            Benchmark(
+                f"lex/{corpus_name}",
+                lambda dfregex=dfregex: list(lexer.tokenize(dfregex)),
+            ),
+            Benchmark(
+                f"generate/{corpus_name}",
+                lambda tokens=tokens: generator.generate_regex(tokens, True),
+            ),
+            Benchmark(
+                f"compile/{corpus_name}",
+                lambda dfregex=dfregex: uncached_matcher.compile(dfregex),
+            ),
+            Benchmark(
+                f"search/{corpus_name}/lines",
+                lambda pattern=pattern, lines=lines: [
+                    pattern.search(line) for line in lines
+                ],
+            ),
+            Benchmark(
+                f"findall/{corpus_name}/large",
+                lambda pattern=pattern, text=large_text: pattern.findall(text),
+            ),
+            Benchmark(
+                f"extract/{corpus_name}/small",
+                lambda tokens=tokens, pattern=pattern, text=small_text: list(
+                    extractor.extract_datetimes(pattern.extractor_regex, tokens, text)
+                ),
+            ),
+            Benchmark(
+                f"extract/{corpus_name}/medium",
+                lambda tokens=tokens, pattern=pattern, text=medium_text: list(
+                    extractor.extract_datetimes(pattern.extractor_regex, tokens, text)
+                ),
+            ),
+            Benchmark(
+                f"extract/{corpus_name}/large",
+                lambda pattern=pattern, text=large_text: list(
+                    pattern.extract_datetimes(text)
+                ),
+            ),
+            Benchmark(
+                f"extract_many/{corpus_name}/lines",
+                lambda pattern=pattern, lines=lines: pattern.extract_datetimes_many(
+                    lines, 1
+                ),
+            ),
+            Benchmark(
+                f"sub/{corpus_name}/small",
+                lambda dfregex=dfregex, text=small_text: matcher.sub(
+                    dfregex, r"<%Y%m%d>", text
+                ),
+            ),
+            Benchmark(
+                f"sub/{corpus_name}/large",
+                lambda dfregex=dfregex, text=large_text: matcher.sub(
+                    dfregex, r"<%Y%m%d>", text
+                ),
+            ),
+        ]
+    return benchmarks
+
+
+def measure(
+    func: Callable[[], Any], min_seconds: float, repeat: int
+) -> BenchmarkResult:
+    """Returns the best time per call of func, and the memory allocated by one call of it."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_seconds / 0.2))
+    seconds = min(timer.repeat(repeat, number)) / number
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return BenchmarkResult(seconds, peak_bytes, retained_bytes)
+
+
+# ==================== reporting ====================
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def _format_bytes(num_bytes: float) -> str:
+    for unit, scale in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if num_bytes >= scale:
+            return f"{num_bytes / scale:8.1f} {unit}"
+    return f"{num_bytes:8.0f} B  "
+
+
+def compare(
+    results: Dict[str, BenchmarkResult],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> List[str]:
+    """Prints each benchmark's change from the baseline, and returns the names of those which regressed."""
+    regressions = []
+    baseline_results = baseline["results"]
+    print(f"\n{'benchmark':<34} {'time':>10} {'peak memory':>12}")
+    for name, result in results.items():
+        if name not in baseline_results:
+            print(f"{name:<34} {'new':>10}")
+            continue
+        time_ratio = result.seconds / baseline_results[name]["seconds"]
+        memory_ratio = (result.peak_bytes + 1) / (
+            baseline_results[name]["peak_bytes"] + 1
+        )
+        is_regression = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        if is_regression:
+            regressions.append(name)
+        print(
+            f"{name:<34} {time_ratio:9.2f}x {memory_ratio:11.2f}x"
+            f"{'  REGRESSED' if is_regression else ''}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument(
+        "--save", metavar="PATH", help="save the results as a JSON baseline"
+    )
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare against a JSON baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="the slowdown or memory growth over the baseline which counts as a regression (default 0.15)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="time each benchmark for less long"
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = [
+        benchmark
+        for benchmark in make_benchmarks(make_corpora())
+        if args.filter in benchmark.name
+    ]
+    min_seconds, repeat = (0.05, 3) if args.quick else (0.2, 5)
+    results: Dict[str, BenchmarkResult] = {}
+    print(f"{'benchmark':<34} {'time/call':>11} {'peak memory':>12} {'retained':>12}")
+    for benchmark in benchmarks:
+        result = measure(benchmark.func, min_seconds, repeat)
+        results[benchmark.name] = result
+        print(
+            f"{benchmark.name:<34} {_format_seconds(result.seconds):>11} "
+            f"{_format_bytes(result.peak_bytes):>12} {_format_bytes(result.retained_bytes):>12}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": {
+                        name: result._asdict() for name, result in results.items()
+                    },
+                },
+                baseline_file,
+                indent=2,
+            )
+        print(f"\nSaved the results to {args.save}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}"
+            )
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Multi-threaded stress benchmark of a DatetimeMatcher shared by a ThreadPoolExecutor,
+reporting the extraction throughput and the speedup over one thread for each number of threads.
+
+Extraction takes no locks, so on a free-threaded (no-GIL) CPython build the throughput
+should grow with the number of threads, up to the number of cores. With the GIL,
+expect no speedup; the benchmark then only checks that sharing costs nothing.
+
+Run from the repository root with:
+    python benchmarks/bench_threads.py
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from datetime_matcher import DatetimeMatcher
+
+DFREGEX = r"\[%d/%b/%Y:%H:%M:%S %z\]"
+NUM_TEXTS_PER_TASK = 20_000
+NUM_TASKS = 32
+
+
+def make_texts() -> list:
+    start = datetime(2020, 1, 1)
+    return [
+        f'127.0.0.1 - - [{(start + timedelta(minutes=idx)).strftime("%d/%b/%Y:%H:%M:%S")} +0000] "GET / HTTP/1.1" 200'
+        for idx in range(NUM_TEXTS_PER_TASK)
+    ]
+
+
+def run(dtmatcher: DatetimeMatcher, texts: list, num_threads: int) -> float:
+    """Returns the number of texts extracted per second, with num_threads threads sharing the matcher."""
+    pattern = dtmatcher.compile(DFREGEX)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        for _ in executor.map(
+            lambda _: pattern.extract_datetimes_many(texts), range(NUM_TASKS)
+        ):
+            pass
+    return NUM_TASKS * len(texts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled'}, {os.cpu_count()} CPUs"
+    )
+    dtmatcher = DatetimeMatcher()
+    texts = make_texts()
+    # Warm up
+    run(dtmatcher, texts, 1)
+    base_throughput = run(dtmatcher, texts, 1)
+    for num_threads in (1, 2, 4, 8, 16):
+        throughput = run(dtmatcher, texts, num_threads)
+        print(
+            f"{num_threads:>2} threads: {throughput:>10,.0f} texts/s "
+            f"({throughput / base_throughput:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
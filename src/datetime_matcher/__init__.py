@@ -1,2 +1,35 @@
-# Make public names available at top level
-from .datetime_matcher import DatetimeMatcher
+# Make public names available at top level, importing their modules on first use (PEP 562),
+# so that importing the package itself stays cheap
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .datetime_matcher import DatetimeMatcher
+    from .dfregex_pattern import DfregexPattern
+    from .dfregex_set import DfregexSet
+    from .instrumentation import MatcherHooks, MatcherStats, MatcherStatsInfo
+
+_MODULE_NAME_BY_PUBLIC_NAME = {
+    "DatetimeMatcher": ".datetime_matcher",
+    "DfregexPattern": ".dfregex_pattern",
+    "DfregexSet": ".dfregex_set",
+    "MatcherHooks": ".instrumentation",
+    "MatcherStats": ".instrumentation",
+    "MatcherStatsInfo": ".instrumentation",
+}
+
+__all__ = list(_MODULE_NAME_BY_PUBLIC_NAME)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _MODULE_NAME_BY_PUBLIC_NAME.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Later lookups find the name directly, without going through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
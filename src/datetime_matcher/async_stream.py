@@ -0,0 +1,230 @@
+import asyncio
+import codecs
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+)
+
+from datetime_matcher.datetime_stream import (
+    DEFAULT_ASYNC_CHUNK_SIZE,
+    DEFAULT_OVERLAP,
+    ChunkedMatchScanner,
+    StreamFraming,
+)
+
+T = TypeVar("T")
+
+
+class _StreamDecoder:
+    """Turns the data read from a stream into the str or bytes which a regex scans."""
+
+    def __init__(self, regex: Pattern[Any], encoding: str):
+        self.__is_bytes_regex = isinstance(regex.pattern, bytes)
+        self.__decoder = (
+            None if self.__is_bytes_regex else codecs.getincrementaldecoder(encoding)()
+        )
+
+    # public
+    def decode(self, data: Any, is_final: bool = False) -> Any:
+        if isinstance(data, str):
+            if self.__is_bytes_regex:
+                raise TypeError("Cannot scan a text stream with a bytes pattern")
+            return data
+        if self.__decoder is None:
+            return bytes(data)
+        return self.__decoder.decode(data, is_final)
+
+
+class _LineFramer:
+    """Splits decoded data into blocks of complete lines, each with the offset of its start in the stream."""
+
+    def __init__(self, empty: Any):
+        self.__newline = b"\n" if isinstance(empty, bytes) else "\n"
+        self.__pending = empty
+        self.__offset = 0
+
+    # public
+    def feed(self, data: Any, is_final: bool = False) -> Tuple[int, Any]:
+        data = self.__pending + data
+        cut = len(data) if is_final else data.rfind(self.__newline) + 1
+        self.__pending = data[cut:]
+        offset = self.__offset
+        self.__offset += cut
+        return offset, data[:cut]
+
+
+class _MatchProcessor:
+    """Finds the matches in each piece of a stream and turns them into records, synchronously."""
+
+    def __init__(
+        self,
+        regex: Pattern[Any],
+        create_record: Callable[[int, Match[Any]], Optional[T]],
+        framing: StreamFraming,
+        overlap: int,
+        encoding: str,
+    ):
+        self.__regex = regex
+        self.__create_record = create_record
+        self.__decoder = _StreamDecoder(regex, encoding)
+        self.__scanner = (
+            ChunkedMatchScanner(regex, overlap) if framing == "chunk" else None
+        )
+        self.__line_framer = _LineFramer(regex.pattern[:0])
+
+    # public
+    def feed(self, data: Any, is_final: bool = False) -> List[T]:
+        text = self.__decoder.decode(data, is_final)
+        if self.__scanner is not None:
+            matches = self.__scanner.feed(text)
+            if is_final:
+                matches += self.__scanner.finish()
+        else:
+            offset, lines = self.__line_framer.feed(text, is_final)
+            matches = [
+                (offset + match.start(), match)
+                for match in self.__regex.finditer(lines)
+            ]
+        records = []
+        for offset, match in matches:
+            record = self.__create_record(offset, match)
+            if record is not None:
+                records.append(record)
+        return records
+
+
+class _SubProcessor:
+    """Substitutes the matches in each piece of a stream, synchronously, returning the output so far."""
+
+    def __init__(
+        self,
+        regex: Pattern[Any],
+        handler: Callable[[Match[Any]], Any],
+        framing: StreamFraming,
+        overlap: int,
+        encoding: str,
+    ):
+        if overlap < 0:
+            raise ValueError(f"overlap must be non-negative, got {overlap}")
+        self.__regex = regex
+        self.__handler = handler
+        self.__framing = framing
+        self.__overlap = overlap
+        self.__decoder = _StreamDecoder(regex, encoding)
+        self.__line_framer = _LineFramer(regex.pattern[:0])
+        self.__buffer: Any = regex.pattern[:0]
+
+    # public
+    def feed(self, data: Any, is_final: bool = False) -> Any:
+        text = self.__decoder.decode(data, is_final)
+        if self.__framing == "line":
+            _, lines = self.__line_framer.feed(text, is_final)
+            return self.__regex.sub(self.__handler, lines)
+        buffer = self.__buffer + text
+        limit = len(buffer) if is_final else len(buffer) - self.__overlap
+        parts = []
+        substituted_end = 0
+        for match in self.__regex.finditer(buffer):
+            # Leave matches which could still grow or change with more data, as per ChunkedMatchScanner
+            if match.end() > limit:
+                break
+            parts.append(buffer[substituted_end : match.start()])
+            parts.append(self.__handler(match))
+            substituted_end = match.end()
+        # No match can start before the cut, so the text up to it can be output as is
+        cut = (
+            len(buffer) if is_final else max(substituted_end, limit - self.__overlap, 0)
+        )
+        parts.append(buffer[substituted_end:cut])
+        self.__buffer = buffer[cut:]
+        return buffer[:0].join(parts)
+
+
+async def _aiter_processed(
+    reader: Any,
+    process: Callable[[Any, bool], T],
+    chunk_size: int,
+    executor: Optional[Executor],
+) -> AsyncIterator[T]:
+    """
+    Reads the reader until EOF, processing what is read each time, and yields each result.
+
+    The next read only happens once the consumer asks for the next result, so a slow consumer
+    slows down the reading, and the reader's own flow control pushes back on its producer.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    loop = asyncio.get_running_loop()
+    is_final = False
+    while not is_final:
+        # StreamReader.read returns whatever is already buffered, up to chunk_size, without waiting for more
+        data = await reader.read(chunk_size)
+        is_final = not data
+        if executor is None:
+            yield process(data, is_final)
+        else:
+            yield await loop.run_in_executor(executor, process, data, is_final)
+
+
+async def aiter_stream_records(
+    regex: Pattern[Any],
+    reader: Any,
+    create_record: Callable[[int, Match[Any]], Optional[T]],
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+    encoding: str = "utf-8",
+    framing: StreamFraming = "chunk",
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[T]:
+    """
+    Iterates asynchronously over the matches of a regex in an asyncio.StreamReader, or any
+    reader with an awaitable read(n), yielding the record created from each match and the offset
+    of its start in the stream, unless create_record returns None.
+
+    A str regex decodes the stream with encoding, and offsets are counted in characters.
+    A bytes regex scans it as is, and offsets are counted in bytes.
+
+    With chunk framing, matches spanning two reads are found as long as they are no longer
+    than overlap, as per ChunkedMatchScanner, but are only reported once overlap more
+    characters have been read after them. With line framing, matches must not span lines,
+    and are reported as soon as their line is complete.
+
+    If an executor is given, the scanning and record creation of each read run in it,
+    so that a large read does not block the event loop. It must be able to run closures,
+    e.g. a ThreadPoolExecutor.
+    """
+    processor = _MatchProcessor(regex, create_record, framing, overlap, encoding)
+    async for records in _aiter_processed(reader, processor.feed, chunk_size, executor):
+        for record in records:
+            yield record
+
+
+async def asub_stream(
+    regex: Pattern[Any],
+    reader: Any,
+    handler: Callable[[Match[Any]], Any],
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+    encoding: str = "utf-8",
+    framing: StreamFraming = "chunk",
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Any]:
+    """
+    Substitutes the matches of a regex in an asyncio.StreamReader, or any reader with an awaitable
+    read(n), with the result of handler for each match, yielding the output piece by piece.
+    Joined together, the pieces make up the substituted stream.
+
+    Framing, decoding and the executor work as per aiter_stream_records.
+    """
+    processor = _SubProcessor(regex, handler, framing, overlap, encoding)
+    async for output in _aiter_processed(reader, processor.feed, chunk_size, executor):
+        if output:
+            yield output
@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from datetime_matcher.datetime_builder import (
+    FIELD_AMPM,
+    FIELD_DAY,
+    FIELD_DISCARDED,
+    FIELD_HOUR,
+    FIELD_HOUR12,
+    FIELD_JULIAN,
+    FIELD_MICROSECOND,
+    FIELD_MINUTE,
+    FIELD_MONTH,
+    FIELD_SECOND,
+    FIELD_TZINFO,
+    FIELD_WEEK_OF_YEAR_MON,
+    FIELD_WEEK_OF_YEAR_SUN,
+    FIELD_YEAR,
+)
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+_MICROSECONDS_PER_SECOND = 1_000_000
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Vectorized extraction requires numpy; install it with `pip install datetime-matcher[numpy]`"
+        )
+
+
+def _to_utc_offset_microseconds(tz: timezone) -> int:
+    return tz.utcoffset(None) // timedelta(microseconds=1)
+
+
+class Datetime64Extractor:
+    """
+    Extracts the datetime of the leftmost match in each of many texts into a numpy
+    datetime64[us] array, with NaT where a text has no valid datetime.
+
+    The regex still runs once per text, but the fields are then converted and assembled
+    column by column with array operations, instead of building a datetime object per text.
+    Numeric fields are parsed in bulk, and name fields use the same converters as DatetimeExtractor.
+
+    Timezone-aware values are converted to UTC, since datetime64 has no timezone.
+    """
+
+    # public
+    def extract_datetime64(
+        self,
+        plan: DatetimeExtractionPlan,
+        texts: Sequence[Any],
+        return_mask: bool = False,
+    ) -> Union[Any, Tuple[Any, Any]]:
+        """
+        Returns a datetime64[us] array with one element per text.
+        If return_mask is set, also returns a boolean array which is True where a datetime was extracted.
+        """
+        _require_numpy()
+        search = plan.regex.search
+        group_indices = plan.group_indices
+        row_indices = []
+        rows = []
+        for text_idx, text in enumerate(texts):
+            match = search(text)
+            if match is not None:
+                row_indices.append(text_idx)
+                rows.append(match)
+        result = np.full(len(texts), np.datetime64("NaT"), dtype="datetime64[us]")
+        mask = np.zeros(len(texts), dtype=bool)
+        if rows:
+            if self.__is_vectorizable(plan):
+                if len(group_indices) == 1:
+                    columns: List[Sequence[Any]] = [
+                        [match.group(group_indices[0]) for match in rows]
+                    ]
+                else:
+                    columns = list(
+                        zip(*(match.group(*group_indices) for match in rows))
+                    )
+                values, is_valid = self.__assemble(plan, columns, len(rows))
+            else:
+                values, is_valid = self.__build_row_by_row(plan, rows)
+            row_indices_array = np.asarray(row_indices, dtype=np.intp)
+            result[row_indices_array[is_valid]] = values[is_valid]
+            mask[row_indices_array] = is_valid
+            # Like extract_datetime, look past a leftmost match which is not a valid datetime
+            for text_idx in row_indices_array[~is_valid]:
+                maybe_datetime = self.__extract_later_datetime(plan, texts[text_idx])
+                if maybe_datetime is not None:
+                    result[text_idx] = maybe_datetime
+                    mask[text_idx] = True
+        return (result, mask) if return_mask else result
+
+    # private
+    def __is_vectorizable(self, plan: DatetimeExtractionPlan) -> bool:
+        # Resolving the date from week numbers is left to the row by row path
+        return plan.field_converters is not None and not any(
+            slot in (FIELD_WEEK_OF_YEAR_SUN, FIELD_WEEK_OF_YEAR_MON)
+            for slot, _ in plan.field_converters
+        )
+
+    # private
+    def __convert_column(
+        self, convert: Any, column: Sequence[Any], num_rows: int
+    ) -> Tuple[Any, Any]:
+        """Converts a column of captured values into an int64 array and a validity array."""
+        if convert is int and None not in column:
+            # Parse the digits in bulk
+            return np.asarray(column).astype(np.int64), np.ones(num_rows, dtype=bool)
+        converted = np.zeros(num_rows, dtype=np.int64)
+        is_valid = np.ones(num_rows, dtype=bool)
+        for row_idx, value in enumerate(column):
+            try:
+                field = convert(value)
+            except (ValueError, KeyError, TypeError):
+                is_valid[row_idx] = False
+                continue
+            converted[row_idx] = (
+                _to_utc_offset_microseconds(field)
+                if isinstance(field, timezone)
+                else field
+            )
+        return converted, is_valid
+
+    # private
+    def __assemble(
+        self,
+        plan: DatetimeExtractionPlan,
+        columns: List[Sequence[Any]],
+        num_rows: int,
+    ) -> Tuple[Any, Any]:
+        fields = {}
+        is_valid = np.ones(num_rows, dtype=bool)
+        assert plan.field_converters is not None
+        for (slot, convert), column in zip(plan.field_converters, columns):
+            if slot == FIELD_DISCARDED:
+                continue
+            fields[slot], is_field_valid = self.__convert_column(
+                convert, column, num_rows
+            )
+            is_valid &= is_field_valid
+        zeros = np.zeros(num_rows, dtype=np.int64)
+        year = fields.get(FIELD_YEAR, np.full(num_rows, 1900, dtype=np.int64))
+        month = fields.get(FIELD_MONTH, np.ones(num_rows, dtype=np.int64))
+        day = fields.get(FIELD_DAY, np.ones(num_rows, dtype=np.int64))
+        # Work out the hour from either the 24-hour clock, or the 12-hour clock and AM/PM
+        if FIELD_HOUR in fields:
+            hour = fields[FIELD_HOUR]
+        elif FIELD_HOUR12 in fields:
+            hour12 = fields[FIELD_HOUR12] % 12
+            is_pm = fields.get(FIELD_AMPM, zeros) == 1
+            hour = np.where(is_pm, hour12 + 12, hour12)
+        else:
+            hour = zeros
+        is_valid &= (year >= 1) & (year <= 9999) & (month >= 1) & (month <= 12)
+        year = np.where(is_valid, year, 1970)
+        month = np.where(is_valid, month, 1)
+        # Work out the date, from the day of the year if there is one
+        year_start = (year - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+        if FIELD_JULIAN in fields:
+            date = year_start + (fields[FIELD_JULIAN] - 1).astype("timedelta64[D]")
+        else:
+            month_start = ((year - 1970) * 12 + (month - 1)).astype("datetime64[M]")
+            days_in_month = (
+                (month_start + 1).astype("datetime64[D]")
+                - month_start.astype("datetime64[D]")
+            ).astype(np.int64)
+            is_valid &= (day >= 1) & (day <= days_in_month)
+            date = month_start.astype("datetime64[D]") + (day - 1).astype(
+                "timedelta64[D]"
+            )
+        seconds = (
+            hour * 3600
+            + fields.get(FIELD_MINUTE, zeros) * 60
+            + fields.get(FIELD_SECOND, zeros)
+        )
+        microseconds = (
+            seconds * _MICROSECONDS_PER_SECOND
+            + fields.get(FIELD_MICROSECOND, zeros)
+            # Shift timezone-aware values to UTC
+            - fields.get(FIELD_TZINFO, zeros)
+        )
+        values = date.astype("datetime64[us]") + microseconds.astype("timedelta64[us]")
+        return values, is_valid
+
+    # private
+    def __extract_later_datetime(
+        self, plan: DatetimeExtractionPlan, text: Any
+    ) -> Optional[Any]:
+        extractor = DatetimeExtractor()
+        matches = plan.regex.finditer(text)
+        # The leftmost match has already been tried
+        next(matches, None)
+        for match in matches:
+            maybe_datetime = extractor.extract_datetime_from_match(match, plan)
+            if maybe_datetime is not None:
+                return self.__to_datetime64(maybe_datetime)
+        return None
+
+    # private
+    def __to_datetime64(self, dt: datetime) -> Any:
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(dt, "us")
+
+    # private
+    def __build_row_by_row(
+        self, plan: DatetimeExtractionPlan, rows: List[Any]
+    ) -> Tuple[Any, Any]:
+        extractor = DatetimeExtractor()
+        values = np.full(len(rows), np.datetime64("NaT"), dtype="datetime64[us]")
+        is_valid = np.zeros(len(rows), dtype=bool)
+        for row_idx, match in enumerate(rows):
+            maybe_datetime: Optional[datetime] = extractor.extract_datetime_from_match(
+                match, plan
+            )
+            if maybe_datetime is not None:
+                values[row_idx] = self.__to_datetime64(maybe_datetime)
+                is_valid[row_idx] = True
+        return values, is_valid
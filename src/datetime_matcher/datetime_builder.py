@@ -0,0 +1,387 @@
+import calendar
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from datetime_matcher.locale_names import get_names_by_format_code, resolve_locale
+
+# Slots of the fields from which a datetime is built, each filled in by a format code's converter
+(
+    FIELD_YEAR,
+    FIELD_MONTH,
+    FIELD_DAY,
+    FIELD_HOUR,
+    FIELD_HOUR12,
+    FIELD_AMPM,
+    FIELD_MINUTE,
+    FIELD_SECOND,
+    FIELD_MICROSECOND,
+    FIELD_TZINFO,
+    FIELD_JULIAN,
+    FIELD_WEEKDAY,
+    FIELD_WEEK_OF_YEAR_SUN,
+    FIELD_WEEK_OF_YEAR_MON,
+    # Where the value of a format code overridden by a later one goes
+    FIELD_DISCARDED,
+) = range(15)
+NUM_FIELD_SLOTS = 15
+
+# The slots which strptime fills in from the same variable, e.g. %H and %I both set the hour,
+# by the first slot of their group; the others each make up a group of their own
+_SLOT_GROUPS = {
+    FIELD_HOUR12: FIELD_HOUR,
+    FIELD_WEEK_OF_YEAR_MON: FIELD_WEEK_OF_YEAR_SUN,
+}
+
+# A (slot, converter) pair, where the converter turns a captured value into the slot's field value
+FieldConverter = Tuple[int, Callable[[Any], Any]]
+
+# The keyword of datetime.replace which sets each slot's field directly, for the slots whose
+# field only ever ends up in the datetime as is
+_REPLACE_KEYWORDS_BY_SLOT = {
+    FIELD_HOUR: "hour",
+    FIELD_MINUTE: "minute",
+    FIELD_SECOND: "second",
+    FIELD_MICROSECOND: "microsecond",
+    FIELD_TZINFO: "tzinfo",
+}
+# The keywords of the date's slots, which are only set as is when the year is known
+# and nothing else works out the date
+_DATE_REPLACE_KEYWORDS_BY_SLOT = {
+    FIELD_YEAR: "year",
+    FIELD_MONTH: "month",
+    FIELD_DAY: "day",
+}
+
+
+def _discard_value(value: Any) -> None:
+    return None
+
+
+def _convert_name(name_to_number: Dict[Any, int], value: Any) -> int:
+    # Names are matched case-insensitively, like strptime does
+    return name_to_number[value.lower()]
+
+
+def _convert_two_digit_year(value: str) -> int:
+    # Follows the POSIX and strptime convention: 69-99 -> 1969-1999, 00-68 -> 2000-2068
+    year = int(value)
+    return year + 2000 if year <= 68 else year + 1900
+
+
+def _convert_weekday_number(value: str) -> int:
+    # %w counts from Sunday = 0, but datetime counts from Monday = 0
+    weekday = int(value)
+    return 6 if weekday == 0 else weekday - 1
+
+
+def _convert_day_of_year(value: str) -> int:
+    day_of_year = int(value)
+    if day_of_year < 1:
+        raise ValueError(f"day of year out of range: {value}")
+    return day_of_year
+
+
+def _convert_utc_offset(value: Any) -> timezone:
+    # Of the form [+-]HHMM[SS[.ffffff]]
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    offset = timedelta(
+        hours=int(value[1:3]),
+        minutes=int(value[3:5]),
+        seconds=int(value[5:7] or 0),
+        microseconds=int(value[8:] or 0),
+    )
+    return timezone(-offset if value[0] == "-" else offset)
+
+
+def _to_name_to_number_table(names: Sequence[str], start: int) -> Dict[Any, int]:
+    # Keyed by both the lowercased str name and the lowercased UTF-8 bytes name,
+    # so that values captured by both str and bytes patterns can be looked up.
+    # Where names are the same, the first one's number wins, so that like strptime,
+    # an empty AM/PM name, as in locales without them, is AM
+    table: Dict[Any, int] = {}
+    for number, name in enumerate(names, start):
+        table.setdefault(name.lower(), number)
+        table.setdefault(name.encode("utf-8").lower(), number)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _get_name_to_number_tables(locale_name: str) -> Dict[str, Dict[Any, int]]:
+    """
+    Builds the lookup tables from lowercased names to numbers for the
+    month, weekday and AM/PM format codes, according to the LC_TIME locale locale_name.
+    """
+    names_by_format_code = get_names_by_format_code(locale_name)
+    return {
+        format_code: _to_name_to_number_table(names, 1 if format_code in "bB" else 0)
+        for format_code, names in names_by_format_code.items()
+    }
+
+
+def _get_field_converters_by_format_code(
+    locale_name: Optional[str] = None,
+) -> Dict[str, FieldConverter]:
+    return _get_field_converters_by_format_code_for_locale(resolve_locale(locale_name))
+
+
+@lru_cache(maxsize=None)
+def _get_field_converters_by_format_code_for_locale(
+    locale_name: str,
+) -> Dict[str, FieldConverter]:
+    # Built once per locale and shared by every builder, so never mutated
+    tables = _get_name_to_number_tables(locale_name)
+    return {
+        r"%a": (FIELD_WEEKDAY, partial(_convert_name, tables["a"])),
+        r"%A": (FIELD_WEEKDAY, partial(_convert_name, tables["A"])),
+        r"%w": (FIELD_WEEKDAY, _convert_weekday_number),
+        r"%d": (FIELD_DAY, int),
+        r"%b": (FIELD_MONTH, partial(_convert_name, tables["b"])),
+        r"%B": (FIELD_MONTH, partial(_convert_name, tables["B"])),
+        r"%m": (FIELD_MONTH, int),
+        r"%y": (FIELD_YEAR, _convert_two_digit_year),
+        r"%Y": (FIELD_YEAR, int),
+        r"%H": (FIELD_HOUR, int),
+        r"%I": (FIELD_HOUR12, int),
+        r"%p": (FIELD_AMPM, partial(_convert_name, tables["p"])),
+        r"%M": (FIELD_MINUTE, int),
+        r"%S": (FIELD_SECOND, int),
+        r"%f": (FIELD_MICROSECOND, int),
+        r"%z": (FIELD_TZINFO, _convert_utc_offset),
+        r"%j": (FIELD_JULIAN, _convert_day_of_year),
+        r"%U": (FIELD_WEEK_OF_YEAR_SUN, int),
+        r"%W": (FIELD_WEEK_OF_YEAR_MON, int),
+    }
+
+
+def _calc_julian_from_week(
+    year: int, week_of_year: int, weekday: int, is_week_start_monday: bool
+) -> int:
+    # Same calculation as strptime's, given a weekday counted from Monday = 0
+    first_weekday = date(year, 1, 1).weekday()
+    if not is_week_start_monday:
+        first_weekday = (first_weekday + 1) % 7
+        weekday = (weekday + 1) % 7
+    week_0_length = (7 - first_weekday) % 7
+    if week_of_year == 0:
+        return 1 + weekday - first_weekday
+    else:
+        return 1 + week_0_length + 7 * (week_of_year - 1) + weekday
+
+
+def build_datetime_from_fields(fields: List[Any]) -> Optional[datetime]:
+    """
+    Builds a datetime from a list of NUM_FIELD_SLOTS field values, resolving
+    missing fields and the day of the year the same way strptime does.
+
+    Returns None if the fields do not make up a valid datetime.
+    """
+    year = fields[FIELD_YEAR]
+    month = fields[FIELD_MONTH] if fields[FIELD_MONTH] is not None else 1
+    day = fields[FIELD_DAY] if fields[FIELD_DAY] is not None else 1
+    # Like strptime, default to a leap year when asked for February 29th without a year
+    is_leap_year_fix = year is None and month == 2 and day == 29
+    if year is None:
+        year = 1904 if is_leap_year_fix else 1900
+    hour = fields[FIELD_HOUR]
+    if hour is None:
+        hour = fields[FIELD_HOUR12]
+        if hour is None:
+            hour = 0
+        elif fields[FIELD_AMPM] == 1:
+            hour = hour if hour == 12 else hour + 12
+        elif hour == 12:
+            hour = 0
+    try:
+        julian = fields[FIELD_JULIAN]
+        # If we know the week of the year and the day of that week, we can figure out the day of the year
+        if julian is None and fields[FIELD_WEEKDAY] is not None:
+            if fields[FIELD_WEEK_OF_YEAR_SUN] is not None:
+                julian = _calc_julian_from_week(
+                    year, fields[FIELD_WEEK_OF_YEAR_SUN], fields[FIELD_WEEKDAY], False
+                )
+            elif fields[FIELD_WEEK_OF_YEAR_MON] is not None:
+                julian = _calc_julian_from_week(
+                    year, fields[FIELD_WEEK_OF_YEAR_MON], fields[FIELD_WEEKDAY], True
+                )
+            if julian is not None and julian <= 0:
+                year -= 1
+                julian += 366 if calendar.isleap(year) else 365
+        if julian is not None:
+            resolved_date = date.fromordinal(julian - 1 + date(year, 1, 1).toordinal())
+            year, month, day = (
+                resolved_date.year,
+                resolved_date.month,
+                resolved_date.day,
+            )
+        if is_leap_year_fix:
+            year = 1900
+        return datetime(
+            year,
+            month,
+            day,
+            hour,
+            fields[FIELD_MINUTE] or 0,
+            fields[FIELD_SECOND] or 0,
+            fields[FIELD_MICROSECOND] or 0,
+            fields[FIELD_TZINFO],
+        )
+    except (ValueError, OverflowError):
+        return None
+
+
+def get_numeric_strptime_args(
+    format_codes: Sequence[str], values: Sequence[str], locale: Optional[str] = None
+) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Replaces the names captured for the month, weekday and AM/PM format codes by numbers,
+    according to the LC_TIME locale named locale (or the current one if it is None),
+    so that strptime parses the (format codes, values) the same whatever the process's locale.
+
+    Returns None if a name is not one of the locale's.
+    """
+    tables = _get_name_to_number_tables(resolve_locale(locale))
+    try:
+        # strptime only uses AM/PM to work out the hour from the 12-hour clock
+        ampm = next(
+            tables["p"][value.lower()]
+            for format_code, value in zip(format_codes, values)
+            if format_code == "%p"
+        )
+    except StopIteration:
+        ampm = None
+    except KeyError:
+        return None
+    numeric_format_codes = []
+    numeric_values = []
+    for format_code, value in zip(format_codes, values):
+        if format_code == "%p":
+            continue
+        elif format_code in ("%a", "%A", "%b", "%B"):
+            number = tables[format_code[1]].get(value.lower())
+            if number is None:
+                return None
+            if format_code in ("%a", "%A"):
+                # %w counts from Sunday = 0, but the tables count from Monday = 0
+                format_code, value = "%w", str((number + 1) % 7)
+            else:
+                format_code, value = "%m", str(number)
+        elif format_code == "%I" and ampm is not None:
+            hour12 = int(value)
+            if not 1 <= hour12 <= 12:
+                return None
+            format_code, value = "%H", str(hour12 % 12 + 12 * ampm)
+        numeric_format_codes.append(format_code)
+        numeric_values.append(value)
+    # strptime lets the later of two codes for the same field win, e.g. %b after %m,
+    # but rejects a format code given twice, so keep only the last of each
+    last_idx_by_format_code = {
+        format_code: idx for idx, format_code in enumerate(numeric_format_codes)
+    }
+    kept_idxs = sorted(last_idx_by_format_code.values())
+    return (
+        tuple(numeric_format_codes[idx] for idx in kept_idxs),
+        tuple(numeric_values[idx] for idx in kept_idxs),
+    )
+
+
+def _get_replace_keywords(
+    field_converters: Sequence[FieldConverter],
+) -> Tuple[Optional[str], ...]:
+    """
+    Works out, for each format code's field converter, how a change in its value alone can be applied
+    to a datetime built before the change: the keyword of datetime.replace which sets its field,
+    "" if its field does not affect the datetime, or None if the datetime has to be built again.
+    """
+    slots = set(slot for slot, _ in field_converters)
+    is_date_as_is = FIELD_YEAR in slots and not slots & {
+        FIELD_JULIAN,
+        FIELD_WEEK_OF_YEAR_SUN,
+        FIELD_WEEK_OF_YEAR_MON,
+    }
+    # Without a week of the year, the weekday does not affect the datetime
+    is_weekday_ignored = not slots & {FIELD_WEEK_OF_YEAR_SUN, FIELD_WEEK_OF_YEAR_MON}
+    replace_keywords: List[Optional[str]] = []
+    for slot, _ in field_converters:
+        if slot in _REPLACE_KEYWORDS_BY_SLOT:
+            replace_keyword: Optional[str] = _REPLACE_KEYWORDS_BY_SLOT[slot]
+        elif slot in _DATE_REPLACE_KEYWORDS_BY_SLOT and is_date_as_is:
+            replace_keyword = _DATE_REPLACE_KEYWORDS_BY_SLOT[slot]
+        elif slot == FIELD_DISCARDED or (slot == FIELD_WEEKDAY and is_weekday_ignored):
+            replace_keyword = ""
+        else:
+            replace_keyword = None
+        replace_keywords.append(replace_keyword)
+    return tuple(replace_keywords)
+
+
+class DatetimeBuilder:
+    """
+    Builds datetimes directly from the values captured for a sequence of
+    (normalized) format codes, without going through datetime.strptime.
+
+    The regex generated for each format code has already validated the shape of its value,
+    so each value only needs a cheap conversion into its field of the datetime.
+
+    Like strptime, where more than one format code sets the same field (e.g. %m and %b,
+    or %H and %I), the later one wins. Only a format code which the builder does not know
+    makes it unsupported, in which case is_supported is False and the caller should
+    fall back to strptime.
+
+    A builder and its converters are immutable, and do not depend on the process's locale
+    once built, so they can be shared by any number of threads.
+    """
+
+    def __init__(self, format_codes: Sequence[str], locale: Optional[str] = None):
+        """
+        Initializer.
+
+        Names are converted according to the LC_TIME locale named locale, e.g. "de_DE.UTF-8",
+        or the current one if it is None.
+        """
+        converters_by_format_code = _get_field_converters_by_format_code(locale)
+        field_converters: Optional[List[FieldConverter]] = []
+        used_slot_groups = set()
+        # Go backwards, so that the later of the format codes for a field is the one kept
+        for format_code in reversed(format_codes):
+            field_converter = converters_by_format_code.get(format_code)
+            if field_converter is None:
+                field_converters = None
+                break
+            slot_group = _SLOT_GROUPS.get(field_converter[0], field_converter[0])
+            if slot_group in used_slot_groups:
+                field_converter = (FIELD_DISCARDED, _discard_value)
+            used_slot_groups.add(slot_group)
+            field_converters.append(field_converter)
+        self.field_converters: Optional[Tuple[FieldConverter, ...]] = (
+            tuple(reversed(field_converters)) if field_converters is not None else None
+        )
+        self.replace_keywords: Optional[Tuple[Optional[str], ...]] = (
+            _get_replace_keywords(self.field_converters)
+            if self.field_converters is not None
+            else None
+        )
+
+    # public
+    @property
+    def is_supported(self) -> bool:
+        """Whether datetimes can be built for this combination of format codes."""
+        return self.field_converters is not None
+
+    # public
+    def build(self, values: Sequence[Any]) -> Optional[datetime]:
+        """
+        Builds a datetime from the values captured for each of the format codes, in order.
+
+        Returns None if the values do not make up a valid datetime.
+        """
+        if self.field_converters is None:
+            raise ValueError("Unsupported combination of format codes")
+        fields: List[Any] = [None] * NUM_FIELD_SLOTS
+        try:
+            for (slot, convert), value in zip(self.field_converters, values):
+                fields[slot] = convert(value)
+        except (ValueError, KeyError, TypeError):
+            return None
+        return build_datetime_from_fields(fields)
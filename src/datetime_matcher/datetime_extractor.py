@@ -1,7 +1,15 @@
 import re
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, List, Match, Optional
+from typing import AnyStr, Iterable, List, Match, Optional, Pattern, Tuple, Union
 
+from datetime_matcher.datetime_builder import (
+    NUM_FIELD_SLOTS,
+    DatetimeBuilder,
+    FieldConverter,
+    build_datetime_from_fields,
+    get_numeric_strptime_args,
+)
 from datetime_matcher.model_types import DfregexToken
 
 _MINUS_MODIFIER_RE = re.compile(r"%-([dmbHIMSjw])")
@@ -13,60 +21,179 @@ def _normalize_format_code(format_code: str) -> str:
     return _MINUS_MODIFIER_RE.sub(r"%\1", format_code)
 
 
+@dataclass(frozen=True)
+class DatetimeExtractionPlan:
+    """
+    Everything needed to turn a match of an extraction regex into a datetime,
+    computed once per dfregex so that nothing has to be looked up per match.
+    """
+
+    # A str or bytes regex
+    regex: Pattern
+    # The df groups' indices in the regex, in order
+    group_indices: Tuple[int, ...]
+    # The normalized format code of each df group, in the same order
+    format_codes: Tuple[str, ...]
+    # The converter of each df group, in the same order, or None if the
+    # combination of format codes can only be parsed by strptime
+    field_converters: Optional[Tuple[FieldConverter, ...]]
+    # The LC_TIME locale of the names, or None for the current one
+    locale: Optional[str] = None
+    # For each df group, how a change in its value alone can be applied to the datetime
+    # of an earlier match, as per DatetimeBuilder.replace_keywords, or None if field_converters is
+    replace_keywords: Optional[Tuple[Optional[str], ...]] = None
+
+    # public
+    @property
+    def entries(self) -> Tuple[Tuple[int, str, Optional[FieldConverter]], ...]:
+        """The (group index, normalized format code, converter) of each df group."""
+        field_converters = self.field_converters or (None,) * len(self.group_indices)
+        return tuple(zip(self.group_indices, self.format_codes, field_converters))
+
+
 class DatetimeExtractor:
 
+    # public
+    def create_extraction_plan(
+        self,
+        datetime_extractor_regex: Union[AnyStr, Pattern[AnyStr]],
+        tokens: Iterable[DfregexToken],
+        df_group_prefix: str = "DF___",
+        locale: Optional[str] = None,
+    ) -> DatetimeExtractionPlan:
+        """
+        Works out, once, which groups of the extraction regex hold which format codes,
+        and how to convert each group's value into its field of the datetime.
+
+        Only the df groups named df_group_prefix followed by an index are considered.
+        Names are converted according to the LC_TIME locale named locale, or the current one if it is None.
+        """
+        regex = re.compile(datetime_extractor_regex)
+        df_tokens = list(
+            token for token in tokens if token.kind == "DATETIME_FORMAT_CODE"
+        )
+        df_groups = []
+        for group_key, group_index in regex.groupindex.items():
+            # Find only the df groups and match up the format codes with the group indices
+            if group_key.startswith(df_group_prefix):
+                try:
+                    datetime_group_num = int(group_key[len(df_group_prefix) :])
+                    df_groups.append(
+                        (
+                            group_index,
+                            _normalize_format_code(df_tokens[datetime_group_num].value),
+                        )
+                    )
+                except Exception:
+                    # Skip all problematic ones
+                    continue
+        df_groups.sort()
+        format_codes = tuple(format_code for _, format_code in df_groups)
+        builder = DatetimeBuilder(format_codes, locale)
+        return DatetimeExtractionPlan(
+            regex,
+            tuple(group_index for group_index, _ in df_groups),
+            format_codes,
+            builder.field_converters,
+            locale,
+            builder.replace_keywords,
+        )
+
     # public
     def extract_datetimes(
         self,
-        datetime_extractor_regex: str,
+        datetime_extractor_regex: Union[AnyStr, Pattern[AnyStr]],
         tokens: List[DfregexToken],
-        text: str,
+        text: AnyStr,
         count: int = 0,
     ) -> Iterable[Optional[datetime]]:
-        # Get all of the format codes in the dfregex and the regex which can be used for extraction
-        df_tokens = list(
-            token for token in tokens if token.kind == "DATETIME_FORMAT_CODE"
-        )
+        # Work out how the format codes in the dfregex line up with the regex which can be used for extraction
+        plan = self.create_extraction_plan(datetime_extractor_regex, tokens)
+        return self.extract_datetimes_with_plan(plan, text, count)
+
+    # public
+    def extract_datetimes_with_plan(
+        self, plan: DatetimeExtractionPlan, text: AnyStr, count: int = 0
+    ) -> Iterable[Optional[datetime]]:
         # Use regex to iterate over all matches
-        for match in self.__finditer_with_limit(datetime_extractor_regex, text, count):
-            yield self.__parse_match_into_maybe_datetime(match, df_tokens)
+        for match in self.__finditer_with_limit(plan.regex, text, count):
+            yield self.extract_datetime_from_match(match, plan)
+
+    # public
+    def extract_datetime_from_match(
+        self, match: Match[AnyStr], plan: DatetimeExtractionPlan
+    ) -> Optional[datetime]:
+        """
+        Parses the datetime from a single match of the plan's extraction regex.
+
+        Returns None if the captured values do not make up a valid datetime.
+        """
+        values = match.group(*plan.group_indices)
+        # match.group returns a bare value rather than a tuple when asked for a single group
+        if len(plan.group_indices) == 1:
+            values = (values,)
+        return self.extract_datetime_from_values(values, plan)
+
+    # public
+    def extract_datetime_from_values(
+        self, values: Tuple[Optional[AnyStr], ...], plan: DatetimeExtractionPlan
+    ) -> Optional[datetime]:
+        """
+        Parses the datetime from the values captured by the plan's df groups, in order.
+
+        Returns None if the values do not make up a valid datetime.
+        """
+        if plan.field_converters is None:
+            return self.__parse_values_with_strptime(
+                values, plan.format_codes, plan.locale
+            )
+        # Build the datetime directly from the values, as strptime is slow
+        fields: list = [None] * NUM_FIELD_SLOTS
+        try:
+            for (slot, convert), value in zip(plan.field_converters, values):
+                fields[slot] = convert(value)
+        except (ValueError, KeyError, TypeError):
+            # If there is a problem, we still need to return a value to maintain
+            # one-to-one mapping between regex match and datetime
+            return None
+        return build_datetime_from_fields(fields)
 
     # private
     def __finditer_with_limit(
-        self, regex: str, text: str, count: int
-    ) -> Iterable[Match[str]]:
+        self, regex: Pattern[AnyStr], text: AnyStr, count: int
+    ) -> Iterable[Match[AnyStr]]:
         # Use regex to iterate over all matches
-        for match_num, match in enumerate(re.finditer(regex, text)):
+        for match_num, match in enumerate(regex.finditer(text)):
             if count > 0 and match_num >= count:
                 break
             yield match
 
     # private
-    def __parse_match_into_maybe_datetime(
-        self, match: Match[str], df_tokens: List[DfregexToken]
+    def __parse_values_with_strptime(
+        self,
+        values: Tuple[Optional[AnyStr], ...],
+        format_codes: Tuple[str, ...],
+        locale: Optional[str],
     ) -> Optional[datetime]:
-        datetime_format_codes = []
-        datetime_string_values = []
-        for group_key, group_value in match.groupdict().items():
-            # Find only the df groups and match up the format codes with the actual datetime values
-            if group_key.startswith("DF___"):
-                try:
-                    datetime_group_num = int(group_key[5:])
-                    datetime_format_codes.append(
-                        _normalize_format_code(df_tokens[datetime_group_num].value)
-                    )
-                    datetime_string_values.append(group_value)
-                except Exception:
-                    # Skip all problematic ones
-                    continue
-        # Now construct strings to use for strptime to generate a datetime object from the values
-        datetime_formatter = "#".join(datetime_format_codes)
-        datetime_string = "#".join(datetime_string_values)
+        # Construct strings to use for strptime to generate a datetime object from the values
         try:
+            # Names are converted to numbers first, as strptime would read them in the process's locale
+            numeric_args = get_numeric_strptime_args(
+                format_codes,
+                [
+                    value.decode("utf-8") if isinstance(value, bytes) else value
+                    for value in values
+                ],
+                locale,
+            )
+            if numeric_args is None:
+                return None
+            datetime_formatter = "#".join(numeric_args[0])
+            datetime_string = "#".join(numeric_args[1])
             parsed_datetime = datetime.strptime(datetime_string, datetime_formatter)
-        except ValueError:
+        except (ValueError, TypeError):
             # If there is a problem, we still need to return a value to maintain
             # one-to-one mapping between regex match and datetime
             return None
-        # Otherwise, yield the extracted datetime
+        # Otherwise, return the extracted datetime
         return parsed_datetime
@@ -5,20 +5,131 @@
 # Last modified: 2022-01-25
 # Description: A library which extends regex with support for datetime format codes.
 
+import os
 import re
+import threading
 from datetime import datetime
-from typing import Iterator, List, Match, Optional
-
-from datetime_matcher.datetime_extractor import DatetimeExtractor
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AnyStr,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from datetime_matcher.datetime_stream import (
+    DEFAULT_ASYNC_CHUNK_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_OVERLAP,
+    StreamFraming,
+    StreamSource,
+)
 from datetime_matcher.dfregex_lexer import DfregexLexer
+from datetime_matcher.dfregex_pattern import DfregexPattern
+from datetime_matcher.dfregex_set import DfregexSet
+from datetime_matcher.locale_names import get_names_by_format_code, resolve_locale
+from datetime_matcher.model_types import DatetimeLine, DatetimeRecord
+from datetime_matcher.pattern_cache import PatternCache, PatternCacheInfo
 from datetime_matcher.regex_generator import RegexGenerator
 
+if TYPE_CHECKING:
+    # Imported on first use, since they pull in concurrent.futures, multiprocessing, pickle and importlib.metadata
+    from concurrent.futures import Executor
+
+    from datetime_matcher.delta_extractor import DisorderPolicy
+    from datetime_matcher.instrumentation import MatcherHooks
+    from datetime_matcher.parallel import ProcessPoolRunner
+    from datetime_matcher.pattern_disk_cache import PatternDiskCache
+    from datetime_matcher.timestamp_index import TimestampIndex
+
 
 class DatetimeMatcher:
-    def __init__(self):
-        self.__regexGenerator = RegexGenerator()
+    """
+    Matches, extracts and substitutes datetimes in texts with dfregexes, i.e. regexes
+    extended with datetime format codes.
+
+    A matcher can be shared by any number of threads. Its settings never change after
+    construction, its cache of compiled patterns is guarded by a lock, and the patterns
+    it compiles are immutable. Extraction builds datetimes from shared, read-only tables,
+    without datetime.strptime or any other lock. Threads which compile the same dfregex at once
+    may each compile it, but get equivalent patterns. For the least contention,
+    compile each dfregex once and share the pattern, which skips the cache's lock.
+
+    The exception is the first use of each non-default locale, whose names can only be read by switching
+    the process's LC_TIME locale for a moment (see get_names_by_format_code). Meanwhile, other threads which
+    format or parse datetimes by name, e.g. with strftime or strptime, including sub's templates, may see
+    that locale. A matcher reads the names of its own locale when it is constructed, so construct
+    matchers, and compile with any other locale, before other threads start to use names.
+    """
+
+    def __init__(
+        self,
+        cache_size: Optional[int] = 256,
+        is_safe: bool = False,
+        disk_cache_dir: Optional[Union[str, "os.PathLike[str]"]] = None,
+        locale: Optional[str] = None,
+        hooks: Optional["MatcherHooks"] = None,
+        memo_size: Optional[int] = 0,
+    ):
+        """
+        Initializer.
+
+        Compiled patterns are kept in a least-recently-used cache of at most cache_size entries,
+        so that repeated calls with the same dfregex skip tokenizing and regex generation.
+        Use None for an unbounded cache, or 0 to disable caching.
+
+        If is_safe, dfregexes are compiled in safe mode, which guards against catastrophic
+        backtracking on near-miss inputs, at the cost of numbers in a match having to stand
+        on their own (see RegexGenerator).
+
+        If disk_cache_dir is given, compiled patterns are also pickled into that directory,
+        so that other processes, such as short-lived workers, can load them instead of
+        compiling them again (see PatternDiskCache). The directory must be trusted.
+
+        The month, weekday and AM/PM names are those of the LC_TIME locale named locale,
+        e.g. "de_DE.UTF-8", unless another locale is given to compile. By default, they are those
+        of the process's locale at the time each dfregex is first compiled. The names of each locale
+        are read once and shared, so one process can match many languages at once. The names of locale
+        are read right away, which raises locale.Error if it is not available, and briefly switches
+        the process's LC_TIME locale (see the thread-safety note above).
+
+        If hooks are given, e.g. a MatcherStats, the matcher reports to them the time spent in each stage
+        of compiling, scanning and extracting, the outcome of each extraction, and each compile cache lookup
+        (see MatcherHooks). The patterns it compiles report to them too. Without hooks,
+        none of this is measured, and the hot paths are the same as if it did not exist.
+        The parallel methods and compile_set are not instrumented.
+
+        If memo_size is not 0, each compiled pattern remembers the datetimes built from its last
+        memo_size distinct timestamp texts, as per DfregexPattern.with_memo, which pays off when
+        texts repeat the same timestamps, as logs do. Use None for unbounded memos.
+        """
+        if memo_size is not None and memo_size < 0:
+            raise ValueError(f"memo_size must be None or non-negative, got {memo_size}")
+        if locale is not None:
+            # Switching the process's locale to read the names is only safe before other threads use it
+            get_names_by_format_code(locale)
+        self.__is_safe = is_safe
+        self.__locale = locale
+        self.__hooks = hooks
+        self.__memo_size = memo_size
+        self.__regexGenerator = RegexGenerator(is_safe, locale)
         self.__dfregexLexer = DfregexLexer()
-        self.__extractor = DatetimeExtractor()
+        self.__patternCache = PatternCache(cache_size)
+        self.__patternDiskCache: Optional["PatternDiskCache"] = None
+        if disk_cache_dir is not None:
+            from datetime_matcher.pattern_disk_cache import PatternDiskCache
+
+            self.__patternDiskCache = PatternDiskCache(disk_cache_dir)
+        self.__processPoolRunner: Optional["ProcessPoolRunner"] = None
+        self.__processPoolRunnerLock = threading.Lock()
 
     # public
     def get_regex_from_dfregex(self, dfregex: str, is_capture_dfs: bool = False) -> str:
@@ -34,7 +145,124 @@ class DatetimeMatcher:
         return regex
 
     # public
-    def extract_datetime(self, dfregex: str, text: str) -> Optional[datetime]:
+    def compile(
+        self,
+        dfregex: AnyStr,
+        is_name_case_insensitive: bool = False,
+        locale: Optional[str] = None,
+    ) -> DfregexPattern[AnyStr]:
+        """
+        Compiles a dfregex search pattern into a DfregexPattern, analogous to re.compile.
+
+        A bytes dfregex compiles to a bytes pattern, which matches bytes-like texts directly,
+        without decoding them. Its datetime names are matched in their UTF-8 encoding.
+
+        The returned pattern object exposes the same search, match, findall, finditer, sub
+        and extraction methods, without re-tokenizing or re-generating the regex on each call.
+
+        If is_name_case_insensitive, the month, weekday and AM/PM names are matched
+        case-insensitively, while the rest of the dfregex stays case-sensitive.
+
+        If locale is given, the names are those of that LC_TIME locale instead of the matcher's,
+        and datetimes are extracted from them without depending on the process's locale.
+
+        Compiled patterns are cached, so compiling the same dfregex again is cheap.
+        """
+        if locale is None:
+            locale = self.__locale
+        cache_key = (dfregex, is_name_case_insensitive, locale)
+        pattern = self.__patternCache.get(cache_key)
+        hooks = self.__hooks
+        if hooks is not None:
+            hooks.on_cache_lookup(pattern is not None)
+        if pattern is None:
+            pattern = self.__load_or_compile(dfregex, is_name_case_insensitive, locale)
+            # Add the memo and the instrumentation after loading, since the disk cache keeps plain patterns
+            if self.__memo_size != 0:
+                pattern = pattern.with_memo(self.__memo_size)
+            if hooks is not None:
+                pattern = pattern.with_hooks(hooks)
+            self.__patternCache.put(cache_key, pattern)
+        return pattern
+
+    # public
+    def warm_cache(
+        self,
+        dfregexes: Iterable[AnyStr],
+        is_name_case_insensitive: bool = False,
+        locale: Optional[str] = None,
+    ) -> int:
+        """
+        Compiles each of dfregexes ahead of time, filling the pattern cache and the disk cache, if any.
+
+        Returns the number of dfregexes compiled.
+        """
+        num_compiled = 0
+        for dfregex in dfregexes:
+            self.compile(dfregex, is_name_case_insensitive, locale)
+            num_compiled += 1
+        return num_compiled
+
+    # public
+    def warm_cache_from_manifest(
+        self,
+        manifest_path: Union[str, "os.PathLike[str]"],
+        is_name_case_insensitive: bool = False,
+        encoding: str = "utf-8",
+        locale: Optional[str] = None,
+    ) -> int:
+        """
+        Compiles ahead of time each dfregex listed in a manifest file, one dfregex per line,
+        as per warm_cache. Blank lines are skipped.
+
+        Returns the number of dfregexes compiled.
+        """
+        with open(manifest_path, "r", encoding=encoding, newline="") as manifest:
+            dfregexes = [line.rstrip("\r\n") for line in manifest]
+        return self.warm_cache(
+            (dfregex for dfregex in dfregexes if dfregex),
+            is_name_case_insensitive,
+            locale,
+        )
+
+    # public
+    def compile_set(
+        self,
+        dfregexes: Sequence[AnyStr],
+        is_name_case_insensitive: bool = False,
+        locale: Optional[str] = None,
+    ) -> DfregexSet[AnyStr]:
+        """
+        Compiles many dfregex search patterns into a DfregexSet, which scans a text once
+        for all of them and reports which of them matched, along with its datetime.
+
+        The dfregexes must be all str or all bytes, and must not share group names.
+        Each dfregex is compiled (and cached) as per compile.
+        """
+        return DfregexSet(
+            [
+                self.compile(dfregex, is_name_case_insensitive, locale)
+                for dfregex in dfregexes
+            ],
+            self.__regexGenerator,
+        )
+
+    # public
+    def purge(self) -> None:
+        """
+        Clears the cache of compiled patterns, analogous to re.purge.
+        """
+        self.__patternCache.purge()
+
+    # public
+    def cache_info(self) -> PatternCacheInfo:
+        """
+        Returns the hit, miss and eviction counters and the current size of the cache of compiled patterns.
+        """
+        return self.__patternCache.cache_info()
+
+    # public
+    def extract_datetime(self, dfregex: AnyStr, text: AnyStr) -> Optional[datetime]:
         """
         Extracts the leftmost datetime from text given a dfregex search string.
 
@@ -42,12 +270,11 @@ class DatetimeMatcher:
 
         Returns the matching datetime object if found, otherwise returns None.
         """
-        # Run the more generic method, but return None if none are found
-        return next(iter(self.extract_datetimes(dfregex, text, 1)), None)
+        return self.compile(dfregex).extract_datetime(text)
 
     # public
     def extract_datetimes(
-        self, dfregex: str, text: str, count: int = 0
+        self, dfregex: AnyStr, text: AnyStr, count: int = 0
     ) -> Iterator[datetime]:
         """
         Extracts the leftmost datetimes from text given a dfregex search string.
@@ -58,45 +285,163 @@ class DatetimeMatcher:
 
         Use a non-zero count to limit the number of extractions.
         """
-        # Tokenize
-        tokens = list(self.__dfregexLexer.tokenize(dfregex))
-        # Generate the extraction regex
-        regex = self.__regexGenerator.generate_regex(tokens, True)
-        # Extract up to `count` number of datetimes
-        # but only keep those which are successful (not None)
-        extract_num = 0
-        for maybe_datetime in self.__extractor.extract_datetimes(regex, tokens, text):
-            if count > 0 and extract_num >= count:
-                break
-            if maybe_datetime is not None:
-                extract_num += 1
-                yield maybe_datetime
+        return self.compile(dfregex).extract_datetimes(text, count)
+
+    # public
+    def extract_datetimes_from_file(
+        self,
+        dfregex: AnyStr,
+        source: StreamSource,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        use_mmap: bool = False,
+    ) -> Iterator[DatetimeRecord]:
+        """
+        Extracts datetimes incrementally from a text or binary file object, or from the file at a path,
+        given a dfregex search string.
+
+        The file is read chunk_size at a time, so memory use stays flat regardless of its size.
+
+        Returns an Iterator over DatetimeRecords, each holding a datetime and the offsets of its match.
+        A str dfregex decodes binary input with encoding, and offsets are counted in characters.
+        A bytes dfregex scans binary input as is, and offsets are counted in bytes.
+
+        Matches spanning a chunk boundary are found as long as they are no longer than overlap.
+
+        With use_mmap, a bytes dfregex scans the memory-mapped file instead, without copying it.
+        """
+        return self.compile(dfregex).extract_datetimes_from_stream(
+            source, chunk_size, overlap, encoding, use_mmap
+        )
+
+    # public
+    def extract_ordered_datetimes_from_file(
+        self,
+        dfregex: AnyStr,
+        source: StreamSource,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        use_mmap: bool = False,
+        on_disorder: "DisorderPolicy" = "raise",
+        disorder_handler: Optional[
+            Callable[[DatetimeRecord, DatetimeRecord], None]
+        ] = None,
+    ) -> Iterator[DatetimeRecord]:
+        """
+        Extracts datetimes incrementally from a file whose datetimes never decrease, like a sorted log,
+        given a dfregex search string, as per DfregexPattern.extract_ordered_datetimes_from_stream.
+
+        Only the values which changed since the previous match are converted. Records whose datetime
+        is earlier than the previous record's are reported to disorder_handler, and then raise
+        a ValueError, are skipped or are kept, as per on_disorder ("raise", "skip" or "keep").
+        """
+        return self.compile(dfregex).extract_ordered_datetimes_from_stream(
+            source,
+            chunk_size,
+            overlap,
+            encoding,
+            use_mmap,
+            on_disorder,
+            disorder_handler,
+        )
+
+    # public
+    def search_time_range(
+        self,
+        dfregex: AnyStr,
+        source: StreamSource,
+        start: datetime,
+        end: datetime,
+    ) -> Iterator[DatetimeLine]:
+        """
+        Iterates over the lines of a file whose datetimes never decrease, like a log,
+        yielding the lines dated from start (inclusive) to end (exclusive), each as a DatetimeLine,
+        given a dfregex search string which finds the datetime of each line.
+
+        The file is memory-mapped and the start of the range is found by binary search,
+        so only a few dozen lines are scanned besides those in the range, as per
+        DfregexPattern.search_time_range. A str dfregex is encoded as UTF-8, since the file is scanned as bytes.
+        """
+        bytes_dfregex = dfregex.encode("utf-8") if isinstance(dfregex, str) else dfregex
+        return self.compile(bytes_dfregex).search_time_range(source, start, end)
+
+    # public
+    def index_file(
+        self,
+        dfregex: AnyStr,
+        source_path: Union[str, "os.PathLike[str]"],
+        index_path: Optional[Union[str, "os.PathLike[str]"]] = None,
+    ) -> "TimestampIndex":
+        """
+        Indexes the datetimes of the matches of a dfregex in a file into a sidecar file,
+        or reuses or extends an existing index, and opens it, as per DfregexPattern.index_file.
+        A str dfregex is encoded as UTF-8, since the file is scanned as bytes.
+        """
+        bytes_dfregex = dfregex.encode("utf-8") if isinstance(dfregex, str) else dfregex
+        return self.compile(bytes_dfregex).index_file(source_path, index_path)
+
+    # public
+    def aextract(
+        self,
+        dfregex: AnyStr,
+        reader: Any,
+        chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        framing: StreamFraming = "chunk",
+        executor: Optional["Executor"] = None,
+    ) -> AsyncIterator[DatetimeRecord]:
+        """
+        Extracts datetimes incrementally from an asyncio.StreamReader, given a dfregex search string,
+        as per DfregexPattern.aextract.
+
+        Use it as: async for record in dtmatcher.aextract(dfregex, reader).
+        """
+        return self.compile(dfregex).aextract(
+            reader, chunk_size, overlap, encoding, framing, executor
+        )
+
+    # public
+    def asub_stream(
+        self,
+        search_dfregex: AnyStr,
+        replacement: AnyStr,
+        reader: Any,
+        chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        framing: StreamFraming = "chunk",
+        executor: Optional["Executor"] = None,
+    ) -> AsyncIterator[AnyStr]:
+        """
+        Substitutes the dfregex search pattern throughout an asyncio.StreamReader, as per sub,
+        yielding the substituted stream piece by piece, as per DfregexPattern.asub_stream.
+        """
+        return self.compile(search_dfregex).asub_stream(
+            replacement, reader, chunk_size, overlap, encoding, framing, executor
+        )
 
     # ==================== re based public methods ====================
 
     # public
-    def search(self, search_dfregex: str, text: str) -> Optional[Match[str]]:
+    def search(self, search_dfregex: str, text: AnyStr) -> Optional[Match[AnyStr]]:
         """
         Scan through string looking for a match to the pattern, returning a Match object, or None if no match was found.
 
         Uses strftime codes within the dfregex search pattern to match against datetimes.
         """
-        # Convert to regex
-        search_regex = self.get_regex_from_dfregex(search_dfregex, False)
-        # Delegate to re
-        return re.search(search_regex, text)
+        return self.compile(search_dfregex).search(text)
 
     # public
-    def match(self, search_dfregex: str, text: str) -> Optional[Match[str]]:
+    def match(self, search_dfregex: str, text: AnyStr) -> Optional[Match[AnyStr]]:
         """
         Try to apply the pattern at the start of the string, returning a Match object, or None if no match was found.
 
         Uses strftime codes within the dfregex search pattern to match against datetimes.
         """
-        # Convert to regex
-        search_regex = self.get_regex_from_dfregex(search_dfregex, False)
-        # Delegate to re
-        return re.match(search_regex, text)
+        return self.compile(search_dfregex).match(text)
 
     # public
     # TODO: fullmatch
@@ -105,7 +450,7 @@ class DatetimeMatcher:
     # TODO: split
 
     # public
-    def findall(self, search_dfregex: str, text: str) -> List[Match[str]]:
+    def findall(self, search_dfregex: str, text: AnyStr) -> List[Match[AnyStr]]:
         """
         Return a list of all non-overlapping matches in the string.
 
@@ -115,13 +460,10 @@ class DatetimeMatcher:
 
         Empty matches are included in the result.
         """
-        # Convert to regex
-        search_regex = self.get_regex_from_dfregex(search_dfregex, False)
-        # Delegate to re
-        return re.findall(search_regex, text)
+        return self.compile(search_dfregex).findall(text)
 
     # public
-    def finditer(self, search_dfregex: str, text: str) -> Iterator[Match[str]]:
+    def finditer(self, search_dfregex: str, text: AnyStr) -> Iterator[Match[AnyStr]]:
         """
         Return an iterator over all non-overlapping matches in the string. For each match, the iterator returns a Match object.
 
@@ -129,15 +471,12 @@ class DatetimeMatcher:
 
         Empty matches are included in the result.
         """
-        # Convert to regex
-        search_regex = self.get_regex_from_dfregex(search_dfregex, False)
-        # Delegate to re
-        return re.finditer(search_regex, text)
+        return self.compile(search_dfregex).finditer(text)
 
     # public
     def sub(
-        self, search_dfregex: str, replacement: str, text: str, count: int = 0
-    ) -> str:
+        self, search_dfregex: str, replacement: AnyStr, text: AnyStr, count: int = 0
+    ) -> AnyStr:
         """
         Return the string obtained by replacing the leftmost non-overlapping occurrences of the pattern in string by the replacement repl.
         Backslash escapes in replacement are processed.
@@ -148,34 +487,232 @@ class DatetimeMatcher:
 
         Use a non-zero count to limit the number of substitutions.
         """
-        # Tokenize
-        tokens = list(self.__dfregexLexer.tokenize(search_dfregex))
-        # Generate the extraction regex
-        datetime_extraction_regex = self.__regexGenerator.generate_regex(tokens, True)
-        # Extract datetimes, maintaining one-to-one with matched groups
-        maybe_datetimes = list(
-            self.__extractor.extract_datetimes(
-                datetime_extraction_regex, tokens, text, count
-            )
-        )
-        # Generate the search regex (and do not capture datetimes, or the result would go against user's intentions)
-        search_regex = self.__regexGenerator.generate_regex(tokens, False)
-        # Use a match handler which iterates through the maybe datetimes at the same rate as matching
-        maybe_datetime = iter(maybe_datetimes)
+        return self.compile(search_dfregex).sub(replacement, text, count)
 
-        def match_handler(match: Match[str]) -> str:
-            dt = next(maybe_datetime, None)
-            if dt is None:
-                return match.expand(replacement)
-            else:
-                return match.expand(dt.strftime(replacement))
+    # public
+    # TODO: subn
 
-        # Delegate to re
-        subbed: str = re.sub(search_regex, match_handler, text, count)
-        return subbed
+    # ==================== batch public methods ====================
 
     # public
-    # TODO: subn
+    def extract_datetimes_many(
+        self,
+        dfregex: AnyStr,
+        texts: Iterable[AnyStr],
+        count: int = 0,
+        is_streaming: bool = False,
+    ) -> Union[List[List[datetime]], Iterator[List[datetime]]]:
+        """
+        Extracts the leftmost datetimes from each of many texts given a dfregex search string.
+
+        The dfregex is compiled only once for the whole batch.
+
+        Returns a list with, for each text in input order, the list of its datetimes.
+        If is_streaming is set, returns an Iterator which yields each text's list lazily instead.
+
+        Use a non-zero count to limit the number of extractions per text.
+        """
+        return self.compile(dfregex).extract_datetimes_many(texts, count, is_streaming)
+
+    # public
+    def sub_many(
+        self,
+        search_dfregex: str,
+        replacement: AnyStr,
+        texts: Iterable[AnyStr],
+        count: int = 0,
+        is_streaming: bool = False,
+    ) -> Union[List[AnyStr], Iterator[AnyStr]]:
+        """
+        Substitutes the dfregex search pattern in each of many texts, as per sub.
+
+        The dfregex is compiled only once for the whole batch.
+
+        Returns a list of the substituted texts in input order.
+        If is_streaming is set, returns an Iterator which yields them lazily instead.
+
+        Use a non-zero count to limit the number of substitutions per text.
+        """
+        return self.compile(search_dfregex).sub_many(
+            replacement, texts, count, is_streaming
+        )
+
+    # public
+    def extract_datetime64(
+        self, dfregex: AnyStr, texts: Sequence[AnyStr], return_mask: bool = False
+    ) -> Any:
+        """
+        Extracts the leftmost datetime from each of many texts given a dfregex search string,
+        into a numpy datetime64[us] array with NaT for the texts without a valid datetime.
+
+        Timezone-aware datetimes are converted to UTC.
+        If return_mask is set, returns a (datetimes, mask) pair, where the boolean mask
+        is True for the texts from which a datetime was extracted.
+
+        Requires numpy.
+        """
+        return self.compile(dfregex).extract_datetime64(texts, return_mask)
 
     # public
     # TODO: escape
+
+    # ==================== parallel public methods ====================
+
+    # public
+    def parallel_extract(
+        self,
+        dfregex: AnyStr,
+        texts: Iterable[AnyStr],
+        workers: Optional[int] = None,
+        chunksize: int = 1000,
+        count: int = 0,
+        is_ordered: bool = True,
+    ) -> Iterator[Any]:
+        """
+        Extracts the leftmost datetimes from each of many texts using a pool of worker processes.
+
+        Only the dfregex and chunks of chunksize texts are sent to the workers, each of which
+        compiles the dfregex once. The pool of workers (one per CPU by default) is kept
+        and reused by later parallel calls until close is called.
+
+        If is_ordered, returns an Iterator over each text's list of datetimes, in input order.
+        Otherwise, returns an Iterator over (index, list of datetimes) pairs in completion order.
+
+        Use a non-zero count to limit the number of extractions per text.
+        """
+        # Compile here too, so that an invalid dfregex fails in the caller's process,
+        # and so that the workers use the same locale as the caller's pattern
+        pattern = self.compile(dfregex)
+        return self.__get_process_pool_runner(workers).extract_datetimes(
+            dfregex, texts, chunksize, count, is_ordered, pattern.locale
+        )
+
+    # public
+    def parallel_sub(
+        self,
+        search_dfregex: str,
+        replacement: AnyStr,
+        texts: Iterable[AnyStr],
+        workers: Optional[int] = None,
+        chunksize: int = 1000,
+        count: int = 0,
+        is_ordered: bool = True,
+    ) -> Iterator[Any]:
+        """
+        Substitutes the dfregex search pattern in each of many texts using a pool of worker processes, as per sub.
+
+        The pool of workers is shared with parallel_extract.
+
+        If is_ordered, returns an Iterator over the substituted texts, in input order.
+        Otherwise, returns an Iterator over (index, substituted text) pairs in completion order.
+
+        Use a non-zero count to limit the number of substitutions per text.
+        """
+        pattern = self.compile(search_dfregex)
+        return self.__get_process_pool_runner(workers).sub(
+            search_dfregex,
+            replacement,
+            texts,
+            chunksize,
+            count,
+            is_ordered,
+            pattern.locale,
+        )
+
+    # public
+    def close(self) -> None:
+        """
+        Shuts down the worker processes used by the parallel methods, if any were started.
+        """
+        with self.__processPoolRunnerLock:
+            self.__close_process_pool_runner()
+
+    def __enter__(self) -> "DatetimeMatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # private
+    def __load_or_compile(
+        self, dfregex: AnyStr, is_name_case_insensitive: bool, locale: Optional[str]
+    ) -> DfregexPattern[AnyStr]:
+        if self.__patternDiskCache is None:
+            return self.__compile(dfregex, is_name_case_insensitive, locale)
+        # Key the entry by the locale the pattern is compiled with, resolved once,
+        # under the same lock as any temporary switch of the process's locale
+        locale = resolve_locale(locale)
+        disk_cache_key = (dfregex, is_name_case_insensitive, self.__is_safe, locale)
+        pattern = self.__patternDiskCache.get(disk_cache_key)
+        if pattern is None:
+            pattern = self.__compile(dfregex, is_name_case_insensitive, locale)
+            self.__patternDiskCache.put(disk_cache_key, pattern)
+        return pattern
+
+    # private
+    def __compile(
+        self, dfregex: AnyStr, is_name_case_insensitive: bool, locale: Optional[str]
+    ) -> DfregexPattern[AnyStr]:
+        # Pin the pattern to the locale current now, so that its names never change
+        locale_name = resolve_locale(locale)
+        hooks = self.__hooks
+        if hooks is not None:
+            start = perf_counter()
+        if isinstance(dfregex, bytes):
+            # Tokenize, decoding as latin-1 so that every byte maps to exactly one character
+            tokens = list(self.__dfregexLexer.tokenize(dfregex.decode("latin-1")))
+            generate_regex = self.__regexGenerator.generate_bytes_regex
+        else:
+            # Tokenize
+            tokens = list(self.__dfregexLexer.tokenize(dfregex))
+            generate_regex = self.__regexGenerator.generate_regex
+        if hooks is not None:
+            tokenized = perf_counter()
+            hooks.on_stage("tokenize", tokenized - start)
+        # Generate both the search regex and the extraction regex
+        regex_strs = [
+            generate_regex(
+                tokens,
+                is_capture_dfs,
+                is_name_case_insensitive=is_name_case_insensitive,
+                locale=locale_name,
+            )
+            for is_capture_dfs in (False, True)
+        ]
+        if hooks is not None:
+            generated = perf_counter()
+            hooks.on_stage("generate", generated - tokenized)
+        # Compile them
+        regex, extractor_regex = [re.compile(regex_str) for regex_str in regex_strs]
+        if hooks is not None:
+            hooks.on_stage("compile", perf_counter() - generated)
+        return DfregexPattern(
+            dfregex,
+            tokens,
+            regex,
+            extractor_regex,
+            is_name_case_insensitive,
+            locale_name,
+        )
+
+    # private
+    def __get_process_pool_runner(self, workers: Optional[int]) -> "ProcessPoolRunner":
+        with self.__processPoolRunnerLock:
+            # Reuse the pool unless a different number of workers is asked for
+            if self.__processPoolRunner is not None and (
+                workers is not None and workers != self.__processPoolRunner.workers
+            ):
+                self.__close_process_pool_runner()
+            if self.__processPoolRunner is None:
+                from datetime_matcher.parallel import ProcessPoolRunner
+
+                self.__processPoolRunner = ProcessPoolRunner(
+                    workers, self.__is_safe, self.__locale
+                )
+            return self.__processPoolRunner
+
+    # private
+    def __close_process_pool_runner(self) -> None:
+        if self.__processPoolRunner is not None:
+            self.__processPoolRunner.shutdown()
+            self.__processPoolRunner = None
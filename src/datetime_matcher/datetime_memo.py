@@ -0,0 +1,84 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import AnyStr, Match, NamedTuple, Optional, Tuple
+
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+
+
+class DatetimeMemoInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+    # public
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups which were hits, or 0.0 if there were none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MemoizingDatetimeExtractor(DatetimeExtractor):
+    """
+    A DatetimeExtractor which remembers the datetimes built from the values captured by one plan's
+    df groups, so that matches repeating the same timestamp text, like the lines of a log
+    within the same second, reuse the datetime built for the first of them.
+
+    At most maxsize datetimes are remembered, evicting the least recently used.
+    A maxsize of None makes the memo unbounded, which is only safe for texts with few distinct timestamps.
+
+    Matches of any other plan are extracted without the memo. The memo is thread-safe,
+    and the datetimes it returns are shared, which is safe since datetimes are immutable.
+    """
+
+    def __init__(
+        self,
+        plan: DatetimeExtractionPlan,
+        maxsize: Optional[int] = 1024,
+        extractor: Optional[DatetimeExtractor] = None,
+    ):
+        """
+        Initializer. Misses are extracted by extractor, or by a plain DatetimeExtractor if it is None.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"maxsize must be None or non-negative, got {maxsize}")
+        self.__plan = plan
+        self.__is_single_group = len(plan.group_indices) == 1
+        extract_datetime_from_values = (
+            extractor or DatetimeExtractor()
+        ).extract_datetime_from_values
+
+        # lru_cache hashes the values tuple once per lookup, and takes care of the locking
+        @lru_cache(maxsize=maxsize)
+        def extract_memoized(
+            values: Tuple[Optional[AnyStr], ...],
+        ) -> Optional[datetime]:
+            return extract_datetime_from_values(values, plan)
+
+        self.__extract_memoized = extract_memoized
+
+    # public
+    def extract_datetime_from_match(
+        self, match: Match[AnyStr], plan: DatetimeExtractionPlan
+    ) -> Optional[datetime]:
+        if plan is not self.__plan:
+            return super().extract_datetime_from_match(match, plan)
+        values = match.group(*plan.group_indices)
+        # match.group returns a bare value rather than a tuple when asked for a single group
+        if self.__is_single_group:
+            values = (values,)
+        return self.__extract_memoized(values)
+
+    # public
+    def memo_info(self) -> DatetimeMemoInfo:
+        """Returns the hit and miss counters and the current size of the memo."""
+        return DatetimeMemoInfo(*self.__extract_memoized.cache_info())
+
+    # public
+    def memo_clear(self) -> None:
+        """Forgets every remembered datetime, and zeroes the counters."""
+        self.__extract_memoized.cache_clear()
@@ -0,0 +1,144 @@
+import codecs
+import mmap
+import os
+from typing import IO, Any, Iterator, List, Literal, Match, Pattern, Tuple, Union
+
+# A stream to scan: an open text or binary file object, or the path of a file
+StreamSource = Union[IO[Any], str, "os.PathLike[str]"]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_OVERLAP = 4096
+# Reads from async streams are smaller, so that the event loop is never held up for long
+DEFAULT_ASYNC_CHUNK_SIZE = 1 << 16
+
+# How an async stream is split up for scanning: in chunks, which are overlapped so that
+# matches spanning two chunks are found, or in complete lines, which matches never span
+StreamFraming = Literal["chunk", "line"]
+
+
+class ChunkedMatchScanner:
+    """
+    Finds the non-overlapping matches of a regex in a stream which is fed in chunk by chunk,
+    while holding on to no more than the latest chunk plus twice the overlap.
+
+    A match is only reported once at least overlap more characters have been fed after it,
+    so any match no longer than overlap is found even when it spans a chunk boundary.
+    Longer matches, and matches which depend on anchors or lookarounds at a chunk boundary,
+    may be missed or cut short.
+    """
+
+    def __init__(self, regex: Pattern[Any], overlap: int = DEFAULT_OVERLAP):
+        """Initializer."""
+        if overlap < 0:
+            raise ValueError(f"overlap must be non-negative, got {overlap}")
+        self.__regex = regex
+        self.__overlap = overlap
+        self.__buffer: Any = regex.pattern[:0]
+        self.__buffer_offset = 0
+
+    # public
+    def feed(self, data: Any) -> List[Tuple[int, Match[Any]]]:
+        """
+        Feeds the next chunk of the stream.
+
+        Returns the matches which can now be reported, each with the offset of its start in the stream.
+        """
+        self.__buffer = self.__buffer + data
+        return self.__scan(False)
+
+    # public
+    def finish(self) -> List[Tuple[int, Match[Any]]]:
+        """
+        Marks the end of the stream.
+
+        Returns the remaining matches, each with the offset of its start in the stream.
+        """
+        return self.__scan(True)
+
+    # private
+    def __scan(self, is_final: bool) -> List[Tuple[int, Match[Any]]]:
+        buffer = self.__buffer
+        limit = len(buffer) if is_final else len(buffer) - self.__overlap
+        scanned_end = 0
+        matches = []
+        for match in self.__regex.finditer(buffer):
+            # Leave matches which could still grow or change with more data for the next scan
+            if match.end() > limit:
+                break
+            matches.append((self.__buffer_offset + match.start(), match))
+            scanned_end = match.end()
+        # Discard what is done with, keeping enough to find a match straddling the limit
+        cut = len(buffer) if is_final else max(scanned_end, limit - self.__overlap, 0)
+        self.__buffer = buffer[cut:]
+        self.__buffer_offset += cut
+        return matches
+
+
+def iter_stream_matches(
+    regex: Pattern[Any],
+    source: StreamSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+    encoding: str = "utf-8",
+    use_mmap: bool = False,
+) -> Iterator[Tuple[int, Match[Any]]]:
+    """
+    Iterates over the matches of a regex in a file object or a file at a path,
+    reading chunk_size characters (or bytes, from a binary file object) at a time,
+    and yields each match with the offset of its start in the stream.
+
+    A str regex reads text; binary file objects are decoded incrementally with encoding,
+    and offsets are counted in characters.
+    A bytes regex reads binary, and offsets are counted in bytes.
+
+    With use_mmap, a bytes regex scans the memory-mapped file directly, without reading
+    it into chunks or copying it, and chunk_size and overlap do not apply.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    is_bytes_regex = isinstance(regex.pattern, bytes)
+    if use_mmap and not is_bytes_regex:
+        raise ValueError("Scanning a memory-mapped file requires a bytes pattern")
+    if isinstance(source, (str, os.PathLike)):
+        if is_bytes_regex:
+            with open(source, "rb") as stream:
+                yield from iter_stream_matches(
+                    regex, stream, chunk_size, overlap, encoding, use_mmap
+                )
+        else:
+            with open(source, "r", encoding=encoding, newline="") as stream:
+                yield from iter_stream_matches(
+                    regex, stream, chunk_size, overlap, encoding
+                )
+        return
+    if use_mmap:
+        yield from _iter_mmap_matches(regex, source)
+        return
+    scanner = ChunkedMatchScanner(regex, overlap)
+    decoder = None
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            if decoder is not None:
+                yield from scanner.feed(decoder.decode(b"", True))
+            break
+        if isinstance(data, str):
+            if is_bytes_regex:
+                raise TypeError("Cannot scan a text stream with a bytes pattern")
+        elif not is_bytes_regex:
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            data = decoder.decode(data)
+        yield from scanner.feed(data)
+    yield from scanner.finish()
+
+
+def _iter_mmap_matches(
+    regex: Pattern[bytes], stream: IO[Any]
+) -> Iterator[Tuple[int, Match[bytes]]]:
+    # An empty file cannot be memory-mapped, but has no matches anyway
+    if os.fstat(stream.fileno()).st_size == 0:
+        return
+    with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for match in regex.finditer(mapped):
+            yield match.start(), match
@@ -0,0 +1,170 @@
+from datetime import datetime
+from itertools import compress
+from operator import ne
+from typing import (
+    Any,
+    AnyStr,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Match,
+    Optional,
+    Tuple,
+)
+
+from datetime_matcher.datetime_builder import (
+    NUM_FIELD_SLOTS,
+    build_datetime_from_fields,
+)
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+from datetime_matcher.model_types import DatetimeRecord
+
+# The index among datetime's arguments of each of its fields, by their keyword
+_DATETIME_ARG_IDXS_BY_REPLACE_KEYWORD = {
+    keyword: idx
+    for idx, keyword in enumerate(
+        ("year", "month", "day", "hour", "minute", "second", "microsecond", "tzinfo")
+    )
+}
+
+# What to do with a record whose datetime is earlier than the previous record's
+DisorderPolicy = Literal["raise", "skip", "keep"]
+
+
+def _get_datetime_args(dt: datetime) -> List[Any]:
+    return [
+        dt.year,
+        dt.month,
+        dt.day,
+        dt.hour,
+        dt.minute,
+        dt.second,
+        dt.microsecond,
+        dt.tzinfo,
+    ]
+
+
+class DeltaDatetimeExtractor(DatetimeExtractor):
+    """
+    A DatetimeExtractor for the matches of one plan in an ordered stream, where consecutive matches
+    mostly share their leading fields, e.g. the date, and differ only in the seconds or their fraction.
+
+    Each match's captured values are compared with the previous match's, and only those which changed
+    are converted. If the fields they set appear in the datetime as is, the datetime is made from
+    the previous one's with just those fields changed; otherwise, it is built again from the previous
+    fields and the changed ones. The datetimes are the same as DatetimeExtractor's.
+
+    An extractor remembers the previous match, so it must only be used for one stream, by one thread.
+    Matches of any other plan, or of a plan which falls back to strptime, are extracted as usual.
+    """
+
+    def __init__(self, plan: DatetimeExtractionPlan):
+        self.__plan = plan
+        self.__is_single_group = len(plan.group_indices) == 1
+        self.__group_idxs = range(len(plan.group_indices))
+        # Where each group's field goes among the datetime's arguments, -1 if nowhere,
+        # or None if the datetime has to be built again when it changes
+        self.__datetime_arg_idxs: Tuple[Optional[int], ...] = tuple(
+            (
+                None
+                if replace_keyword is None
+                else _DATETIME_ARG_IDXS_BY_REPLACE_KEYWORD.get(replace_keyword, -1)
+            )
+            for replace_keyword in (plan.replace_keywords or ())
+        )
+        self.__reset()
+
+    # public
+    def extract_datetime_from_match(
+        self, match: Match[AnyStr], plan: DatetimeExtractionPlan
+    ) -> Optional[datetime]:
+        if plan is not self.__plan or plan.field_converters is None:
+            return super().extract_datetime_from_match(match, plan)
+        values = match.group(*plan.group_indices)
+        # match.group returns a bare value rather than a tuple when asked for a single group
+        if self.__is_single_group:
+            values = (values,)
+        previous_values = self.__previous_values
+        if values == previous_values:
+            return self.__previous_datetime
+        field_converters = plan.field_converters
+        fields = self.__fields
+        datetime_args = self.__datetime_args
+        try:
+            if previous_values is None:
+                for (slot, convert), value in zip(field_converters, values):
+                    fields[slot] = convert(value)
+                is_rebuild = True
+            else:
+                datetime_arg_idxs = self.__datetime_arg_idxs
+                is_rebuild = self.__previous_datetime is None
+                # Usually only the last one or two values change, so compare them all in C
+                for idx in compress(
+                    self.__group_idxs, map(ne, values, previous_values)
+                ):
+                    slot, convert = field_converters[idx]
+                    field = fields[slot] = convert(values[idx])
+                    datetime_arg_idx = datetime_arg_idxs[idx]
+                    if datetime_arg_idx is None:
+                        is_rebuild = True
+                    elif datetime_arg_idx >= 0:
+                        datetime_args[datetime_arg_idx] = field
+            if is_rebuild:
+                maybe_datetime = build_datetime_from_fields(fields)
+                if maybe_datetime is not None:
+                    self.__datetime_args = _get_datetime_args(maybe_datetime)
+            else:
+                maybe_datetime = datetime(*datetime_args)
+        except (ValueError, KeyError, TypeError, OverflowError):
+            # The fields may be only partly converted, so start afresh with the next match
+            self.__reset()
+            return None
+        self.__previous_values = values
+        self.__previous_datetime = maybe_datetime
+        return maybe_datetime
+
+    # private
+    def __reset(self) -> None:
+        self.__previous_values: Optional[Tuple[Any, ...]] = None
+        self.__previous_datetime: Optional[datetime] = None
+        self.__fields: List[Any] = [None] * NUM_FIELD_SLOTS
+        # The arguments of datetime() which make the previous datetime
+        self.__datetime_args: List[Any] = [None] * 8
+
+
+def iter_ordered_records(
+    records: Iterable[DatetimeRecord],
+    on_disorder: DisorderPolicy = "raise",
+    disorder_handler: Optional[Callable[[DatetimeRecord, DatetimeRecord], None]] = None,
+) -> Iterator[DatetimeRecord]:
+    """
+    Checks that the datetimes of records never decrease, yielding the records in order.
+
+    For each record whose datetime is earlier than the previous record's, disorder_handler is called
+    with the previous record and that record, e.g. to log or count it. Then, according to on_disorder,
+    a ValueError is raised, the record is skipped (so the previous record stays the one to compare with),
+    or it is kept.
+    """
+    if on_disorder not in ("raise", "skip", "keep"):
+        raise ValueError(
+            f"on_disorder must be 'raise', 'skip' or 'keep', got {on_disorder!r}"
+        )
+    previous_record: Optional[DatetimeRecord] = None
+    for record in records:
+        if previous_record is not None and record.datetime < previous_record.datetime:
+            if disorder_handler is not None:
+                disorder_handler(previous_record, record)
+            if on_disorder == "raise":
+                raise ValueError(
+                    f"datetime {record.datetime} at offset {record.offset} is earlier than "
+                    f"datetime {previous_record.datetime} at offset {previous_record.offset}"
+                )
+            if on_disorder == "skip":
+                continue
+        previous_record = record
+        yield record
@@ -1,5 +1,6 @@
 import re
-from typing import Dict, Iterable, Iterator, List, cast
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Pattern, cast
 
 from datetime_matcher.model_types import (
     SUPPORTED_DATETIME_FORMAT_CODES,
@@ -9,18 +10,47 @@ from datetime_matcher.model_types import (
 )
 
 
-class DfregexLexer:
-    def __init__(self) -> None:
-        """Initializer."""
-        self.dfregex_lexer_spec_by_token_kind: Dict[DfregexTokenKindType, str] = {
-            "DATETIME_FORMAT_CODE": self.__get_regex_matching_supported_format_codes(),
-            "PERCENT_LITERAL": r"\\%",
-            "OTHER_REGEX_CHAR": r".",
-        }
-        self.dfregex_lexer_spec = "|".join(
+def _get_regex_matching_supported_format_codes(capturing=False) -> str:
+    regex = "|".join(SUPPORTED_DATETIME_FORMAT_CODES)
+    return ("(%(?:{}))" if capturing else "(?:%(?:{}))").format(regex)
+
+
+@lru_cache(maxsize=None)
+def _get_lexer_spec_by_token_kind() -> Dict[DfregexTokenKindType, str]:
+    # Built on first use and shared by every lexer, so never mutated
+    return {
+        "DATETIME_FORMAT_CODE": _get_regex_matching_supported_format_codes(),
+        "PERCENT_LITERAL": r"\\%",
+        "OTHER_REGEX_CHAR": r".",
+    }
+
+
+@lru_cache(maxsize=None)
+def _get_lexer_regex() -> Pattern[str]:
+    return re.compile(
+        "|".join(
             f"(?P<{kind}>{regex})"
-            for kind, regex in self.dfregex_lexer_spec_by_token_kind.items()
+            for kind, regex in _get_lexer_spec_by_token_kind().items()
         )
+    )
+
+
+class DfregexLexer:
+    """
+    Splits dfregexes into tokens.
+
+    The lexer's spec is compiled on first use and then shared by every lexer.
+    """
+
+    # public
+    @property
+    def dfregex_lexer_spec_by_token_kind(self) -> Dict[DfregexTokenKindType, str]:
+        return _get_lexer_spec_by_token_kind()
+
+    # public
+    @property
+    def dfregex_lexer_spec(self) -> str:
+        return _get_lexer_regex().pattern
 
     # public
     def tokenize(self, dfregex: str) -> Iterator[DfregexToken]:
@@ -37,7 +67,7 @@ class DfregexLexer:
 
     # private
     def __tokenize(self, dfregex: str) -> Iterator[DfregexToken]:
-        for match in re.finditer(self.dfregex_lexer_spec, dfregex):
+        for match in _get_lexer_regex().finditer(dfregex):
             kind = cast(DfregexTokenKindType, match.lastgroup)
             value = match.group()
             yield DfregexToken(kind, value)
@@ -58,12 +88,3 @@ class DfregexLexer:
                 yield token
         if len(otherRegexCharsBuilder) > 0:
             yield DfregexToken("OTHER_REGEX_CHAR", "".join(otherRegexCharsBuilder))
-
-    # private
-    def __get_supported_format_codes(self) -> List[SupportedDatetimeFormatCodeType]:
-        return list(SUPPORTED_DATETIME_FORMAT_CODES)
-
-    # private
-    def __get_regex_matching_supported_format_codes(self, capturing=False) -> str:
-        regex = "|".join(self.__get_supported_format_codes())
-        return ("(%(?:{}))" if capturing else "(?:%(?:{}))").format(regex)
@@ -0,0 +1,727 @@
+import dataclasses
+import os
+import re
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AnyStr,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+from datetime_matcher.datetime_stream import (
+    DEFAULT_ASYNC_CHUNK_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_OVERLAP,
+    StreamFraming,
+    StreamSource,
+    iter_stream_matches,
+)
+from datetime_matcher.literal_prefilter import (
+    extract_literal_prefix,
+    extract_required_literals,
+)
+from datetime_matcher.model_types import DatetimeLine, DatetimeRecord, DfregexToken
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from datetime_matcher.datetime_memo import (
+        DatetimeMemoInfo,
+        MemoizingDatetimeExtractor,
+    )
+    from datetime_matcher.delta_extractor import DisorderPolicy
+    from datetime_matcher.instrumentation import MatcherHooks
+    from datetime_matcher.timestamp_index import TimestampIndex
+
+
+# A backslash escape in a replacement template, as understood by re's template parser:
+# a \g<...> reference, a 3-digit octal escape, a numeric group reference, or any other escape
+_TEMPLATE_ESCAPE_RE = re.compile(
+    r"\\(?:g<([^>]*)>|([0-7]{3})|([1-9][0-9]?)|(.))", re.DOTALL
+)
+# A format code in a bytes replacement template
+_BYTES_FORMAT_CODE_RE = re.compile(rb"%-?[A-Za-z%]")
+
+
+def _remap_template_group_refs(
+    template: AnyStr, group_indices: Sequence[int]
+) -> AnyStr:
+    r"""
+    Rewrite the numeric group references in a replacement template so that
+    group n refers to the group at group_indices[n] (e.g. r'\1' -> r'\g<3>').
+    Named group references and other escapes are left untouched.
+    """
+    if isinstance(template, bytes):
+        return _remap_template_group_refs(
+            template.decode("latin-1"), group_indices
+        ).encode("latin-1")
+
+    def remap(escape: Match[AnyStr]) -> str:
+        name, _, number, _ = escape.groups()
+        if number is None and (name is None or not name.isdecimal()):
+            return escape.group()
+        group_num = int(number if number is not None else name)
+        if group_num >= len(group_indices):
+            raise re.error(f"invalid group reference {group_num}")
+        return f"\\g<{group_indices[group_num]}>"
+
+    return _TEMPLATE_ESCAPE_RE.sub(remap, template)
+
+
+def _strftime_bytes(dt: datetime, template: bytes) -> bytes:
+    """Formats the format codes in a bytes template, encoding their output as UTF-8."""
+    return _BYTES_FORMAT_CODE_RE.sub(
+        lambda format_code: dt.strftime(format_code.group().decode("ascii")).encode(
+            "utf-8"
+        ),
+        template,
+    )
+
+
+class DfregexPattern(Generic[AnyStr]):
+    """
+    A compiled dfregex search pattern, analogous to a compiled re.Pattern.
+
+    Like re.Pattern, it is either a str pattern, which matches str texts, or a bytes pattern,
+    which matches bytes-like texts (bytes, bytearray, memoryview, mmap).
+
+    Obtain one from DatetimeMatcher.compile. The tokens, the regexes and the
+    mapping of datetime format groups to format codes are all computed once,
+    so each call only pays for the regex scan and the datetime construction.
+
+    A pattern is immutable, and none of its methods take a lock or change global state,
+    so it can be shared freely between threads. The only exception is the memo of a pattern
+    made by with_memo, which is a thread-safe lru_cache. Compiling a pattern with a locale whose names
+    have not been read yet is not thread-safe, as per DatetimeMatcher.
+    """
+
+    def __init__(
+        self,
+        dfregex: AnyStr,
+        tokens: List[DfregexToken],
+        regex: Pattern[AnyStr],
+        extractor_regex: Pattern[AnyStr],
+        is_name_case_insensitive: bool = False,
+        locale: Optional[str] = None,
+        hooks: Optional["MatcherHooks"] = None,
+        memo_size: Optional[int] = 0,
+    ):
+        self.__dfregex = dfregex
+        self.__is_name_case_insensitive = is_name_case_insensitive
+        self.__locale = locale
+        self.__tokens = tuple(tokens)
+        self.__regex = regex
+        self.__extractor_regex = extractor_regex
+        self.__df_group_format_codes: Dict[str, str] = {
+            f"DF___{idx}": token.value
+            for idx, token in enumerate(
+                token for token in tokens if token.kind == "DATETIME_FORMAT_CODE"
+            )
+        }
+        # The extraction regex numbers its groups differently from the search regex
+        # because of the extra DF___n groups, so keep track of where each of the
+        # search regex's groups (including group 0) lives in the extraction regex
+        df_group_indices = set(
+            extractor_regex.groupindex[df_group_name]
+            for df_group_name in self.__df_group_format_codes
+        )
+        self.__search_group_indices = tuple(
+            group_idx
+            for group_idx in range(extractor_regex.groups + 1)
+            if group_idx not in df_group_indices
+        )
+        self.__extractor = DatetimeExtractor()
+        self.__extraction_plan = self.__extractor.create_extraction_plan(
+            extractor_regex, tokens, locale=locale
+        )
+        # The properties expose the plain regexes and plan, even when scanning goes through timed ones
+        self.__hooks = hooks
+        self.__memo_size = memo_size
+        self.__plain_regex = regex
+        self.__plain_extractor_regex = extractor_regex
+        self.__plain_extraction_plan = self.__extraction_plan
+        if hooks is not None:
+            # Imported here so that uninstrumented use never loads it
+            from datetime_matcher.instrumentation import TimedRegex
+
+            self.__regex = TimedRegex(regex, hooks)
+            self.__extractor_regex = TimedRegex(extractor_regex, hooks)
+            self.__extraction_plan = dataclasses.replace(
+                self.__extraction_plan, regex=self.__extractor_regex
+            )
+        self.__memoizing_extractor: Optional["MemoizingDatetimeExtractor"] = None
+        if memo_size != 0:
+            # Imported here so that patterns without a memo never load it
+            from datetime_matcher.datetime_memo import MemoizingDatetimeExtractor
+
+            self.__memoizing_extractor = MemoizingDatetimeExtractor(
+                self.__extraction_plan, memo_size
+            )
+            self.__extractor = self.__memoizing_extractor
+        if hooks is not None:
+            from datetime_matcher.instrumentation import InstrumentedDatetimeExtractor
+
+            self.__extractor = InstrumentedDatetimeExtractor(hooks, self.__extractor)
+        # Substrings which every match must contain, so that texts without them
+        # can be skipped with a cheap substring check instead of a regex scan
+        self.__required_literals: Tuple[AnyStr, ...] = tuple(
+            literal.encode("latin-1") if isinstance(dfregex, bytes) else literal
+            for literal in extract_required_literals(tokens)
+        )
+        # re already scans quickly for a literal prefix, so the check would only add overhead
+        self.__prefilter_literals = (
+            () if extract_literal_prefix(tokens) else self.__required_literals
+        )
+
+    def __repr__(self) -> str:
+        return f"DfregexPattern({self.__dfregex!r})"
+
+    # public
+    @property
+    def pattern(self) -> AnyStr:
+        """The dfregex string from which this pattern was compiled."""
+        return self.__dfregex
+
+    # public
+    @property
+    def tokens(self) -> Tuple[DfregexToken, ...]:
+        """The DfregexTokens of the dfregex."""
+        return self.__tokens
+
+    # public
+    @property
+    def regex(self) -> Pattern[AnyStr]:
+        """The compiled search regex, in which datetime format groups are not captured."""
+        return self.__plain_regex
+
+    # public
+    @property
+    def extractor_regex(self) -> Pattern[AnyStr]:
+        """The compiled extraction regex, in which datetime format groups are captured as DF___n."""
+        return self.__plain_extractor_regex
+
+    # public
+    @property
+    def df_group_format_codes(self) -> Dict[str, str]:
+        """A mapping of each datetime format group name (DF___n) to its format code."""
+        return dict(self.__df_group_format_codes)
+
+    # public
+    @property
+    def extraction_plan(self) -> DatetimeExtractionPlan:
+        """The plan for turning a match of the extraction regex into a datetime."""
+        return self.__plain_extraction_plan
+
+    # public
+    @property
+    def is_name_case_insensitive(self) -> bool:
+        """Whether the month, weekday and AM/PM names are matched case-insensitively."""
+        return self.__is_name_case_insensitive
+
+    # public
+    @property
+    def locale(self) -> Optional[str]:
+        """The LC_TIME locale whose month, weekday and AM/PM names are matched, or None for the current one."""
+        return self.__locale
+
+    # public
+    @property
+    def hooks(self) -> Optional["MatcherHooks"]:
+        """The hooks to which this pattern reports instrumentation events, or None if it is not instrumented."""
+        return self.__hooks
+
+    # public
+    @property
+    def required_literals(self) -> Tuple[AnyStr, ...]:
+        """Substrings which every match of this pattern contains, longest first."""
+        return self.__required_literals
+
+    # public
+    @property
+    def memo_size(self) -> Optional[int]:
+        """The maximum number of datetimes remembered by this pattern's memo, None if unbounded, or 0 if it has none."""
+        return self.__memo_size
+
+    # public
+    def with_hooks(self, hooks: Optional["MatcherHooks"]) -> "DfregexPattern[AnyStr]":
+        """
+        Returns a copy of this pattern which reports the time spent scanning and extracting,
+        and the outcome of each extraction, to hooks, e.g. a MatcherStats.
+        With None, returns an uninstrumented copy.
+
+        Only instrumented patterns pay for the instrumentation. They cannot be pickled,
+        unless their hooks can.
+        """
+        return self.__copy(hooks, self.__memo_size)
+
+    # public
+    def with_memo(self, memo_size: Optional[int] = 1024) -> "DfregexPattern[AnyStr]":
+        """
+        Returns a copy of this pattern which remembers the datetimes built from the last memo_size
+        distinct tuples of captured datetime values, so that matches repeating the same timestamp text,
+        like the lines of a log within the same second, skip building the datetime again.
+        Use None for an unbounded memo, or 0 for a copy without one.
+
+        The memo belongs to the copy, and starts out empty. Patterns with a memo cannot be pickled.
+        """
+        return self.__copy(self.__hooks, memo_size)
+
+    # public
+    def memo_info(self) -> Optional["DatetimeMemoInfo"]:
+        """
+        Returns the hit and miss counters and the current size of this pattern's memo,
+        or None if it has none.
+        """
+        if self.__memoizing_extractor is None:
+            return None
+        return self.__memoizing_extractor.memo_info()
+
+    # public
+    def extract_datetime(self, text: AnyStr) -> Optional[datetime]:
+        """
+        Extracts the leftmost datetime from text.
+
+        Returns the matching datetime object if found, otherwise returns None.
+        """
+        return next(iter(self.extract_datetimes(text, 1)), None)
+
+    # public
+    def extract_datetimes(self, text: AnyStr, count: int = 0) -> Iterator[datetime]:
+        """
+        Extracts the leftmost datetimes from text.
+
+        Returns an Iterator over datetime objects.
+
+        Use a non-zero count to limit the number of extractions.
+        """
+        if self.__prefilter_literals and self.__is_excluded_by_literals(text):
+            return
+        # Extract up to `count` number of datetimes
+        # but only keep those which are successful (not None)
+        extract_num = 0
+        for maybe_datetime in self.__extractor.extract_datetimes_with_plan(
+            self.__extraction_plan, text
+        ):
+            if count > 0 and extract_num >= count:
+                break
+            if maybe_datetime is not None:
+                extract_num += 1
+                yield maybe_datetime
+
+    # public
+    def extract_datetimes_from_stream(
+        self,
+        source: StreamSource,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        use_mmap: bool = False,
+    ) -> Iterator[DatetimeRecord]:
+        """
+        Extracts datetimes incrementally from a text or binary file object, or from the file at a path,
+        reading chunk_size at a time so that memory use stays flat regardless of the size of the file.
+
+        Returns an Iterator over DatetimeRecords, each holding a datetime and the offsets of its match.
+        A str pattern decodes binary input with encoding, and offsets are counted in characters.
+        A bytes pattern scans binary input as is, and offsets are counted in bytes.
+
+        Matches spanning a chunk boundary are found as long as they are no longer than overlap.
+
+        With use_mmap, a bytes pattern scans the memory-mapped file instead, without copying it.
+        """
+        create_record = self.__create_record
+        for offset, match in iter_stream_matches(
+            self.__extractor_regex, source, chunk_size, overlap, encoding, use_mmap
+        ):
+            record = create_record(offset, match)
+            if record is not None:
+                yield record
+
+    # public
+    def extract_ordered_datetimes_from_stream(
+        self,
+        source: StreamSource,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        use_mmap: bool = False,
+        on_disorder: "DisorderPolicy" = "raise",
+        disorder_handler: Optional[
+            Callable[[DatetimeRecord, DatetimeRecord], None]
+        ] = None,
+    ) -> Iterator[DatetimeRecord]:
+        """
+        Extracts datetimes incrementally from a stream whose datetimes never decrease, like a sorted log,
+        as per extract_datetimes_from_stream.
+
+        Each match only converts the values which changed since the previous match, updating
+        the previous datetime where it can instead of building a new one (see DeltaDatetimeExtractor).
+
+        If a datetime is earlier than the previous record's, disorder_handler is called with both records,
+        and then on_disorder decides whether to raise a ValueError ("raise"), to skip the record ("skip"),
+        or to keep it ("keep").
+        """
+        # Imported here so that only those who extract from ordered streams load it
+        from datetime_matcher.delta_extractor import (
+            DeltaDatetimeExtractor,
+            iter_ordered_records,
+        )
+
+        plan = self.__extraction_plan
+        extractor: DatetimeExtractor = DeltaDatetimeExtractor(plan)
+        if self.__hooks is not None:
+            from datetime_matcher.instrumentation import InstrumentedDatetimeExtractor
+
+            extractor = InstrumentedDatetimeExtractor(self.__hooks, extractor)
+        extract_datetime_from_match = extractor.extract_datetime_from_match
+
+        def iter_records() -> Iterator[DatetimeRecord]:
+            for offset, match in iter_stream_matches(
+                self.__extractor_regex, source, chunk_size, overlap, encoding, use_mmap
+            ):
+                maybe_datetime = extract_datetime_from_match(match, plan)
+                if maybe_datetime is not None:
+                    yield DatetimeRecord(
+                        offset, offset + match.end() - match.start(), maybe_datetime
+                    )
+
+        return iter_ordered_records(iter_records(), on_disorder, disorder_handler)
+
+    # public
+    def search_time_range(
+        self, source: StreamSource, start: datetime, end: datetime
+    ) -> Iterator[DatetimeLine]:
+        """
+        Iterates over the lines of a file whose datetimes never decrease, like a log,
+        yielding the lines dated from start (inclusive) to end (exclusive), each as a DatetimeLine.
+        Requires a bytes pattern, which is used to find the datetime of each line.
+
+        The file is memory-mapped and the start of the range is found by binary search,
+        so the cost is a few dozen probes plus the lines in the range, whatever the size of the file.
+
+        A line's datetime is that of the first match in it. Lines without a match, like the
+        continuation lines of multi-line records, are kept with the line before them.
+        Use (?m) for ^ and $ to match at the start and end of each line.
+        """
+        # Imported here so that only those who search time ranges load it
+        from datetime_matcher.time_range import iter_time_range_lines
+
+        return iter_time_range_lines(self.__extraction_plan, source, start, end)
+
+    # public
+    def index_file(
+        self,
+        source_path: Union[str, "os.PathLike[str]"],
+        index_path: Optional[Union[str, "os.PathLike[str]"]] = None,
+    ) -> "TimestampIndex":
+        """
+        Indexes the datetimes of the matches in a file into a sidecar file, and opens the index.
+        Requires a bytes pattern. The index is at index_path, or next to the file with a .dtmidx suffix.
+
+        The index holds each match's datetime and offsets, sorted by datetime, so its datetimes and
+        time ranges are read without scanning the file again (see TimestampIndex).
+        An index which is up to date is reused, one whose file has only grown is extended,
+        and any other is rebuilt. A file counts as grown if a sample of what was indexed is unchanged,
+        so an in-place edit of a large file which keeps its size can go unnoticed
+        (see TimestampIndex.build_or_update).
+        """
+        # Imported here so that only those who index files load it
+        from datetime_matcher.timestamp_index import TimestampIndex
+
+        if index_path is None:
+            index_path = os.fspath(source_path) + ".dtmidx"
+        return TimestampIndex.build_or_update(
+            self.__extraction_plan, source_path, index_path
+        )
+
+    # public
+    def aextract(
+        self,
+        reader: Any,
+        chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        framing: StreamFraming = "chunk",
+        executor: Optional["Executor"] = None,
+    ) -> AsyncIterator[DatetimeRecord]:
+        """
+        Extracts datetimes incrementally from an asyncio.StreamReader, or any reader with an awaitable read(n),
+        reading at most chunk_size at a time.
+
+        Returns an AsyncIterator over DatetimeRecords, each holding a datetime and the offsets of its match.
+        A str pattern decodes the stream with encoding, and offsets are counted in characters.
+        A bytes pattern scans it as is, and offsets are counted in bytes.
+
+        With "chunk" framing, matches spanning two reads are found as long as they are no longer
+        than overlap, and are reported once overlap more characters have been read.
+        With "line" framing, matches must not span lines, and are reported as soon as their line is read.
+
+        If an executor is given, e.g. a ThreadPoolExecutor, the matching and extraction of each read
+        run in it, so that the event loop stays responsive. The stream is only read as fast as
+        the records are consumed.
+        """
+        # Imported here so that asyncio is only loaded by those who use it
+        from datetime_matcher.async_stream import aiter_stream_records
+
+        return aiter_stream_records(
+            self.__extractor_regex,
+            reader,
+            self.__create_record,
+            chunk_size,
+            overlap,
+            encoding,
+            framing,
+            executor,
+        )
+
+    # public
+    def asub_stream(
+        self,
+        replacement: AnyStr,
+        reader: Any,
+        chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        encoding: str = "utf-8",
+        framing: StreamFraming = "chunk",
+        executor: Optional["Executor"] = None,
+    ) -> AsyncIterator[AnyStr]:
+        """
+        Substitutes the pattern throughout an asyncio.StreamReader, or any reader with an awaitable read(n),
+        as per sub, reading at most chunk_size at a time.
+
+        Returns an AsyncIterator over pieces of the substituted stream, which make it up when joined.
+        Decoding, framing and the executor work as per aextract.
+        """
+        from datetime_matcher.async_stream import asub_stream
+
+        return asub_stream(
+            self.__extractor_regex,
+            reader,
+            self.__create_sub_match_handler(replacement),
+            chunk_size,
+            overlap,
+            encoding,
+            framing,
+            executor,
+        )
+
+    # public
+    def search(self, text: AnyStr) -> Optional[Match[AnyStr]]:
+        """
+        Scan through string looking for a match to the pattern, returning a Match object, or None if no match was found.
+        """
+        if self.__prefilter_literals and self.__is_excluded_by_literals(text):
+            return None
+        return self.__regex.search(text)
+
+    # public
+    def match(self, text: AnyStr) -> Optional[Match[AnyStr]]:
+        """
+        Try to apply the pattern at the start of the string, returning a Match object, or None if no match was found.
+        """
+        if self.__prefilter_literals and self.__is_excluded_by_literals(text):
+            return None
+        return self.__regex.match(text)
+
+    # public
+    def findall(self, text: AnyStr) -> List[Match[AnyStr]]:
+        """
+        Return a list of all non-overlapping matches in the string.
+
+        If one or more capturing groups are present in the pattern, return a list of groups; this will be a list of tuples if the pattern has more than one group.
+
+        Empty matches are included in the result.
+        """
+        if self.__prefilter_literals and self.__is_excluded_by_literals(text):
+            return []
+        return self.__regex.findall(text)
+
+    # public
+    def finditer(self, text: AnyStr) -> Iterator[Match[AnyStr]]:
+        """
+        Return an iterator over all non-overlapping matches in the string. For each match, the iterator returns a Match object.
+
+        Empty matches are included in the result.
+        """
+        if self.__prefilter_literals and self.__is_excluded_by_literals(text):
+            return iter(())
+        return self.__regex.finditer(text)
+
+    # public
+    def sub(self, replacement: AnyStr, text: AnyStr, count: int = 0) -> AnyStr:
+        """
+        Return the string obtained by replacing the leftmost non-overlapping occurrences of the pattern in string by the replacement repl.
+        Backslash escapes in replacement are processed.
+
+        The datetime format codes in the replacement are substituted with the datetime extracted from each match.
+
+        If no matches are found, the original text is returned.
+
+        Use a non-zero count to limit the number of substitutions.
+        """
+        match_handler = self.__create_sub_match_handler(replacement)
+        if self.__prefilter_literals and self.__is_excluded_by_literals(text):
+            return text
+        # Delegate to re
+        subbed: AnyStr = self.__extractor_regex.sub(match_handler, text, count)
+        return subbed
+
+    # public
+    def extract_datetimes_many(
+        self, texts: Iterable[AnyStr], count: int = 0, is_streaming: bool = False
+    ) -> Union[List[List[datetime]], Iterator[List[datetime]]]:
+        """
+        Extracts the leftmost datetimes from each of many texts.
+
+        Returns a list with, for each text in input order, the list of its datetimes.
+        If is_streaming is set, returns an Iterator which yields each text's list lazily instead.
+
+        Use a non-zero count to limit the number of extractions per text.
+        """
+        finditer = self.__extractor_regex.finditer
+        extract_datetime_from_match = self.__extractor.extract_datetime_from_match
+        plan = self.__extraction_plan
+
+        is_excluded_by_literals = self.__is_excluded_by_literals
+
+        def extract_all(text: AnyStr) -> List[datetime]:
+            datetimes: List[datetime] = []
+            if is_excluded_by_literals(text):
+                return datetimes
+            for match in finditer(text):
+                maybe_datetime = extract_datetime_from_match(match, plan)
+                if maybe_datetime is not None:
+                    datetimes.append(maybe_datetime)
+                    if len(datetimes) == count:
+                        break
+            return datetimes
+
+        results = map(extract_all, texts)
+        return results if is_streaming else list(results)
+
+    # public
+    def sub_many(
+        self,
+        replacement: AnyStr,
+        texts: Iterable[AnyStr],
+        count: int = 0,
+        is_streaming: bool = False,
+    ) -> Union[List[AnyStr], Iterator[AnyStr]]:
+        """
+        Substitutes the pattern in each of many texts, as per sub.
+
+        Returns a list of the substituted texts in input order.
+        If is_streaming is set, returns an Iterator which yields them lazily instead.
+
+        Use a non-zero count to limit the number of substitutions per text.
+        """
+        regex_sub = self.__extractor_regex.sub
+        # The same match handler serves every text
+        match_handler = self.__create_sub_match_handler(replacement)
+        is_excluded_by_literals = self.__is_excluded_by_literals
+        results = (
+            (
+                text
+                if is_excluded_by_literals(text)
+                else regex_sub(match_handler, text, count)
+            )
+            for text in texts
+        )
+        return results if is_streaming else list(results)
+
+    # public
+    def extract_datetime64(
+        self, texts: Sequence[AnyStr], return_mask: bool = False
+    ) -> Any:
+        """
+        Extracts the leftmost datetime from each of many texts into a numpy datetime64[us] array,
+        converting the captured fields column by column instead of one datetime at a time.
+
+        Texts without a valid datetime get NaT. Timezone-aware datetimes are converted to UTC.
+        If return_mask is set, returns a (datetimes, mask) pair, where the boolean mask
+        is True for the texts from which a datetime was extracted.
+
+        Requires numpy.
+        """
+        # Imported here so that numpy is only needed by those who use it
+        from datetime_matcher.datetime64_extractor import Datetime64Extractor
+
+        return Datetime64Extractor().extract_datetime64(
+            self.__extraction_plan, texts, return_mask
+        )
+
+    # private
+    def __copy(
+        self, hooks: Optional["MatcherHooks"], memo_size: Optional[int]
+    ) -> "DfregexPattern[AnyStr]":
+        return DfregexPattern(
+            self.__dfregex,
+            list(self.__tokens),
+            self.__plain_regex,
+            self.__plain_extractor_regex,
+            self.__is_name_case_insensitive,
+            self.__locale,
+            hooks,
+            memo_size,
+        )
+
+    # private
+    def __create_record(
+        self, offset: int, match: Match[AnyStr]
+    ) -> Optional[DatetimeRecord]:
+        maybe_datetime = self.__extractor.extract_datetime_from_match(
+            match, self.__extraction_plan
+        )
+        if maybe_datetime is None:
+            return None
+        return DatetimeRecord(
+            offset, offset + match.end() - match.start(), maybe_datetime
+        )
+
+    # private
+    def __is_excluded_by_literals(self, text: AnyStr) -> bool:
+        """Whether text cannot match, because it lacks one of the required literals."""
+        # Only str and bytes texts support substring checks (and are returned as is by sub)
+        if type(text) is not type(self.__dfregex):
+            return False
+        for literal in self.__prefilter_literals:
+            if literal not in text:
+                return True
+        return False
+
+    # private
+    def __create_sub_match_handler(
+        self, replacement: AnyStr
+    ) -> Callable[[Match[AnyStr]], AnyStr]:
+        # Substitution scans only once, with the extraction regex, so refer the replacement's
+        # numbered groups to where the search regex's groups live in it
+        template = _remap_template_group_refs(replacement, self.__search_group_indices)
+        extract_datetime_from_match = self.__extractor.extract_datetime_from_match
+        plan = self.__extraction_plan
+        strftime = _strftime_bytes if isinstance(template, bytes) else datetime.strftime
+
+        def match_handler(match: Match[AnyStr]) -> AnyStr:
+            dt = extract_datetime_from_match(match, plan)
+            if dt is None:
+                return match.expand(template)
+            else:
+                return match.expand(strftime(dt, template))
+
+        return match_handler
@@ -0,0 +1,189 @@
+import re
+from typing import AnyStr, Dict, Generic, Iterator, List, Optional, Pattern, Sequence
+
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+from datetime_matcher.dfregex_pattern import DfregexPattern
+from datetime_matcher.model_types import DfregexSetMatch
+from datetime_matcher.regex_generator import RegexGenerator
+
+
+def _get_set_group_name(pattern_idx: int) -> str:
+    """The name of the group which wraps the dfregex at pattern_idx in a DfregexSet's combined regex."""
+    return f"DFSET___{pattern_idx}"
+
+
+def _get_set_df_group_prefix(pattern_idx: int) -> str:
+    """The prefix of the names of the df groups of the dfregex at pattern_idx in a DfregexSet's combined regex."""
+    return f"DFSET___{pattern_idx}___DF___"
+
+
+class DfregexSet(Generic[AnyStr]):
+    """
+    A set of dfregexes compiled into a single regex, so that a text is scanned once for all of them,
+    rather than once per dfregex.
+
+    The combined regex is an alternation of the dfregexes, each wrapped in a group named DFSET___i,
+    with its df groups renamed DFSET___i___DF___n so that they do not collide across dfregexes.
+    Like any alternation, at the leftmost position where any dfregex matches,
+    the dfregex which comes first in the set wins, so search and finditer report a single dfregex
+    per match, even where others match the same text. Use matches to find every dfregex which matches a text.
+
+    Named groups are shared by the whole combined regex, so the dfregexes must not reuse group names,
+    and numbered groups and backreferences are counted across the whole combined regex.
+    Global inline flags such as (?i) are not allowed inside the dfregexes; use scoped flags such as (?i:...) instead.
+
+    Texts which contain none of the dfregexes' required literals are rejected with a single scan
+    for those literals, before running the combined regex.
+
+    Obtain one from DatetimeMatcher.compile_set.
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[DfregexPattern[AnyStr]],
+        regex_generator: RegexGenerator,
+    ):
+        """Initializer."""
+        if not patterns:
+            raise ValueError("A DfregexSet needs at least one dfregex")
+        self.__patterns = tuple(patterns)
+        self.__regex: Pattern[AnyStr] = re.compile(
+            self.__generate_combined_regex(regex_generator)
+        )
+        extractor = DatetimeExtractor()
+        self.__extract_datetime_from_match = extractor.extract_datetime_from_match
+        self.__extraction_plans: List[DatetimeExtractionPlan] = [
+            extractor.create_extraction_plan(
+                self.__regex,
+                pattern.tokens,
+                _get_set_df_group_prefix(pattern_idx),
+                pattern.locale,
+            )
+            for pattern_idx, pattern in enumerate(self.__patterns)
+        ]
+        self.__literal_gate = self.__compile_literal_gate()
+        # The wrapping group which closes a match is the match's lastindex
+        self.__pattern_idx_by_group_idx: Dict[int, int] = {
+            self.__regex.groupindex[_get_set_group_name(pattern_idx)]: pattern_idx
+            for pattern_idx in range(len(self.__patterns))
+        }
+
+    def __repr__(self) -> str:
+        return f"DfregexSet({[pattern.pattern for pattern in self.__patterns]!r})"
+
+    def __len__(self) -> int:
+        return len(self.__patterns)
+
+    # public
+    @property
+    def patterns(self) -> Sequence[DfregexPattern[AnyStr]]:
+        """The compiled dfregexes in the set, in order."""
+        return self.__patterns
+
+    # public
+    @property
+    def regex(self) -> Pattern[AnyStr]:
+        """The combined regex, which captures the datetime format codes of every dfregex."""
+        return self.__regex
+
+    # public
+    def search(self, text: AnyStr) -> Optional[DfregexSetMatch]:
+        """
+        Scans through text for the leftmost match of any of the dfregexes.
+
+        Returns which dfregex matched, with its match and datetime, or None if none of them match.
+        Where several dfregexes match at the leftmost position, only the first of them in the set is reported.
+        """
+        if self.__literal_gate is not None and not self.__literal_gate.search(text):
+            return None
+        match = self.__regex.search(text)
+        return self.__to_set_match(match) if match is not None else None
+
+    # public
+    def finditer(self, text: AnyStr) -> Iterator[DfregexSetMatch]:
+        """
+        Iterates over the non-overlapping matches of any of the dfregexes in text, in a single scan,
+        yielding which dfregex matched each, with its match and datetime.
+        Where several dfregexes match at the same position, only the first of them in the set is reported.
+        """
+        if self.__literal_gate is not None and not self.__literal_gate.search(text):
+            return
+        for match in self.__regex.finditer(text):
+            yield self.__to_set_match(match)
+
+    # public
+    def matches(self, text: AnyStr) -> List[int]:
+        """
+        Returns the indices of every dfregex in the set which matches anywhere in text, in order.
+
+        A single scan with the combined regex rejects texts which none of the dfregexes match,
+        and finds one which does. Each of the other dfregexes is then searched for on its own.
+        """
+        first_set_match = self.search(text)
+        if first_set_match is None:
+            return []
+        return [
+            pattern_idx
+            for pattern_idx, pattern in enumerate(self.__patterns)
+            if pattern_idx == first_set_match.pattern_index
+            or pattern.search(text) is not None
+        ]
+
+    # private
+    def __compile_literal_gate(self) -> Optional[Pattern[AnyStr]]:
+        """
+        Compiles an alternation of the longest required literal of each dfregex,
+        which a text must match for any of the dfregexes to match it,
+        or returns None if any dfregex has no required literals.
+        """
+        longest_literals = []
+        for pattern in self.__patterns:
+            if not pattern.required_literals:
+                return None
+            longest_literals.append(re.escape(pattern.required_literals[0]))
+        separator = b"|" if isinstance(longest_literals[0], bytes) else "|"
+        return re.compile(separator.join(longest_literals))
+
+    # private
+    def __to_set_match(self, match: "re.Match[AnyStr]") -> DfregexSetMatch:
+        assert match.lastindex is not None
+        pattern_idx = self.__pattern_idx_by_group_idx[match.lastindex]
+        return DfregexSetMatch(
+            pattern_idx,
+            match,
+            self.__extract_datetime_from_match(
+                match, self.__extraction_plans[pattern_idx]
+            ),
+        )
+
+    # private
+    def __generate_combined_regex(self, regex_generator: RegexGenerator) -> AnyStr:
+        parts = []
+        for pattern_idx, pattern in enumerate(self.__patterns):
+            df_group_prefix = _get_set_df_group_prefix(pattern_idx)
+            group_name = _get_set_group_name(pattern_idx)
+            if isinstance(pattern.pattern, bytes):
+                regex: AnyStr = regex_generator.generate_bytes_regex(
+                    pattern.tokens,
+                    True,
+                    df_group_prefix,
+                    pattern.is_name_case_insensitive,
+                    pattern.locale,
+                )
+                parts.append(b"(?P<%s>%s)" % (group_name.encode("ascii"), regex))
+            else:
+                regex = regex_generator.generate_regex(
+                    pattern.tokens,
+                    True,
+                    df_group_prefix,
+                    pattern.is_name_case_insensitive,
+                    pattern.locale,
+                )
+                parts.append(f"(?P<{group_name}>{regex})")
+        if not all(isinstance(part, type(parts[0])) for part in parts):
+            raise TypeError("Cannot combine str and bytes dfregexes in one DfregexSet")
+        separator = b"|" if isinstance(parts[0], bytes) else "|"
+        return separator.join(parts)
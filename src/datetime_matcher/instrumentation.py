@@ -0,0 +1,270 @@
+import threading
+from datetime import datetime
+from time import perf_counter
+from typing import (
+    Any,
+    AnyStr,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Union,
+)
+
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+
+# The stages timed by the instrumentation, in pipeline order
+STAGES = ("tokenize", "generate", "compile", "scan", "extract")
+
+
+class MatcherHooks:
+    """
+    Receives instrumentation events from a DatetimeMatcher, or from a pattern returned by
+    DfregexPattern.with_hooks. Every method does nothing by default, so subclasses only
+    override the events they are interested in, e.g. to export them to a metrics system.
+
+    The methods are called synchronously on the hot path, possibly from many threads at once,
+    so they should be quick and thread-safe.
+    """
+
+    # public
+    def on_stage(self, stage: str, seconds: float) -> None:
+        """
+        Called after each run of a stage other than extract, one of:
+        tokenize (lexing a dfregex), generate (generating its regexes), compile (re.compile),
+        and scan (running a regex over a text, excluding any extraction done meanwhile).
+        """
+
+    # public
+    def on_extraction(self, seconds: float, is_parsed: bool) -> None:
+        """
+        Called after each match is turned into a datetime, with whether that succeeded,
+        which it does not if the captured values do not make up a valid datetime.
+        """
+
+    # public
+    def on_cache_lookup(self, is_hit: bool) -> None:
+        """Called after each lookup of a dfregex in a DatetimeMatcher's cache of compiled patterns."""
+
+
+class StageStats(NamedTuple):
+    calls: int
+    total_seconds: float
+
+
+class MatcherStatsInfo(NamedTuple):
+    # The stats of each stage, keyed by the names in STAGES
+    stages: Dict[str, StageStats]
+    # The number of matches turned into datetimes, and how many of them failed to parse
+    matches: int
+    parse_failures: int
+    cache_hits: int
+    cache_misses: int
+
+    # public
+    @property
+    def cache_hit_rate(self) -> float:
+        """The fraction of compile cache lookups which were hits, or 0.0 if there were none."""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+
+class MatcherStats(MatcherHooks):
+    """
+    Hooks which accumulate per-stage timings and call counts, match and parse failure counts,
+    and compile cache hits and misses, e.g. to be read periodically and exported as metrics.
+
+    Pass the same stats to any number of matchers to aggregate over all of them.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__reset()
+
+    # public
+    def on_stage(self, stage: str, seconds: float) -> None:
+        with self.__lock:
+            self.__stage_calls[stage] = self.__stage_calls.get(stage, 0) + 1
+            self.__stage_seconds[stage] = self.__stage_seconds.get(stage, 0.0) + seconds
+
+    # public
+    def on_extraction(self, seconds: float, is_parsed: bool) -> None:
+        with self.__lock:
+            self.__stage_calls["extract"] += 1
+            self.__stage_seconds["extract"] += seconds
+            self.__matches += 1
+            if not is_parsed:
+                self.__parse_failures += 1
+
+    # public
+    def on_cache_lookup(self, is_hit: bool) -> None:
+        with self.__lock:
+            if is_hit:
+                self.__cache_hits += 1
+            else:
+                self.__cache_misses += 1
+
+    # public
+    def info(self) -> MatcherStatsInfo:
+        """Returns a snapshot of the stats accumulated so far."""
+        with self.__lock:
+            return MatcherStatsInfo(
+                {
+                    stage: StageStats(calls, self.__stage_seconds[stage])
+                    for stage, calls in self.__stage_calls.items()
+                },
+                self.__matches,
+                self.__parse_failures,
+                self.__cache_hits,
+                self.__cache_misses,
+            )
+
+    # public
+    def reset(self) -> None:
+        """Sets every stat back to zero."""
+        with self.__lock:
+            self.__reset()
+
+    # private
+    def __reset(self) -> None:
+        self.__stage_calls: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.__stage_seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.__matches = 0
+        self.__parse_failures = 0
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+
+
+class TimedRegex:
+    """
+    Wraps a compiled regex, reporting the time spent scanning with it to hooks as the scan stage.
+
+    Only the scanning methods are timed; every other attribute is the wrapped regex's own.
+    The time taken by the consumer of finditer, and by the replacement function of sub, is excluded.
+    """
+
+    def __init__(self, regex: Pattern[AnyStr], hooks: MatcherHooks):
+        self.__regex = regex
+        self.__hooks = hooks
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes which TimedRegex lacks, e.g. pattern, groups and groupindex
+        if name.startswith("_TimedRegex__"):
+            raise AttributeError(name)
+        return getattr(self.__regex, name)
+
+    def __repr__(self) -> str:
+        return f"TimedRegex({self.__regex!r})"
+
+    # public
+    @property
+    def regex(self) -> Pattern[AnyStr]:
+        """The wrapped regex."""
+        return self.__regex
+
+    # public
+    def search(self, text: AnyStr, *args: int) -> Optional[Match[AnyStr]]:
+        start = perf_counter()
+        try:
+            return self.__regex.search(text, *args)
+        finally:
+            self.__hooks.on_stage("scan", perf_counter() - start)
+
+    # public
+    def match(self, text: AnyStr, *args: int) -> Optional[Match[AnyStr]]:
+        start = perf_counter()
+        try:
+            return self.__regex.match(text, *args)
+        finally:
+            self.__hooks.on_stage("scan", perf_counter() - start)
+
+    # public
+    def fullmatch(self, text: AnyStr, *args: int) -> Optional[Match[AnyStr]]:
+        start = perf_counter()
+        try:
+            return self.__regex.fullmatch(text, *args)
+        finally:
+            self.__hooks.on_stage("scan", perf_counter() - start)
+
+    # public
+    def findall(self, text: AnyStr, *args: int) -> List[Any]:
+        start = perf_counter()
+        try:
+            return self.__regex.findall(text, *args)
+        finally:
+            self.__hooks.on_stage("scan", perf_counter() - start)
+
+    # public
+    def finditer(self, text: AnyStr, *args: int) -> Iterator[Match[AnyStr]]:
+        matches = self.__regex.finditer(text, *args)
+        seconds = 0.0
+        try:
+            while True:
+                start = perf_counter()
+                match = next(matches, None)
+                seconds += perf_counter() - start
+                if match is None:
+                    return
+                yield match
+        finally:
+            # Reported once per scan, even if the consumer stops early
+            self.__hooks.on_stage("scan", seconds)
+
+    # public
+    def sub(
+        self,
+        replacement: Union[AnyStr, Callable[[Match[AnyStr]], AnyStr]],
+        text: AnyStr,
+        count: int = 0,
+    ) -> AnyStr:
+        if not callable(replacement):
+            start = perf_counter()
+            try:
+                return self.__regex.sub(replacement, text, count)
+            finally:
+                self.__hooks.on_stage("scan", perf_counter() - start)
+        handler_seconds = 0.0
+
+        def timed_replacement(match: Match[AnyStr]) -> AnyStr:
+            nonlocal handler_seconds
+            handler_start = perf_counter()
+            try:
+                return replacement(match)
+            finally:
+                handler_seconds += perf_counter() - handler_start
+
+        start = perf_counter()
+        try:
+            return self.__regex.sub(timed_replacement, text, count)
+        finally:
+            self.__hooks.on_stage("scan", perf_counter() - start - handler_seconds)
+
+
+class InstrumentedDatetimeExtractor(DatetimeExtractor):
+    """
+    A DatetimeExtractor which reports the time and outcome of each extraction from a match to hooks.
+
+    The extractions themselves are done by extractor, or by a plain DatetimeExtractor if it is None.
+    """
+
+    def __init__(
+        self, hooks: MatcherHooks, extractor: Optional[DatetimeExtractor] = None
+    ):
+        self.__hooks = hooks
+        self.__extractor = extractor or DatetimeExtractor()
+
+    # public
+    def extract_datetime_from_match(
+        self, match: Match[AnyStr], plan: DatetimeExtractionPlan
+    ) -> Optional[datetime]:
+        start = perf_counter()
+        maybe_datetime = self.__extractor.extract_datetime_from_match(match, plan)
+        self.__hooks.on_extraction(perf_counter() - start, maybe_datetime is not None)
+        return maybe_datetime
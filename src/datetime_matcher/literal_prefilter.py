@@ -0,0 +1,182 @@
+import re
+from typing import Iterable, List, Optional, Tuple, cast
+
+from datetime_matcher.model_types import DfregexToken
+
+# Inline flags which change what a literal character matches: case-insensitivity and verbose mode
+_LITERAL_ALTERING_FLAGS_RE = re.compile(
+    r"\(\?[aiLmsux]*[ix][aiLmsux]*(?:-[imsx]*)?[:)]"
+)
+
+# The number of hex digits which follow each kind of character code escape
+_NUM_ESCAPE_ARGUMENT_CHARS = {"x": 2, "u": 4, "U": 8}
+
+
+def extract_required_literals(tokens: Iterable[DfregexToken]) -> Tuple[str, ...]:
+    """
+    Works out substrings which every match of a dfregex must contain, from its tokens.
+
+    The scan is conservative: it only collects runs of plain characters at the top level
+    of the dfregex, skipping groups, character classes, special escapes and anything quantified,
+    and gives up entirely (returning no literals) if there is a top-level alternation or
+    an inline flag which changes how literal characters match.
+
+    Returns the distinct literals, longest first.
+    """
+    literal_runs = _scan_literal_runs(tokens)
+    literals = dict.fromkeys(literal for _, literal in literal_runs or ())
+    return tuple(sorted(literals, key=len, reverse=True))
+
+
+def extract_literal_prefix(tokens: Iterable[DfregexToken]) -> str:
+    """
+    Works out the substring with which every match of a dfregex must start, from its tokens,
+    with the same conservative scan as extract_required_literals.
+
+    Returns an empty string if there is none.
+    """
+    literal_runs = _scan_literal_runs(tokens)
+    if literal_runs and literal_runs[0][0] == 0:
+        return literal_runs[0][1]
+    return ""
+
+
+def _scan_literal_runs(
+    tokens: Iterable[DfregexToken],
+) -> Optional[List[Tuple[int, str]]]:
+    """
+    Returns the runs of plain characters at the top level of a dfregex, each with the index
+    of the character at which it starts, or None if no literals can be relied on.
+    """
+    # Scan the dfregex character by character, with None standing in for each format code
+    chars: List[Optional[str]] = []
+    for token in tokens:
+        if token.kind == "DATETIME_FORMAT_CODE":
+            chars.append(None)
+        elif token.kind == "PERCENT_LITERAL":
+            chars.extend("\\%")
+        else:
+            if _LITERAL_ALTERING_FLAGS_RE.search(token.value):
+                return None
+            chars.extend(token.value)
+    literal_runs: List[Tuple[int, str]] = []
+    run: List[str] = []
+    run_start = 0
+
+    def end_run(next_idx: int) -> None:
+        nonlocal run_start
+        if run:
+            literal_runs.append((run_start, "".join(run)))
+            run.clear()
+        run_start = next_idx
+
+    idx = 0
+    while idx < len(chars):
+        char = chars[idx]
+        if char is None or char in ".^$)":
+            end_run(idx + 1)
+        elif char == "|":
+            # Any top-level alternative could match instead
+            return None
+        elif char == "\\":
+            escaped = chars[idx + 1] if idx + 1 < len(chars) else None
+            if escaped is not None and not escaped.isalnum():
+                run.append(escaped)
+                idx += 2
+            else:
+                # Character class escapes, anchors, backreferences and character codes
+                idx = _get_alnum_escape_end(chars, idx)
+                end_run(idx)
+            continue
+        elif char == "(":
+            idx = _skip_group(chars, idx)
+            end_run(idx)
+            continue
+        elif char == "[":
+            idx = _skip_character_class(chars, idx)
+            end_run(idx)
+            continue
+        elif char in "*+?{" and _get_quantifier_end(chars, idx) is not None:
+            # The quantified character may be repeated or left out
+            if run:
+                run.pop()
+            idx = cast(int, _get_quantifier_end(chars, idx))
+            end_run(idx)
+            continue
+        else:
+            run.append(char)
+        idx += 1
+    end_run(idx)
+    return literal_runs
+
+
+def _get_alnum_escape_end(chars: List[Optional[str]], idx: int) -> int:
+    """Returns the index just past the escape at idx, including any character code or group number."""
+    escaped = chars[idx + 1] if idx + 1 < len(chars) else None
+    end = idx + 2
+    if escaped in _NUM_ESCAPE_ARGUMENT_CHARS:
+        end += _NUM_ESCAPE_ARGUMENT_CHARS[escaped]
+    elif escaped == "N":
+        while end < len(chars) and chars[end - 1] != "}":
+            end += 1
+    elif escaped is not None and escaped.isdigit():
+        # A group number, or an octal character code, of up to 3 digits
+        while (
+            end < min(len(chars), idx + 4)
+            and chars[end] is not None
+            and chars[end].isdigit()
+        ):
+            end += 1
+    return min(end, len(chars))
+
+
+def _get_quantifier_end(chars: List[Optional[str]], idx: int) -> Optional[int]:
+    """Returns the index just past the quantifier at idx, or None if there is none, e.g. for a literal brace."""
+    if chars[idx] != "{":
+        return idx + 1
+    end = idx + 1
+    while end < len(chars) and chars[end] is not None and chars[end] in "0123456789,":
+        end += 1
+    if end < len(chars) and chars[end] == "}" and chars[idx + 1 : end].count(",") <= 1:
+        return end + 1
+    return None
+
+
+def _skip_group(chars: List[Optional[str]], idx: int) -> int:
+    """Returns the index just past the group opening at idx, or the end if it is not closed."""
+    depth = 0
+    while idx < len(chars):
+        char = chars[idx]
+        if char == "\\":
+            idx += 2
+            continue
+        elif char == "[":
+            idx = _skip_character_class(chars, idx)
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return idx + 1
+        idx += 1
+    return idx
+
+
+def _skip_character_class(chars: List[Optional[str]], idx: int) -> int:
+    """Returns the index just past the character class opening at idx, or the end if it is not closed."""
+    idx += 1
+    if idx < len(chars) and chars[idx] == "^":
+        idx += 1
+    # A closing bracket right at the start is a literal bracket
+    if idx < len(chars) and chars[idx] == "]":
+        idx += 1
+    while idx < len(chars):
+        char = chars[idx]
+        if char == "\\":
+            idx += 2
+            continue
+        elif char == "]":
+            return idx + 1
+        idx += 1
+    return idx
@@ -0,0 +1,56 @@
+import calendar
+import locale
+import threading
+from datetime import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Serializes switches of the process's LC_TIME locale, and reads of it, by this module
+_lc_time_lock = threading.RLock()
+
+
+def resolve_locale(locale_name: Optional[str]) -> str:
+    """
+    Returns locale_name, or the name of the current LC_TIME locale if it is None.
+    The current locale is only queried, never switched, so this is safe to call from any thread.
+    """
+    if locale_name is not None:
+        return locale_name
+    with _lc_time_lock:
+        return locale.setlocale(locale.LC_TIME)
+
+
+@lru_cache(maxsize=None)
+def get_names_by_format_code(locale_name: str) -> Dict[str, List[str]]:
+    """
+    Lists the names matched by each name format code (%a, %A, %b, %B and %p),
+    in order of their numbers, in the LC_TIME locale locale_name, e.g. "de_DE.UTF-8".
+
+    The process's LC_TIME locale is switched to locale_name while the names are read,
+    once per locale, and then switched back. Raises locale.Error if the locale is not available.
+    The lock only serializes this module's own switches: other threads which format or parse
+    datetimes meanwhile, e.g. with strftime or strptime, may see locale_name, so this is not
+    thread-safe until the names of locale_name have been read once.
+
+    The lists are shared by every caller, so they must not be mutated.
+    """
+    with _lc_time_lock:
+        previous_locale_name = locale.setlocale(locale.LC_TIME)
+        if locale_name == previous_locale_name:
+            return _read_names_by_format_code()
+        locale.setlocale(locale.LC_TIME, locale_name)
+        try:
+            return _read_names_by_format_code()
+        finally:
+            locale.setlocale(locale.LC_TIME, previous_locale_name)
+
+
+def _read_names_by_format_code() -> Dict[str, List[str]]:
+    # Reads the names from the current LC_TIME locale
+    return {
+        "a": list(calendar.day_abbr),
+        "A": list(calendar.day_name),
+        "b": calendar.month_abbr[1:],
+        "B": calendar.month_name[1:],
+        "p": [time(10).strftime("%p"), time(20).strftime("%p")],
+    }
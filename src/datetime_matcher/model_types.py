@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import Literal, Tuple, get_args
+from datetime import datetime
+from typing import Any, Literal, Match, NamedTuple, Optional, Tuple, get_args
 
 DfregexTokenKindType = Literal[
     "DATETIME_FORMAT_CODE",
@@ -50,3 +51,33 @@ SupportedDatetimeFormatCodeType = Literal[
 SUPPORTED_DATETIME_FORMAT_CODES: Tuple[SupportedDatetimeFormatCodeType, ...] = get_args(
     SupportedDatetimeFormatCodeType
 )
+
+
+class DatetimeRecord(NamedTuple):
+    """A datetime extracted from a stream, along with where its match starts and ends in the stream."""
+
+    offset: int
+    end: int
+    datetime: datetime
+
+
+class DatetimeLine(NamedTuple):
+    """
+    A line of a file, without its newline, along with the offset of its start in the file and its datetime,
+    or None if it has none of its own, e.g. the continuation line of a multi-line record.
+    """
+
+    offset: int
+    line: bytes
+    datetime: Optional[datetime]
+
+
+class DfregexSetMatch(NamedTuple):
+    """
+    A match of a DfregexSet: the index of the dfregex which matched, the match of the combined regex,
+    and the datetime extracted from it, or None if its captured values are not a valid datetime.
+    """
+
+    pattern_index: int
+    match: Match[Any]
+    datetime: Optional[datetime]
@@ -0,0 +1,248 @@
+import locale
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from datetime_matcher.locale_names import resolve_locale
+
+# The matchers of a worker process, by whether they are in safe mode,
+# which keep that worker's compiled patterns cached across tasks
+_worker_matchers: Dict[bool, Any] = {}
+
+
+def _get_worker_matcher(is_safe: bool) -> Any:
+    if is_safe not in _worker_matchers:
+        # Imported here since the matcher module itself depends on this one
+        from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+        _worker_matchers[is_safe] = DatetimeMatcher(is_safe=is_safe)
+    return _worker_matchers[is_safe]
+
+
+def _use_lc_time(lc_time: str) -> None:
+    """Switches the worker's LC_TIME locale to the caller's, which strftime formats names in."""
+    # A worker runs one task at a time, so nothing else sees the switch
+    if locale.setlocale(locale.LC_TIME) != lc_time:
+        locale.setlocale(locale.LC_TIME, lc_time)
+
+
+def _extract_chunk(
+    dfregex: str, is_safe: bool, locale_name: str, count: int, texts: List[str]
+) -> List[List[datetime]]:
+    pattern = _get_worker_matcher(is_safe).compile(dfregex, locale=locale_name)
+    return pattern.extract_datetimes_many(texts, count)
+
+
+def _sub_chunk(
+    dfregex: str,
+    is_safe: bool,
+    locale_name: str,
+    lc_time: str,
+    replacement: str,
+    count: int,
+    texts: List[str],
+) -> List[str]:
+    _use_lc_time(lc_time)
+    pattern = _get_worker_matcher(is_safe).compile(dfregex, locale=locale_name)
+    return pattern.sub_many(replacement, texts, count)
+
+
+def _chunked(texts: Iterable[str], chunksize: int) -> Iterator[Tuple[int, List[str]]]:
+    """Splits texts into lists of at most chunksize texts, each with the index of its first text."""
+    text_iter = iter(texts)
+    start = 0
+    while True:
+        chunk = list(islice(text_iter, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+class ProcessPoolRunner:
+    """
+    Runs batches of dfregex work across a pool of worker processes.
+
+    Only the dfregex and the texts are shipped to the workers, each of which compiles
+    the dfregex once and keeps it cached. The pool is started on first use and then
+    reused across calls until shutdown.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        is_safe: bool = False,
+        locale: Optional[str] = None,
+    ):
+        """
+        Initializer. Uses as many workers as there are CPUs by default.
+
+        The workers compile dfregexes in safe mode if is_safe, as per RegexGenerator,
+        and with the names of the LC_TIME locale named locale, if given. Otherwise, they use
+        the locale current in the calling process at the time of each call, as do their strftime
+        substitutions, since a worker's own locale may differ, e.g. under the spawn start method.
+        """
+        self.__workers = workers
+        self.__is_safe = is_safe
+        self.__locale = locale
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        # Guards starting and shutting down the pool, so that concurrent first calls start only one
+        self.__executorLock = threading.Lock()
+
+    # public
+    @property
+    def workers(self) -> Optional[int]:
+        return self.__workers
+
+    # public
+    def extract_datetimes(
+        self,
+        dfregex: str,
+        texts: Iterable[str],
+        chunksize: int,
+        count: int = 0,
+        is_ordered: bool = True,
+        locale_name: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """
+        Extracts the datetimes of each text, as per DfregexPattern.extract_datetimes_many.
+        The names are those of the LC_TIME locale named locale_name, or else the runner's.
+
+        If is_ordered, yields each text's list of datetimes in input order.
+        Otherwise, yields (index, list of datetimes) pairs as soon as their chunk completes.
+        """
+        return self.__run(
+            _extract_chunk,
+            (dfregex, self.__is_safe, self.__resolve_locale(locale_name), count),
+            texts,
+            chunksize,
+            is_ordered,
+        )
+
+    # public
+    def sub(
+        self,
+        dfregex: str,
+        replacement: str,
+        texts: Iterable[str],
+        chunksize: int,
+        count: int = 0,
+        is_ordered: bool = True,
+        locale_name: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """
+        Substitutes the pattern in each text, as per DfregexPattern.sub_many.
+        The names are those of the LC_TIME locale named locale_name, or else the runner's.
+
+        If is_ordered, yields the substituted texts in input order.
+        Otherwise, yields (index, substituted text) pairs as soon as their chunk completes.
+        """
+        return self.__run(
+            _sub_chunk,
+            (
+                dfregex,
+                self.__is_safe,
+                self.__resolve_locale(locale_name),
+                resolve_locale(None),
+                replacement,
+                count,
+            ),
+            texts,
+            chunksize,
+            is_ordered,
+        )
+
+    # public
+    def shutdown(self) -> None:
+        """Shuts down the worker processes, if they were started."""
+        with self.__executorLock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    # private
+    def __resolve_locale(self, locale_name: Optional[str]) -> str:
+        # Resolved here, since a worker's current locale may not be the caller's
+        return resolve_locale(locale_name if locale_name is not None else self.__locale)
+
+    # private
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.__executorLock:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(self.__workers)
+            return self.__executor
+
+    # private
+    def __run(
+        self,
+        task: Callable[..., List[Any]],
+        task_args: Tuple[Any, ...],
+        texts: Iterable[str],
+        chunksize: int,
+        is_ordered: bool,
+    ) -> Iterator[Any]:
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be positive, got {chunksize}")
+        executor = self.__get_executor()
+        # Keep only a bounded number of chunks in flight, so that texts are read,
+        # and results are held, only a little ahead of the consumer
+        max_in_flight = 2 * (self.__workers or os.cpu_count() or 1)
+        chunks = _chunked(texts, chunksize)
+        if is_ordered:
+            return self.__run_ordered(executor, task, task_args, chunks, max_in_flight)
+        else:
+            return self.__run_unordered(
+                executor, task, task_args, chunks, max_in_flight
+            )
+
+    # private
+    def __run_ordered(
+        self,
+        executor: ProcessPoolExecutor,
+        task: Callable[..., List[Any]],
+        task_args: Tuple[Any, ...],
+        chunks: Iterator[Tuple[int, List[str]]],
+        max_in_flight: int,
+    ) -> Iterator[Any]:
+        in_flight: Deque[Future] = deque()
+        for _, chunk in islice(chunks, max_in_flight):
+            in_flight.append(executor.submit(task, *task_args, chunk))
+        while in_flight:
+            results = in_flight.popleft().result()
+            for _, chunk in islice(chunks, 1):
+                in_flight.append(executor.submit(task, *task_args, chunk))
+            yield from results
+
+    # private
+    def __run_unordered(
+        self,
+        executor: ProcessPoolExecutor,
+        task: Callable[..., List[Any]],
+        task_args: Tuple[Any, ...],
+        chunks: Iterator[Tuple[int, List[str]]],
+        max_in_flight: int,
+    ) -> Iterator[Tuple[int, Any]]:
+        in_flight: Dict[Future, int] = {}
+        for start, chunk in islice(chunks, max_in_flight):
+            in_flight[executor.submit(task, *task_args, chunk)] = start
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = in_flight.pop(future)
+                for next_start, chunk in islice(chunks, 1):
+                    in_flight[executor.submit(task, *task_args, chunk)] = next_start
+                yield from enumerate(future.result(), start)
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from datetime_matcher.dfregex_pattern import DfregexPattern
+
+
+class PatternCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class PatternCache:
+    """
+    A bounded least-recently-used cache of compiled DfregexPatterns.
+
+    A maxsize of None makes the cache unbounded, and a maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 256):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"maxsize must be None or non-negative, got {maxsize}")
+        self.__maxsize = maxsize
+        self.__patterns: "OrderedDict[Hashable, DfregexPattern]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__patterns)
+
+    # public
+    def get(self, key: Hashable) -> Optional[DfregexPattern]:
+        """
+        Returns the pattern cached under key, marking it as most recently used,
+        or None if there is no such pattern.
+        """
+        with self.__lock:
+            pattern = self.__patterns.get(key)
+            if pattern is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            self.__patterns.move_to_end(key)
+            return pattern
+
+    # public
+    def put(self, key: Hashable, pattern: DfregexPattern) -> None:
+        """
+        Caches the pattern under key, evicting the least recently used patterns if the cache is full.
+        """
+        if self.__maxsize == 0:
+            return
+        with self.__lock:
+            self.__patterns[key] = pattern
+            self.__patterns.move_to_end(key)
+            if self.__maxsize is not None:
+                while len(self.__patterns) > self.__maxsize:
+                    self.__patterns.popitem(last=False)
+                    self.__evictions += 1
+
+    # public
+    def purge(self) -> None:
+        """Clears the cache. The hit, miss and eviction counters are kept."""
+        with self.__lock:
+            self.__patterns.clear()
+
+    # public
+    def cache_info(self) -> PatternCacheInfo:
+        """Returns the hit, miss and eviction counters along with the size of the cache."""
+        with self.__lock:
+            return PatternCacheInfo(
+                self.__hits,
+                self.__misses,
+                self.__evictions,
+                self.__maxsize,
+                len(self.__patterns),
+            )
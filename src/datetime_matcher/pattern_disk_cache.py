@@ -0,0 +1,82 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from typing import Hashable, Optional, Union
+
+from datetime_matcher.dfregex_pattern import DfregexPattern
+
+
+@lru_cache(maxsize=None)
+def _get_library_version() -> str:
+    try:
+        return metadata.version("datetime-matcher")
+    except metadata.PackageNotFoundError:
+        # Running from a source tree which is not installed
+        return "unknown"
+
+
+class PatternDiskCache:
+    """
+    A cache of pickled DfregexPatterns in a directory, so that short-lived processes
+    can load the patterns compiled by earlier ones instead of generating them again.
+
+    Entries are keyed by the pattern's own cache key along with the library version
+    and the Python version, since the generated regexes depend on them. The key must include
+    the name of the LC_TIME locale the pattern is compiled with, as DatetimeMatcher's does.
+
+    Only use a directory which no one untrusted can write to, since loading a pickle can run code.
+    """
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"]):
+        """Initializer. The directory is created if it does not exist."""
+        self.__directory = os.fspath(directory)
+        os.makedirs(self.__directory, exist_ok=True)
+
+    # public
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    # public
+    def get(self, key: Hashable) -> Optional[DfregexPattern]:
+        """
+        Returns the pattern cached under key, or None if there is no such pattern,
+        or if its file cannot be loaded.
+        """
+        try:
+            with open(self.__get_path(key), "rb") as cache_file:
+                pattern = pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Treat a corrupt or incompatible entry like a missing one, as it will be overwritten
+            return None
+        return pattern if isinstance(pattern, DfregexPattern) else None
+
+    # public
+    def put(self, key: Hashable, pattern: DfregexPattern) -> None:
+        """
+        Caches the pattern under key.
+
+        The file is written atomically, so that concurrent processes never load a partial entry.
+        """
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self.__directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                pickle.dump(pattern, temp_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.__get_path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    # private
+    def __get_path(self, key: Hashable) -> str:
+        full_key = (key, _get_library_version(), sys.version_info[:2])
+        digest = hashlib.sha256(repr(full_key).encode("utf-8")).hexdigest()
+        return os.path.join(self.__directory, f"{digest}.pickle")
@@ -1,99 +1,489 @@
-import calendar
-from datetime import time
-from typing import Dict, Iterable, Iterator, Optional, cast
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, cast
 
+from datetime_matcher.locale_names import get_names_by_format_code, resolve_locale
 from datetime_matcher.model_types import DfregexToken, SupportedDatetimeFormatCodeType
 
+# The format codes which match names, rather than numbers
+NAME_FORMAT_CODES = frozenset(("a", "A", "b", "B", "p"))
+# The format codes which match numbers that may be preceded by a sign, rather than start with a digit
+SIGNED_FORMAT_CODES = frozenset(("z",))
 
-class RegexGenerator:
+# The items of a regex, as far as safe mode needs to tell where format codes can begin a match
+# and whether a digit can follow them: escapes, character classes, group openers (including
+# scoped flags), lookarounds, inline flags, group closers, alternations, quantifiers and anchors
+_REGEX_ITEM_RE = re.compile(
+    r"(?P<ATOM>\\[0-9A-Za-z]|\\.|\[\^?\]?(?:\\.|[^\]\\])*\]|\(\?P=\w+\))"
+    r"|(?P<OPEN>\((?:\?P<\w+>|\?[aiLmsux-]*:|\?>)?(?!\?))"
+    r"|(?P<LOOKAROUND>\(\?<?[=!])"
+    r"|(?P<FLAGS>\(\?[aiLmsux]+\)|\(\?#[^)]*\))"
+    r"|(?P<CLOSE>\))"
+    r"|(?P<ALT>\|)"
+    r"|(?P<QUANTIFIER>(?:[*+?]|\{[0-9]*(?:,[0-9]*)?\})[?+]?)"
+    r"|(?P<ZERO_WIDTH>[\^$])"
+    r"|(?P<OTHER>.)",
+    re.DOTALL,
+)
+# The zero-width escapes, which are anchors rather than atoms
+_ZERO_WIDTH_ESCAPES = frozenset(("\\A", "\\b", "\\B", "\\Z"))
 
-    format_code_to_regex_map: Dict[SupportedDatetimeFormatCodeType, str]
+# Stand-ins for format codes in the regex which safe mode examines around each format code:
+# a digit for numeric format codes, a letter for names and an escaped sign for %z
+_FORMAT_CODE_STAND_INS = {"z": r"\+"}
+_FORMAT_CODE_STAND_IN_NUMERIC = "0"
+_FORMAT_CODE_STAND_IN_NAME = "a"
 
-    def __init__(self):
-        # TODO generate these based on the locale at runtime of __init__, i.e. base the month names on specified language
-        self.weekdays = list(
-            filter(lambda x: x is not None and len(x) > 0, calendar.day_name)
-        )
-        self.weekdays_abbr = list(
-            filter(lambda x: x is not None and len(x) > 0, calendar.day_abbr)
-        )
-        self.months = list(
-            filter(lambda x: x is not None and len(x) > 0, calendar.month_name)
+# Atomic groups are only supported by re from Python 3.11
+_IS_ATOMIC_GROUP_SUPPORTED = sys.version_info >= (3, 11)
+
+
+def _get_format_code_stand_in(format_code: str) -> str:
+    if format_code in _FORMAT_CODE_STAND_INS:
+        return _FORMAT_CODE_STAND_INS[format_code]
+    if format_code.lstrip("-") in NAME_FORMAT_CODES:
+        return _FORMAT_CODE_STAND_IN_NAME
+    return _FORMAT_CODE_STAND_IN_NUMERIC
+
+
+def _get_stand_in_regex(tokens: Iterable[DfregexToken]) -> str:
+    """The regex of tokens, with a stand-in for each format code, which matches its kind of first character."""
+    return "".join(
+        (
+            _get_format_code_stand_in(token.value[1:])
+            if token.kind == "DATETIME_FORMAT_CODE"
+            else "%" if token.kind == "PERCENT_LITERAL" else token.value
         )
-        self.months_abbr = list(
-            filter(lambda x: x is not None and len(x) > 0, calendar.month_abbr)
+        for token in tokens
+    )
+
+
+def _iter_regex_items(regex: str) -> Iterator[Tuple[str, str]]:
+    """Splits a regex into its items, as (kind, text) pairs, as per _REGEX_ITEM_RE."""
+    for match in _REGEX_ITEM_RE.finditer(regex):
+        kind = cast(str, match.lastgroup)
+        text = match.group()
+        if kind == "ATOM" and text in _ZERO_WIDTH_ESCAPES:
+            kind = "ZERO_WIDTH"
+        elif kind == "OTHER":
+            kind = "ATOM"
+        yield kind, text
+
+
+@lru_cache(maxsize=1024)
+def _can_atom_match_digit(atom: str) -> bool:
+    try:
+        atom_regex = re.compile(atom)
+    except re.error:
+        # E.g. a backreference, which may match anything
+        return True
+    return any(atom_regex.fullmatch(digit) for digit in "0123456789")
+
+
+def _is_optional_quantifier(quantifier: str) -> bool:
+    """Whether the quantifier allows zero repetitions."""
+    return quantifier[0] in "?*" or quantifier.startswith(("{0", "{,"))
+
+
+def _is_repeating_quantifier(quantifier: str) -> bool:
+    """Whether the quantifier allows more than one repetition."""
+    if quantifier[0] == "?":
+        return False
+    if quantifier[0] != "{":
+        return True
+    bounds = quantifier[1 : quantifier.index("}")].split(",")
+    return bounds[-1] == "" or int(bounds[-1]) > 1
+
+
+def _can_begin_with_digit(regex: str) -> bool:
+    """
+    Whether the regex which follows a format code can begin with a digit, including by repeating
+    the format code itself or a group around it. Anything which is not simple enough to tell
+    is assumed to be able to, since that only leaves a format code unguarded.
+    """
+    items = list(_iter_regex_items(regex))
+    for item_idx, (kind, text) in enumerate(items):
+        if kind in ("OPEN", "CLOSE", "FLAGS"):
+            continue
+        elif kind == "QUANTIFIER":
+            # It repeats either the format code or a group which was just closed around it
+            if _is_repeating_quantifier(text):
+                return True
+        elif kind == "ATOM":
+            if _can_atom_match_digit(text):
+                return True
+            next_kind, next_text = (
+                items[item_idx + 1] if item_idx + 1 < len(items) else ("", "")
+            )
+            if next_kind != "QUANTIFIER" or not _is_optional_quantifier(next_text):
+                return False
+        elif kind == "ZERO_WIDTH" and text in ("$", "\\Z", "\\b"):
+            return False
+        else:
+            return True
+    return False
+
+
+def _is_repeated(regex: str) -> bool:
+    """
+    Whether the regex which follows a format code repeats it, with a quantifier
+    either right after it or after a group around it.
+    """
+    depth = 0
+    is_after_format_code_or_enclosing_group = True
+    for kind, text in _iter_regex_items(regex):
+        if (
+            kind == "QUANTIFIER"
+            and is_after_format_code_or_enclosing_group
+            and _is_repeating_quantifier(text)
+        ):
+            return True
+        if kind in ("OPEN", "LOOKAROUND"):
+            depth += 1
+        elif kind == "CLOSE":
+            depth -= 1
+        # A closer which leaves depth below zero closes a group around the format code
+        is_after_format_code_or_enclosing_group = kind == "CLOSE" and depth < 0
+        if is_after_format_code_or_enclosing_group:
+            depth = 0
+    return False
+
+
+def _is_at_match_start(regex: str) -> bool:
+    """
+    Whether a match can begin right after the regex which precedes a format code, i.e. whether
+    nothing but group openers and start anchors come before it, in its alternative.
+    """
+    is_at_start = True
+    is_at_start_by_group: List[bool] = []
+    for kind, text in _iter_regex_items(regex):
+        if kind in ("OPEN", "LOOKAROUND"):
+            is_at_start_by_group.append(is_at_start)
+        elif kind == "ALT":
+            is_at_start = is_at_start_by_group[-1] if is_at_start_by_group else True
+        elif kind == "CLOSE":
+            if is_at_start_by_group:
+                is_at_start_by_group.pop()
+            is_at_start = False
+        elif kind == "FLAGS" or (kind == "ZERO_WIDTH" and text in ("^", "\\A")):
+            continue
+        else:
+            is_at_start = False
+    return is_at_start
+
+
+def _build_trie(names: Iterable[str]) -> Dict[str, Any]:
+    trie: Dict[str, Any] = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        # The empty key marks the end of a name
+        node[""] = {}
+    return trie
+
+
+def _get_regex_from_trie(node: Dict[str, Any], is_top_level: bool = False) -> str:
+    branches: List[str] = []
+    leaf_chars: List[str] = []
+    for char, child in sorted(node.items()):
+        if char == "":
+            continue
+        elif list(child) == [""]:
+            leaf_chars.append(char)
+        else:
+            branches.append(re.escape(char) + _get_regex_from_trie(child))
+    # Merge the branches which end after a single ASCII character into one character class.
+    # Other characters are more than one byte in UTF-8, so in bytes regexes, neither a class
+    # nor a quantifier could apply to them as a whole
+    ascii_leaf_chars = [char for char in leaf_chars if char.isascii()]
+    branches.extend(re.escape(char) for char in leaf_chars if not char.isascii())
+    if len(ascii_leaf_chars) == 1:
+        branches.append(re.escape(ascii_leaf_chars[0]))
+    elif ascii_leaf_chars:
+        branches.append(
+            "[" + "".join(re.escape(char) for char in ascii_leaf_chars) + "]"
         )
-        self.am_pm = [time(10).strftime("%p"), time(20).strftime("%p")]
-        self.format_code_to_regex_map = {
-            # In the order listed in python3 docs for datetime
-            r"a": r"|".join(self.weekdays_abbr),
-            r"A": r"|".join(self.weekdays),
-            r"w": r"[0-6]",
-            r"d": r"0[1-9]|[12][0-9]|3[01]",
-            r"-d": r"[1-9]|[12][0-9]|3[01]",
-            r"b": r"|".join(self.months_abbr),
-            r"B": r"|".join(self.months),
-            r"m": r"0[1-9]|1[0-2]",
-            r"-m": r"[1-9]|1[0-2]",
-            r"y": r"[0-9]{2}",
-            r"Y": r"[0-9]{4}",
-            r"H": r"[01][0-9]|2[0-3]",
-            r"-H": r"[0-9]|1[0-9]|2[0-3]",
-            r"I": r"0[1-9]|1[0-2]",
-            r"-I": r"[1-9]|1[0-2]",
-            r"p": r"|".join(self.am_pm),
-            r"M": r"[0-5][0-9]",
-            r"-M": r"[0-9]|[1-5][0-9]",
-            r"S": r"[0-5][0-9]",
-            r"-S": r"[0-9]|[1-5][0-9]",
-            r"f": r"[0-9]{6}",
-            r"z": r"[\+\-](?:[01][0-9]|2[0-3])[0-5][0-9](?:[0-5][0-9](?:\.[0-9]{6})?)?",
-            # TODO: %Z
-            r"j": r"[0-2][0-9]{2}|3[0-5][0-9]|36[0-6]",
-            r"-j": r"[0-9]|[1-9][0-9]|[1-2][0-9]{2}|3[0-5][0-9]|36[0-6]",
-            r"U": r"[0-4][0-9]|5[0-3]",
-            r"W": r"[0-4][0-9]|5[0-3]",
-            # TODO: %c
-            # TODO: %x
-            # TODO: %X
-        }
+    is_single_atom = (
+        len(branches) == 1
+        and len(node) - ("" in node) == len(leaf_chars)
+        and len(ascii_leaf_chars) == len(leaf_chars)
+    )
+    if "" in node and branches:
+        # A name which is a prefix of others is matched only if none of the longer ones match
+        return (branches[0] if is_single_atom else f"(?:{'|'.join(branches)})") + "?"
+    elif len(branches) == 1 or is_top_level:
+        # The top-level alternation is grouped by whoever uses it
+        return "|".join(branches)
+    else:
+        return f"(?:{'|'.join(branches)})"
+
+
+def get_name_alternation_regex(names: Iterable[str]) -> str:
+    """
+    Builds a regex matching any of names, factored into a trie of common prefixes
+    (e.g. J(?:an|u[ln])) so that the regex engine does not retry each name in turn.
+
+    Where one name is a prefix of another, the longer name is preferred.
+    """
+    return _get_regex_from_trie(_build_trie(names), True)
+
+
+def _get_non_empty_names(locale_name: str, format_code: str) -> List[str]:
+    return [name for name in get_names_by_format_code(locale_name)[format_code] if name]
+
+
+@lru_cache(maxsize=None)
+def _get_format_code_to_regex_map(
+    locale_name: str,
+) -> Dict[SupportedDatetimeFormatCodeType, str]:
+    """
+    Builds the regex of each format code for the LC_TIME locale locale_name.
+
+    The map is built once per locale and shared by every generator, so it must not be mutated.
+    """
+    # An empty name would let a name format code match an empty string
+    names = {
+        format_code: _get_non_empty_names(locale_name, format_code)
+        for format_code in ("a", "A", "b", "B")
+    }
+    return {
+        # In the order listed in python3 docs for datetime
+        r"a": get_name_alternation_regex(names["a"]),
+        r"A": get_name_alternation_regex(names["A"]),
+        r"w": r"[0-6]",
+        # Alternatives are ordered with the most common values first, and the
+        # variable-width codes with their longer values first, so that a greedy
+        # match takes the whole number, e.g. 12 rather than 1
+        r"d": r"[12][0-9]|0[1-9]|3[01]",
+        r"-d": r"[12][0-9]|3[01]|[1-9]",
+        r"b": get_name_alternation_regex(names["b"]),
+        r"B": get_name_alternation_regex(names["B"]),
+        r"m": r"0[1-9]|1[0-2]",
+        r"-m": r"1[0-2]|[1-9]",
+        r"y": r"[0-9]{2}",
+        r"Y": r"[0-9]{4}",
+        r"H": r"[01][0-9]|2[0-3]",
+        r"-H": r"1[0-9]|2[0-3]|[0-9]",
+        r"I": r"0[1-9]|1[0-2]",
+        r"-I": r"1[0-2]|[1-9]",
+        r"p": get_name_alternation_regex(get_names_by_format_code(locale_name)["p"]),
+        r"M": r"[0-5][0-9]",
+        r"-M": r"[1-5][0-9]|[0-9]",
+        r"S": r"[0-5][0-9]",
+        r"-S": r"[1-5][0-9]|[0-9]",
+        r"f": r"[0-9]{6}",
+        r"z": r"[\+\-](?:[01][0-9]|2[0-3])[0-5][0-9](?:[0-5][0-9](?:\.[0-9]{6})?)?",
+        # TODO: %Z
+        r"j": r"[0-2][0-9]{2}|3[0-5][0-9]|36[0-6]",
+        r"-j": r"[1-2][0-9]{2}|3[0-5][0-9]|36[0-6]|[1-9][0-9]|[0-9]",
+        r"U": r"[0-4][0-9]|5[0-3]",
+        r"W": r"[0-4][0-9]|5[0-3]",
+        # TODO: %c
+        # TODO: %x
+        # TODO: %X
+    }
+
+
+class RegexGenerator:
+    """
+    Generates regexes from dfregex tokens.
+
+    In safe mode, the regex of each numeric format code is guarded against the catastrophic
+    backtracking that ambiguous numbers can cause on near-miss inputs, so that e.g. %-d cannot
+    split 12 into 1 and 2:
+    - Where nothing that follows it can begin with a digit, it must not be followed by a digit,
+      and from Python 3.11, it is an atomic group, which the engine never backtracks into.
+      Adjacent format codes, even across group boundaries, quantifiers or optional separators,
+      are left to split up their digits.
+    - Where it can begin a match, and is not repeated, it must not be preceded by a digit.
+    Each guarded format code is wrapped in a group, so that a quantifier after it, like ? or {2},
+    applies to the format code along with its guards. Regexes too complex to tell are left unguarded,
+    so safe mode only rejects matches which split up a number.
+    """
+
+    def __init__(self, is_safe: bool = False, locale: Optional[str] = None):
+        """
+        Initializer.
+
+        Names are matched in the LC_TIME locale named locale, e.g. "de_DE.UTF-8", by default,
+        or in the one current at the time of generating if it is None.
+        The regexes of the format codes are built once per locale, on first use,
+        and then shared by every generator.
+        """
+        self.is_safe = is_safe
+        self.locale = locale
+
+    # public
+    @property
+    def format_code_to_regex_map(self) -> Dict[SupportedDatetimeFormatCodeType, str]:
+        return _get_format_code_to_regex_map(resolve_locale(self.locale))
+
+    # public
+    @property
+    def weekdays(self) -> List[str]:
+        return _get_non_empty_names(resolve_locale(self.locale), "A")
+
+    # public
+    @property
+    def weekdays_abbr(self) -> List[str]:
+        return _get_non_empty_names(resolve_locale(self.locale), "a")
+
+    # public
+    @property
+    def months(self) -> List[str]:
+        return _get_non_empty_names(resolve_locale(self.locale), "B")
+
+    # public
+    @property
+    def months_abbr(self) -> List[str]:
+        return _get_non_empty_names(resolve_locale(self.locale), "b")
+
+    # public
+    @property
+    def am_pm(self) -> List[str]:
+        return get_names_by_format_code(resolve_locale(self.locale))["p"]
 
     # public
     def generate_regex(
-        self, tokens: Iterable[DfregexToken], is_capture_dfs: bool
+        self,
+        tokens: Iterable[DfregexToken],
+        is_capture_dfs: bool,
+        df_group_prefix: str = "DF___",
+        is_name_case_insensitive: bool = False,
+        locale: Optional[str] = None,
     ) -> str:
         """
         Parse an iterable of DfregexTokens into a regex string that
         corresponds with the original dfregex.
+
+        The captured format codes are named df_group_prefix followed by their index.
+
+        If is_name_case_insensitive, the month, weekday and AM/PM names are matched
+        case-insensitively, with a scoped (?i:...) flag rather than a flag for the whole regex.
+
+        The names are those of the LC_TIME locale named locale, if given, or else the generator's.
         """
         return "".join(
-            self.__generate_parts_from_dfregex_tokens(tokens, is_capture_dfs)
+            self.__generate_parts_from_dfregex_tokens(
+                tokens,
+                is_capture_dfs,
+                df_group_prefix,
+                is_name_case_insensitive,
+                locale,
+            )
+        )
+
+    # public
+    def generate_bytes_regex(
+        self,
+        tokens: Iterable[DfregexToken],
+        is_capture_dfs: bool,
+        df_group_prefix: str = "DF___",
+        is_name_case_insensitive: bool = False,
+        locale: Optional[str] = None,
+    ) -> bytes:
+        """
+        Parse an iterable of DfregexTokens, lexed from a bytes dfregex decoded as latin-1,
+        into a bytes regex that corresponds with the original bytes dfregex.
+
+        The user's regex is encoded back to its original bytes, and the regex
+        of each format code is encoded as UTF-8.
+        """
+        tokens = list(tokens)
+        return b"".join(
+            part.encode("utf-8" if token.kind == "DATETIME_FORMAT_CODE" else "latin-1")
+            for token, part in zip(
+                tokens,
+                self.__generate_parts_from_dfregex_tokens(
+                    tokens,
+                    is_capture_dfs,
+                    df_group_prefix,
+                    is_name_case_insensitive,
+                    locale,
+                ),
+            )
         )
 
     # private
     def __generate_parts_from_dfregex_tokens(
-        self, tokens: Iterable[DfregexToken], is_capture_dfs: bool
+        self,
+        tokens: Iterable[DfregexToken],
+        is_capture_dfs: bool,
+        df_group_prefix: str,
+        is_name_case_insensitive: bool,
+        locale: Optional[str],
     ) -> Iterator[str]:
         """
         Parse an iterable of DfregexTokens into an iterable of strings that
         when joined together becomes the regex that corresponds with the
         original dfregex.
         """
+        format_code_to_regex_map = _get_format_code_to_regex_map(
+            resolve_locale(locale if locale is not None else self.locale)
+        )
         counter = 0
-        for token in tokens:
+        tokens = list(tokens)
+        for token_idx, token in enumerate(tokens):
             result = self.__generate_part_from_dfregex_token(
-                token, is_capture_dfs, counter
+                token,
+                is_capture_dfs,
+                counter,
+                df_group_prefix,
+                is_name_case_insensitive,
+                format_code_to_regex_map,
             )
+            if self.is_safe and token.kind == "DATETIME_FORMAT_CODE" and result:
+                result = self.__make_format_code_part_safe(
+                    result,
+                    token.value[1:],
+                    _get_stand_in_regex(tokens[:token_idx]),
+                    _get_stand_in_regex(tokens[token_idx + 1 :]),
+                )
             yield result
             if token.kind == "DATETIME_FORMAT_CODE":
                 counter += 1
 
+    # private
+    def __make_format_code_part_safe(
+        self,
+        part: str,
+        format_code: str,
+        regex_before: str,
+        regex_after: str,
+    ) -> str:
+        # Names are matched by a trie which already prefers the longer name, and may need
+        # to backtrack to a shorter one for the rest of the regex to match
+        if format_code.lstrip("-") in NAME_FORMAT_CODES:
+            return part
+        # A format code which a digit can follow, like the first of adjacent format codes,
+        # needs to backtrack to split up its digits, and must not rule out the digit
+        if not _can_begin_with_digit(regex_after):
+            if _IS_ATOMIC_GROUP_SUPPORTED:
+                part = f"(?>{part})"
+            part = f"{part}(?![0-9])"
+        # A match can only begin mid-number where the format code can begin the match;
+        # elsewhere, whatever comes before is up to the user regex
+        # A repetition is preceded by the digits of the one before it
+        if (
+            format_code not in SIGNED_FORMAT_CODES
+            and _is_at_match_start(regex_before)
+            and not _is_repeated(regex_after)
+        ):
+            part = f"(?<![0-9]){part}"
+        # A quantifier after the format code has to apply to its guards too, not just to the last of them
+        return f"(?:{part})"
+
     # private
     def __generate_part_from_dfregex_token(
         self,
         token: DfregexToken,
         is_capture_dfs: bool,
         num_format_codes_encountered: int,
+        df_group_prefix: str,
+        is_name_case_insensitive: bool,
+        format_code_to_regex_map: Dict[SupportedDatetimeFormatCodeType, str],
     ) -> str:
         """
         Parse a DfregexToken into a string which makes a part of a regex pattern.
@@ -103,6 +493,9 @@ class RegexGenerator:
                 cast(SupportedDatetimeFormatCodeType, token.value[1:]),
                 is_capture_dfs,
                 num_format_codes_encountered,
+                df_group_prefix,
+                is_name_case_insensitive,
+                format_code_to_regex_map,
             )
             return result if result is not None else ""
         elif token.kind == "PERCENT_LITERAL":
@@ -116,13 +509,18 @@ class RegexGenerator:
         format_code: SupportedDatetimeFormatCodeType,
         is_capture_dfs: bool,
         capture_dfs_idx: int,
+        df_group_prefix: str,
+        is_name_case_insensitive: bool,
+        format_code_to_regex_map: Dict[SupportedDatetimeFormatCodeType, str],
     ) -> Optional[str]:
-        regex = self.format_code_to_regex_map.get(format_code)
+        regex = format_code_to_regex_map.get(format_code)
         if regex is None:
             return None
         else:
+            if is_name_case_insensitive and format_code in NAME_FORMAT_CODES:
+                regex = f"(?i:{regex})"
             return (
-                f"(?P<DF___{capture_dfs_idx}>{regex})"
+                f"(?P<{df_group_prefix}{capture_dfs_idx}>{regex})"
                 if is_capture_dfs
                 else f"(?:{regex})"
             )
@@ -0,0 +1,135 @@
+import mmap
+import os
+from datetime import datetime
+from typing import IO, Any, Iterator, Optional, Tuple
+
+from datetime_matcher.datetime_extractor import (
+    DatetimeExtractionPlan,
+    DatetimeExtractor,
+)
+from datetime_matcher.datetime_stream import StreamSource
+from datetime_matcher.delta_extractor import DeltaDatetimeExtractor
+from datetime_matcher.model_types import DatetimeLine
+
+
+class _MappedLog:
+    """The lines of a memory-mapped file, and the datetime of each, as found by an extraction plan."""
+
+    def __init__(self, mapped: Any, size: int, plan: DatetimeExtractionPlan):
+        self.__mapped = mapped
+        self.__size = size
+        self.__plan = plan
+        self.__search = plan.regex.search
+        self.__extractor = DatetimeExtractor()
+
+    # public
+    def get_line_end(self, line_start: int) -> int:
+        """Returns the offset of the newline which ends the line at line_start, or the size of the file."""
+        line_end = self.__mapped.find(b"\n", line_start)
+        return self.__size if line_end < 0 else line_end
+
+    # public
+    def get_datetime(
+        self, line_start: int, line_end: int, extractor: DatetimeExtractor
+    ) -> Optional[datetime]:
+        """Returns the datetime of the first match in a line, or None if there is none, or it is invalid."""
+        # Searching with bounds scans the mapped file in place, and lets ^ and $ match at the line's ends
+        match = self.__search(self.__mapped, line_start, line_end)
+        if match is None:
+            return None
+        return extractor.extract_datetime_from_match(match, self.__plan)
+
+    # public
+    def find_dated_line(self, offset: int) -> Tuple[int, int, Optional[datetime]]:
+        """
+        Resynchronizes to the first line which starts at or after offset, and skips the lines
+        without a datetime, like the continuation lines of a multi-line record.
+
+        Returns the start and end of the first line with a datetime, and its datetime,
+        or the size of the file twice and None if there is no such line.
+        """
+        # If offset is already a line's start, the newline before it is found, so the line itself is kept
+        line_start = 0
+        if offset > 0:
+            newline = self.__mapped.find(b"\n", offset - 1)
+            line_start = self.__size if newline < 0 else newline + 1
+        while line_start < self.__size:
+            line_end = self.get_line_end(line_start)
+            maybe_datetime = self.get_datetime(line_start, line_end, self.__extractor)
+            if maybe_datetime is not None:
+                return line_start, line_end, maybe_datetime
+            line_start = line_end + 1
+        return self.__size, self.__size, None
+
+    # public
+    def bisect_left(self, start: datetime) -> int:
+        """
+        Returns the start of the first line whose datetime is not earlier than start,
+        by binary search over the offsets of the file, or the size of the file if there is none.
+        """
+        low, high = 0, self.__size
+        while low < high:
+            middle = (low + high) // 2
+            line_start, _, maybe_datetime = self.find_dated_line(middle)
+            if maybe_datetime is None or maybe_datetime >= start:
+                high = middle
+            else:
+                # Every offset up to the line's start resynchronizes to the same line
+                low = line_start + 1
+        return self.find_dated_line(low)[0]
+
+
+def iter_time_range_lines(
+    plan: DatetimeExtractionPlan,
+    source: StreamSource,
+    start: datetime,
+    end: datetime,
+) -> Iterator[DatetimeLine]:
+    """
+    Iterates over the lines of a file whose datetimes, as extracted by the plan of a bytes regex,
+    never decrease, like a log, yielding the lines dated from start (inclusive) to end (exclusive).
+
+    The file is memory-mapped, and the first line in the range is found by binary search on byte offsets,
+    so only the lines it probes and the lines in the range are ever scanned.
+
+    A line's datetime is that of the first match in it. Lines without a datetime, like the continuation
+    lines of a multi-line record, belong to the last line with one before them, and are yielded
+    along with it, with a datetime of None.
+    """
+    if not isinstance(plan.regex.pattern, bytes):
+        raise ValueError("Searching a memory-mapped file requires a bytes pattern")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            yield from iter_time_range_lines(plan, stream, start, end)
+        return
+    yield from _iter_mapped_time_range_lines(plan, source, start, end)
+
+
+def _iter_mapped_time_range_lines(
+    plan: DatetimeExtractionPlan,
+    stream: IO[Any],
+    start: datetime,
+    end: datetime,
+) -> Iterator[DatetimeLine]:
+    size = os.fstat(stream.fileno()).st_size
+    # An empty file cannot be memory-mapped, but has no lines anyway
+    if size == 0 or not start < end:
+        return
+    with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        log = _MappedLog(mapped, size, plan)
+        line_start = log.bisect_left(start)
+        # The lines in the range are sorted, so only the fields which change need converting
+        extractor = DeltaDatetimeExtractor(plan)
+        is_in_range = False
+        while line_start < size:
+            line_end = log.get_line_end(line_start)
+            maybe_datetime = log.get_datetime(line_start, line_end, extractor)
+            if maybe_datetime is not None:
+                if maybe_datetime >= end:
+                    return
+                is_in_range = maybe_datetime >= start
+            if is_in_range:
+                yield DatetimeLine(
+                    line_start, mapped[line_start:line_end], maybe_datetime
+                )
+            line_start = line_end + 1
@@ -0,0 +1,436 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Union
+
+from datetime_matcher.datetime_extractor import DatetimeExtractionPlan
+from datetime_matcher.delta_extractor import DeltaDatetimeExtractor
+from datetime_matcher.model_types import DatetimeRecord
+
+_MAGIC = b"DTMINDEX"
+_VERSION = 2
+# Magic, version, length of the metadata, source size, source mtime in ns, indexed size,
+# number of entries and digest of the indexed part of the source, all little-endian
+_HEADER = struct.Struct("<8sIIqqqq32s")
+# The indexed part of the source is hashed in blocks of this size, at its head, its tail
+# and evenly in between, to tell an appended file from a rewritten one without reading it all
+_DIGEST_BLOCK_SIZE = 4096
+_NUM_DIGEST_BLOCKS = 16
+# Each entry is the epoch microseconds of a match's datetime, and the offsets of its start and end
+_ENTRY_SIZE = 3
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _IndexHeader(NamedTuple):
+    source_size: int
+    source_mtime_ns: int
+    indexed_size: int
+    count: int
+    digest: bytes
+    meta: Dict[str, Any]
+    data_offset: int
+
+
+def _to_epoch_us(dt: datetime) -> int:
+    """Naive datetimes are counted as they are, and aware ones in UTC."""
+    return (dt - (_EPOCH if dt.tzinfo is None else _EPOCH_UTC)) // _MICROSECOND
+
+
+def _get_meta(plan: DatetimeExtractionPlan) -> Dict[str, Any]:
+    # The extraction regex already reflects the dfregex, the locale's names and the options it was compiled with
+    return {
+        "regex": plan.regex.pattern.decode("latin-1"),
+        "flags": int(plan.regex.flags),
+        "format_codes": list(plan.format_codes),
+        "locale": plan.locale,
+        "is_aware": "%z" in plan.format_codes,
+    }
+
+
+def _get_digest(mapped: Any, indexed_size: int) -> bytes:
+    """Hashes the indexed part of the source, all of it if it is small, or else a sample of its blocks."""
+    digest = hashlib.sha256()
+    if indexed_size <= _DIGEST_BLOCK_SIZE * _NUM_DIGEST_BLOCKS:
+        digest.update(mapped[:indexed_size])
+    else:
+        last_block_start = indexed_size - _DIGEST_BLOCK_SIZE
+        for block_idx in range(_NUM_DIGEST_BLOCKS):
+            block_start = last_block_start * block_idx // (_NUM_DIGEST_BLOCKS - 1)
+            digest.update(mapped[block_start : block_start + _DIGEST_BLOCK_SIZE])
+    return digest.digest()
+
+
+def _read_header(index_file: Any) -> Optional[_IndexHeader]:
+    """Returns the header of an index file, or None if it is not an index of a version which this reads."""
+    fixed = index_file.read(_HEADER.size)
+    if len(fixed) < _HEADER.size:
+        return None
+    magic, version, meta_size, *fields, digest = _HEADER.unpack(fixed)
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    try:
+        meta = json.loads(index_file.read(meta_size).decode("utf-8"))
+    except ValueError:
+        return None
+    data_offset = -(-(_HEADER.size + meta_size) // 8) * 8
+    return _IndexHeader(*fields, digest, meta, data_offset)
+
+
+def _to_little_endian(entries: "array[int]") -> "array[int]":
+    if sys.byteorder == "big":
+        entries = array("q", entries)
+        entries.byteswap()
+    return entries
+
+
+class TimestampIndex:
+    """
+    A sidecar index of the matches of a dfregex in a file: the datetime of each match, as epoch microseconds,
+    along with the offsets of its start and end, sorted by datetime and then by offset.
+
+    Once built, the datetimes of the file, and the matches in a time range, are read from the index
+    without scanning the file again. The entries are memory-mapped, and a time range is found by binary search.
+
+    The index records the source file's size and modification time, and a digest of what it indexed,
+    so that it is updated incrementally when the file has only grown, and rebuilt otherwise.
+    Naive datetimes are indexed as they are, and aware ones are indexed in UTC.
+
+    Obtain one from DatetimeMatcher.index_file or DfregexPattern.index_file.
+    """
+
+    def __init__(self, index_path: Union[str, "os.PathLike[str]"]):
+        """Opens an existing index file. Use build_or_update to create or refresh one."""
+        self.__path = os.fspath(index_path)
+        with open(self.__path, "rb") as index_file:
+            header = _read_header(index_file)
+            if header is None:
+                raise ValueError(f"Not a timestamp index: {self.__path}")
+            self.__header = header
+            self.__mapped: Optional[mmap.mmap] = None
+            self.__entries: Sequence[int] = array("q")
+            if header.count > 0:
+                self.__mapped = mmap.mmap(
+                    index_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+                data = memoryview(self.__mapped)[
+                    header.data_offset : header.data_offset
+                    + header.count * _ENTRY_SIZE * 8
+                ]
+                if sys.byteorder == "little":
+                    self.__entries = data.cast("q")
+                else:
+                    self.__entries = _to_little_endian(array("q", data.tobytes()))
+        self.__epoch = _EPOCH_UTC if header.meta["is_aware"] else _EPOCH
+
+    def __len__(self) -> int:
+        return self.__header.count
+
+    def __enter__(self) -> "TimestampIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # public
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    # public
+    @property
+    def source_size(self) -> int:
+        """The size of the source file when it was last indexed."""
+        return self.__header.source_size
+
+    # public
+    def iter_records(self) -> Iterator[DatetimeRecord]:
+        """Iterates over every indexed match, in order of datetime, as a DatetimeRecord."""
+        return self.__iter_records(0, len(self))
+
+    # public
+    def search_time_range(
+        self, start: datetime, end: datetime
+    ) -> Iterator[DatetimeRecord]:
+        """
+        Iterates over the indexed matches dated from start (inclusive) to end (exclusive),
+        in order of datetime, as DatetimeRecords, found by binary search.
+
+        Raises a ValueError if start or end is naive while the indexed datetimes are aware,
+        or the other way around, rather than reading one as the other.
+        """
+        is_aware = self.__header.meta["is_aware"]
+        for bound in (start, end):
+            if (bound.utcoffset() is not None) != is_aware:
+                raise ValueError(
+                    "can't compare offset-naive and offset-aware datetimes: the index holds "
+                    f"{'aware' if is_aware else 'naive'} datetimes, but got {bound!r}"
+                )
+        times = self.__times()
+        return self.__iter_records(
+            bisect_left(times, _to_epoch_us(start)),
+            bisect_left(times, _to_epoch_us(end)),
+        )
+
+    # public
+    def close(self) -> None:
+        """Unmaps the index file."""
+        if isinstance(self.__entries, memoryview):
+            self.__entries.release()
+        self.__entries = array("q")
+        if self.__mapped is not None:
+            self.__mapped.close()
+            self.__mapped = None
+
+    # public
+    @classmethod
+    def build_or_update(
+        cls,
+        plan: DatetimeExtractionPlan,
+        source_path: Union[str, "os.PathLike[str]"],
+        index_path: Union[str, "os.PathLike[str]"],
+    ) -> "TimestampIndex":
+        """
+        Indexes the matches of the plan's regex, which must be a bytes regex, in the file at source_path,
+        into the file at index_path, and opens the index.
+
+        An index which is already up to date is opened as is. If the source file has only grown since it
+        was indexed, only the new part is scanned, and its entries are appended. Otherwise, including
+        when the index was made with another dfregex or locale, the whole file is indexed again.
+
+        Only complete lines are indexed incrementally: a last line without a newline is indexed,
+        but is scanned again once the file grows, in case it was still being written.
+
+        A file counts as grown rather than rewritten if the digest of the part already indexed is the same.
+        Up to 64 KiB, that part is hashed whole. Beyond that, it is hashed in 16 blocks of 4 KiB, at its
+        head, its tail and evenly in between, so an in-place edit which keeps the size and misses
+        every block goes unnoticed. Pass a new index_path, or delete the index, after such an edit.
+        """
+        if not isinstance(plan.regex.pattern, bytes):
+            raise ValueError("Indexing a file requires a bytes pattern")
+        meta = _get_meta(plan)
+        header = None
+        try:
+            with open(index_path, "rb") as index_file:
+                header = _read_header(index_file)
+        except FileNotFoundError:
+            pass
+        if header is not None and header.meta != meta:
+            header = None
+        with open(source_path, "rb") as source:
+            stat = os.fstat(source.fileno())
+            if (
+                header is not None
+                and stat.st_size == header.source_size
+                and stat.st_mtime_ns == header.source_mtime_ns
+            ):
+                return cls(index_path)
+            with (
+                mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+                if stat.st_size > 0
+                else _EmptyMapping()
+            ) as mapped:
+                if (
+                    header is not None
+                    and stat.st_size >= header.source_size
+                    and _get_digest(mapped, header.indexed_size) == header.digest
+                ):
+                    _update(plan, mapped, stat, meta, header, index_path)
+                else:
+                    _rebuild(plan, mapped, stat, meta, index_path)
+        return cls(index_path)
+
+    # private
+    def __times(self) -> Sequence[int]:
+        return self.__entries[0::_ENTRY_SIZE]
+
+    # private
+    def __iter_records(self, first: int, last: int) -> Iterator[DatetimeRecord]:
+        entries = self.__entries
+        epoch = self.__epoch
+        for idx in range(first * _ENTRY_SIZE, last * _ENTRY_SIZE, _ENTRY_SIZE):
+            yield DatetimeRecord(
+                entries[idx + 1],
+                entries[idx + 2],
+                epoch + timedelta(microseconds=entries[idx]),
+            )
+
+
+class _EmptyMapping(bytes):
+    """Stands in for the mapping of an empty file, which cannot be memory-mapped."""
+
+    def __enter__(self) -> "_EmptyMapping":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+def _scan(
+    plan: DatetimeExtractionPlan, mapped: Any, start: int, end: int
+) -> "array[int]":
+    """Scans the source from start to end, returning its entries, sorted."""
+    extractor = DeltaDatetimeExtractor(plan)
+    keyed_entries = []
+    for match in plan.regex.finditer(mapped, start, end):
+        maybe_datetime = extractor.extract_datetime_from_match(match, plan)
+        if maybe_datetime is not None:
+            keyed_entries.append(
+                (_to_epoch_us(maybe_datetime), match.start(), match.end())
+            )
+    # Already sorted when the source is, which sort checks in a single pass
+    keyed_entries.sort()
+    entries = array("q")
+    for keyed_entry in keyed_entries:
+        entries.extend(keyed_entry)
+    return entries
+
+
+def _get_indexed_size(mapped: Any, size: int) -> int:
+    """The size of the complete lines of the source, which are not scanned again when it grows."""
+    return mapped.rfind(b"\n", 0, size) + 1
+
+
+def _read_entries(
+    index_file: Any, header: _IndexHeader, first: int = 0
+) -> "array[int]":
+    """Reads the entries of an index file from the first-th on."""
+    entries = array("q")
+    index_file.seek(header.data_offset + first * _ENTRY_SIZE * 8)
+    entries.frombytes(index_file.read((header.count - first) * _ENTRY_SIZE * 8))
+    return _to_little_endian(entries)
+
+
+def _pack_header(
+    meta_bytes: bytes,
+    stat: os.stat_result,
+    indexed_size: int,
+    count: int,
+    digest: bytes,
+) -> bytes:
+    return _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(meta_bytes),
+        stat.st_size,
+        stat.st_mtime_ns,
+        indexed_size,
+        count,
+        digest,
+    )
+
+
+def _update(
+    plan: DatetimeExtractionPlan,
+    mapped: Any,
+    stat: os.stat_result,
+    meta: Dict[str, Any],
+    header: _IndexHeader,
+    index_path: Union[str, "os.PathLike[str]"],
+) -> None:
+    """Indexes what was added to the source since the header was written."""
+    new_entries = _scan(plan, mapped, header.indexed_size, stat.st_size)
+    with open(index_path, "r+b") as index_file:
+        # Only the last entry is needed to tell whether the new ones can go after the old ones
+        last_entry = _read_entries(index_file, header, max(0, header.count - 1))
+        is_appendable = header.indexed_size == header.source_size and (
+            not last_entry
+            or not new_entries
+            or tuple(new_entries[:2]) >= tuple(last_entry[:2])
+        )
+        if is_appendable:
+            indexed_size = _get_indexed_size(mapped, stat.st_size)
+            # Anything after the last counted entry was left by an interrupted update
+            index_file.seek(header.data_offset + header.count * _ENTRY_SIZE * 8)
+            index_file.truncate()
+            index_file.write(_to_little_endian(new_entries).tobytes())
+            index_file.flush()
+            os.fsync(index_file.fileno())
+            # The header is written last, so that it only ever counts complete entries
+            index_file.seek(0)
+            index_file.write(
+                _pack_header(
+                    _get_meta_bytes(meta),
+                    stat,
+                    indexed_size,
+                    header.count + len(new_entries) // _ENTRY_SIZE,
+                    _get_digest(mapped, indexed_size),
+                )
+            )
+            return
+        old_entries = _read_entries(index_file, header)
+    # The entries of an unfinished last line are dropped, since it was just scanned again,
+    # and new entries which sort before old ones have to be merged in
+    entries = [
+        tuple(old_entries[idx : idx + _ENTRY_SIZE])
+        for idx in range(0, len(old_entries), _ENTRY_SIZE)
+        if old_entries[idx + 1] < header.indexed_size
+    ]
+    entries.extend(
+        tuple(new_entries[idx : idx + _ENTRY_SIZE])
+        for idx in range(0, len(new_entries), _ENTRY_SIZE)
+    )
+    entries.sort()
+    _write(mapped, stat, meta, array("q", chain.from_iterable(entries)), index_path)
+
+
+def _rebuild(
+    plan: DatetimeExtractionPlan,
+    mapped: Any,
+    stat: os.stat_result,
+    meta: Dict[str, Any],
+    index_path: Union[str, "os.PathLike[str]"],
+) -> None:
+    _write(mapped, stat, meta, _scan(plan, mapped, 0, stat.st_size), index_path)
+
+
+def _get_meta_bytes(meta: Dict[str, Any]) -> bytes:
+    return json.dumps(meta, sort_keys=True).encode("utf-8")
+
+
+def _write(
+    mapped: Any,
+    stat: os.stat_result,
+    meta: Dict[str, Any],
+    entries: "array[int]",
+    index_path: Union[str, "os.PathLike[str]"],
+) -> None:
+    """
+    Writes a whole index file.
+
+    The file is written atomically, so that concurrent readers never open a partial index.
+    """
+    meta_bytes = _get_meta_bytes(meta)
+    indexed_size = _get_indexed_size(mapped, stat.st_size)
+    file_descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(index_path)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(
+                _pack_header(
+                    meta_bytes,
+                    stat,
+                    indexed_size,
+                    len(entries) // _ENTRY_SIZE,
+                    _get_digest(mapped, indexed_size),
+                )
+            )
+            temp_file.write(meta_bytes)
+            # The entries are aligned, so that they can be viewed in place as 64-bit integers
+            temp_file.write(b"\0" * (-(_HEADER.size + len(meta_bytes)) % 8))
+            temp_file.write(_to_little_endian(entries).tobytes())
+        os.replace(temp_path, index_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -15,8 +15,8 @@ TEST_JPEG_FILE_PIPELINE = [
         DfregexToken('DATETIME_FORMAT_CODE', r'%d'),
         DfregexToken('OTHER_REGEX_CHAR', r')\.jpe?g'),
     ]),
-    ('user_regex', r'(\w+?)%.+?_((?:[0-9]{4})-(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-(?:0[1-9]|[12][0-9]|3[01]))\.jpe?g'),
-    ('dt_extractor_regex', r'(\w+?)%.+?_((?P<DF___0>[0-9]{4})-(?P<DF___1>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-(?P<DF___2>0[1-9]|[12][0-9]|3[01]))\.jpe?g'),
+    ('user_regex', r'(\w+?)%.+?_((?:[0-9]{4})-(?:A(?:pr|ug)|Dec|Feb|J(?:an|u[ln])|Ma[ry]|Nov|Oct|Sep)-(?:[12][0-9]|0[1-9]|3[01]))\.jpe?g'),
+    ('dt_extractor_regex', r'(\w+?)%.+?_((?P<DF___0>[0-9]{4})-(?P<DF___1>A(?:pr|ug)|Dec|Feb|J(?:an|u[ln])|Ma[ry]|Nov|Oct|Sep)-(?P<DF___2>[12][0-9]|0[1-9]|3[01]))\.jpe?g'),
 ]
 
 TEST_MINUS_SIGNS_PIPELINE = [
@@ -29,8 +29,8 @@ TEST_MINUS_SIGNS_PIPELINE = [
         DfregexToken('DATETIME_FORMAT_CODE', r'%Y'),
         DfregexToken('OTHER_REGEX_CHAR', r'\.pdf'),
     ]),
-    ('user_regex', r'(?:[1-9]|1[0-2])_(?:[1-9]|[12][0-9]|3[01])_(?:[0-9]{4})\.pdf'),
-    ('dt_extractor_regex', r'(?P<DF___0>[1-9]|1[0-2])_(?P<DF___1>[1-9]|[12][0-9]|3[01])_(?P<DF___2>[0-9]{4})\.pdf')
+    ('user_regex', r'(?:1[0-2]|[1-9])_(?:[12][0-9]|3[01]|[1-9])_(?:[0-9]{4})\.pdf'),
+    ('dt_extractor_regex', r'(?P<DF___0>1[0-2]|[1-9])_(?P<DF___1>[12][0-9]|3[01]|[1-9])_(?P<DF___2>[0-9]{4})\.pdf')
 ]
 
 TEST_TIME_24H_WITH_MS_PIPELINE = [
@@ -60,8 +60,8 @@ TEST_TIME_12H_PIPELINE = [
         DfregexToken('DATETIME_FORMAT_CODE', r'%p'),
         DfregexToken('OTHER_REGEX_CHAR', r'\.'),
     ]),
-    ('user_regex', r'The time is (?:[1-9]|1[0-2]):(?:[0-5][0-9]) (?:AM|PM)\.'),
-    ('dt_extractor_regex', r'The time is (?P<DF___0>[1-9]|1[0-2]):(?P<DF___1>[0-5][0-9]) (?P<DF___2>AM|PM)\.'),
+    ('user_regex', r'The time is (?:1[0-2]|[1-9]):(?:[0-5][0-9]) (?:AM|PM)\.'),
+    ('dt_extractor_regex', r'The time is (?P<DF___0>1[0-2]|[1-9]):(?P<DF___1>[0-5][0-9]) (?P<DF___2>AM|PM)\.'),
 ]
 
 TEST_DATE_LONG_FORM_PIPELINE = [
@@ -77,8 +77,8 @@ TEST_DATE_LONG_FORM_PIPELINE = [
         DfregexToken('DATETIME_FORMAT_CODE', r'%Y'),
         DfregexToken('OTHER_REGEX_CHAR', r'\.'),
     ]),
-    ('user_regex', r'(Today is|Yesterday was) (?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday) (?:January|February|March|April|May|June|July|August|September|October|November|December) (?:[1-9]|[12][0-9]|3[01]), (?:[0-9]{4})\.'),
-    ('dt_extractor_regex', r'(Today is|Yesterday was) (?P<DF___0>Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday) (?P<DF___1>January|February|March|April|May|June|July|August|September|October|November|December) (?P<DF___2>[1-9]|[12][0-9]|3[01]), (?P<DF___3>[0-9]{4})\.'),
+    ('user_regex', r'(Today is|Yesterday was) (?:Friday|Monday|S(?:aturday|unday)|T(?:hursday|uesday)|Wednesday) (?:A(?:pril|ugust)|December|February|J(?:anuary|u(?:ly|ne))|Ma(?:rch|y)|November|October|September) (?:[12][0-9]|3[01]|[1-9]), (?:[0-9]{4})\.'),
+    ('dt_extractor_regex', r'(Today is|Yesterday was) (?P<DF___0>Friday|Monday|S(?:aturday|unday)|T(?:hursday|uesday)|Wednesday) (?P<DF___1>A(?:pril|ugust)|December|February|J(?:anuary|u(?:ly|ne))|Ma(?:rch|y)|November|October|September) (?P<DF___2>[12][0-9]|3[01]|[1-9]), (?P<DF___3>[0-9]{4})\.'),
 ]
 
 PIPELINES = {
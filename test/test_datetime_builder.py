@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_builder import DatetimeBuilder, get_numeric_strptime_args
+
+
+@pytest.mark.parametrize('format_codes,values', [
+    (['%Y', '%b', '%d'], ['2020', 'Mar', '10']),
+    (['%Y', '%m', '%d', '%H', '%M', '%S', '%f'], ['1999', '12', '31', '23', '59', '58', '123456']),
+    (['%A', '%B', '%d', '%Y'], ['Wednesday', 'January', '5', '2022']),
+    (['%I', '%M', '%p'], ['12', '30', 'AM']),
+    (['%I', '%M', '%p'], ['12', '30', 'PM']),
+    (['%I', '%M', '%p'], ['7', '05', 'PM']),
+    (['%I', '%M'], ['12', '05']),
+    (['%y', '%m', '%d'], ['68', '01', '01']),
+    (['%y', '%m', '%d'], ['69', '01', '01']),
+    (['%Y', '%j'], ['2020', '366']),
+    (['%Y', '%j'], ['2021', '366']),
+    (['%Y', '%U', '%w'], ['2021', '00', '0']),
+    (['%Y', '%W', '%a'], ['2021', '52', 'Sun']),
+    (['%Y', '%U', '%A'], ['1900', '00', 'Monday']),
+    (['%Y', '%m', '%d', '%z'], ['2020', '03', '10', '-0530']),
+    (['%Y', '%m', '%d', '%z'], ['2020', '03', '10', '+235959.999999']),
+    (['%m', '%d'], ['02', '29']),
+    (['%Y', '%m', '%d'], ['2021', '02', '29']),
+    (['%Y', '%j'], ['2021', '000']),
+    (['%Y', '%m', '%b'], ['2020', '01', 'Mar']),
+    (['%Y', '%b', '%m'], ['2020', 'Mar', '01']),
+    (['%H', '%I', '%p'], ['20', '07', 'AM']),
+    (['%I', '%p', '%H'], ['07', 'PM', '20']),
+    (['%Y', '%U', '%W', '%w'], ['2021', '10', '20', '3']),
+    (['%Y', '%W', '%U', '%a'], ['2021', '10', '20', 'Wed']),
+])
+def test_build__same_as_strptime(format_codes, values):
+    # Given
+    try:
+        expected_out = datetime.strptime('#'.join(values), '#'.join(format_codes))
+    except ValueError:
+        expected_out = None
+    # When
+    actual_out = DatetimeBuilder(format_codes).build(values)
+    # Then
+    assert actual_out == expected_out
+    if expected_out is not None:
+        assert actual_out.tzinfo == expected_out.tzinfo
+
+def test_build__repeated_code__later_wins():
+    # Given
+    builder = DatetimeBuilder(['%Y', '%d', '%m', '%d'])
+    # When
+    actual_out = builder.build(['2020', '05', '03', '10'])
+    # Then
+    assert builder.is_supported
+    assert actual_out == datetime(2020, 3, 10)
+
+def test_init__unknown_code__unsupported():
+    # When
+    actual_out = DatetimeBuilder(['%Y', '%Z'])
+    # Then
+    assert not actual_out.is_supported
+    with pytest.raises(ValueError):
+        actual_out.build(['2020', 'UTC'])
+
+def test_get_numeric_strptime_args__names_become_numbers():
+    # Given
+    format_codes_in = ['%a', '%d', '%b', '%Y', '%I', '%p']
+    values_in = ['Sun', '05', 'MAR', '2023', '12', 'AM']
+    # When
+    actual_out = get_numeric_strptime_args(format_codes_in, values_in, 'C')
+    # Then
+    assert actual_out == (('%w', '%d', '%m', '%Y', '%H'), ('0', '05', '3', '2023', '0'))
+
+def test_get_numeric_strptime_args__later_code_for_same_field_wins():
+    # When
+    actual_out = get_numeric_strptime_args(['%m', '%b'], ['01', 'Mar'], 'C')
+    # Then
+    assert actual_out == (('%m',), ('3',))
+
+def test_get_numeric_strptime_args__unknown_name__none():
+    # When
+    actual_out = get_numeric_strptime_args(['%b', '%Y'], ['Mär', '2020'], 'C')
+    # Then
+    assert actual_out is None
+
+def test_init__replace_keywords__fields_set_as_is():
+    # When
+    builder = DatetimeBuilder(['%Y', '%m', '%d', '%a', '%H', '%M', '%S', '%f', '%z'])
+    # Then
+    assert builder.replace_keywords == ('year', 'month', 'day', '', 'hour', 'minute', 'second', 'microsecond', 'tzinfo')
+
+def test_init__replace_keywords__derived_fields_rebuild():
+    # When
+    builder = DatetimeBuilder(['%m', '%d', '%Y', '%W', '%w', '%I', '%p', '%H'])
+    # Then
+    assert builder.replace_keywords == (None, None, None, None, None, '', None, 'hour')
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 
 from datetime_matcher.datetime_extractor import DatetimeExtractor, _normalize_format_code
+from datetime_matcher.model_types import DfregexToken
 
 
 @pytest.mark.parametrize('format_code,expected', [
@@ -103,3 +104,54 @@ def test_sanity_multiple(pipeline_of_data_factory, text_in, expected_outs):
     assert len(actual_outs) == len(expected_outs)
     for actual_out, expected_out in zip(actual_outs, expected_outs):
         assert actual_out == expected_out
+
+
+def test_create_extraction_plan__minus_signs__normalized_codes_by_group_index(pipeline_of_data_factory):
+    # Given
+    test_pipeline = dict(pipeline_of_data_factory('TEST_MINUS_SIGNS'))
+    tokens_in = test_pipeline['dftokens']
+    regex_in = test_pipeline['dt_extractor_regex']
+
+    # When
+    actual_out = DatetimeExtractor().create_extraction_plan(regex_in, tokens_in)
+
+    # Then
+    assert actual_out.group_indices == (1, 2, 3)
+    assert actual_out.format_codes == ('%m', '%d', '%Y')
+    assert actual_out.field_converters is not None
+    assert [entry[:2] for entry in actual_out.entries] == [(1, '%m'), (2, '%d'), (3, '%Y')]
+
+
+def test_create_extraction_plan__user_groups__skipped(pipeline_of_data_factory):
+    # Given
+    test_pipeline = dict(pipeline_of_data_factory('TEST_JPEG_FILE'))
+    tokens_in = test_pipeline['dftokens']
+    regex_in = test_pipeline['dt_extractor_regex']
+
+    # When
+    actual_out = DatetimeExtractor().create_extraction_plan(regex_in, tokens_in)
+
+    # Then
+    assert actual_out.group_indices == (3, 4, 5)
+    assert actual_out.format_codes == ('%Y', '%b', '%d')
+
+
+def test_extract_datetimes_with_plan__conflicting_codes__same_results_as_strptime():
+    # Given
+    tokens_in = [
+        DfregexToken('DATETIME_FORMAT_CODE', r'%Y'),
+        DfregexToken('OTHER_REGEX_CHAR', r'-'),
+        DfregexToken('DATETIME_FORMAT_CODE', r'%m'),
+        DfregexToken('OTHER_REGEX_CHAR', r'/'),
+        DfregexToken('DATETIME_FORMAT_CODE', r'%b'),
+    ]
+    regex_in = r'(?P<DF___0>[0-9]{4})-(?P<DF___1>0[1-9]|1[0-2])/(?P<DF___2>Jan|Feb|Mar)'
+    extractor = DatetimeExtractor()
+    plan = extractor.create_extraction_plan(regex_in, tokens_in)
+
+    # When
+    actual_outs = list(extractor.extract_datetimes_with_plan(plan, '2020-01/Mar 2020-13/Jan'))
+
+    # Then
+    assert plan.field_converters is not None
+    assert actual_outs == [datetime(2020, 3, 1)]
@@ -0,0 +1,123 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.model_types import DatetimeRecord
+
+LOG = ''.join(f'{idx:04} [2020-03-{idx % 28 + 1:02} 10:{idx % 60:02}] événement\n' for idx in range(200))
+
+
+def _make_reader(data, eof=True):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    if eof:
+        reader.feed_eof()
+    return reader
+
+
+def _collect(make_async_iterator, data):
+    async def collect():
+        return [item async for item in make_async_iterator(_make_reader(data))]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize('framing', ['chunk', 'line'])
+def test_aextract__str_pattern__same_as_sync_stream(framing):
+    # Given
+    pattern = DatetimeMatcher().compile(r'\[%Y-%m-%d %H:%M\]')
+    expected_out = list(pattern.extract_datetimes_from_stream(io.StringIO(LOG)))
+    # When
+    actual_out = _collect(
+        lambda reader: pattern.aextract(reader, chunk_size=37, overlap=32, framing=framing), LOG.encode('utf-8')
+    )
+    # Then
+    assert actual_out == expected_out
+    assert len(actual_out) == 200
+
+def test_aextract__bytes_pattern__offsets_in_bytes():
+    # Given
+    dtmatcher = DatetimeMatcher()
+    data = LOG.encode('utf-8')
+    # When
+    actual_out = _collect(lambda reader: dtmatcher.aextract(rb'\[%Y-%m-%d %H:%M\]', reader, chunk_size=50, overlap=32), data)
+    # Then
+    assert len(actual_out) == 200
+    assert all(data[record.offset:record.end].startswith(b'[2020-03-') for record in actual_out)
+
+def test_aextract__line_framing__reports_complete_lines_before_eof():
+    # Given
+    pattern = DatetimeMatcher().compile(r'%Y-%m-%d')
+
+    async def first_record():
+        reader = _make_reader(b'a 2020-03-10\nb 2020-03-11', eof=False)
+        records = pattern.aextract(reader, framing='line')
+        return await asyncio.wait_for(records.__anext__(), 1)
+
+    # When
+    actual_out = asyncio.run(first_record())
+    # Then
+    assert actual_out == DatetimeRecord(2, 12, datetime(2020, 3, 10))
+
+def test_aextract__executor__same_results():
+    # Given
+    pattern = DatetimeMatcher().compile(r'\[%Y-%m-%d %H:%M\]')
+    expected_out = list(pattern.extract_datetimes_from_stream(io.StringIO(LOG)))
+    # When
+    with ThreadPoolExecutor(2) as executor:
+        actual_out = _collect(
+            lambda reader: pattern.aextract(reader, chunk_size=100, overlap=32, executor=executor), LOG.encode('utf-8')
+        )
+    # Then
+    assert actual_out == expected_out
+
+def test_aextract__reads_only_as_fast_as_consumed():
+    # Given
+    class CountingReader:
+        def __init__(self):
+            self.num_reads = 0
+
+        async def read(self, n):
+            self.num_reads += 1
+            return f'{self.num_reads:06} 2020-03-10\n'.encode('ascii')
+
+    reader = CountingReader()
+    records = DatetimeMatcher().aextract(r'%Y-%m-%d', reader, framing='line')
+
+    async def take(num_records):
+        return [await records.__anext__() for _ in range(num_records)]
+
+    # When
+    actual_out = asyncio.run(take(3))
+    # Then
+    assert len(actual_out) == 3
+    assert reader.num_reads == 3
+
+@pytest.mark.parametrize('framing', ['chunk', 'line'])
+def test_asub_stream__same_as_sub(framing):
+    # Given
+    dtmatcher = DatetimeMatcher()
+    expected_out = dtmatcher.sub(r'\[%Y-%m-%d %H:%M\]', r'<%d/%m/%Y>', LOG)
+    # When
+    actual_out = _collect(lambda reader: dtmatcher.asub_stream(
+        r'\[%Y-%m-%d %H:%M\]', r'<%d/%m/%Y>', reader, chunk_size=41, overlap=32, framing=framing
+    ), LOG.encode('utf-8'))
+    # Then
+    assert ''.join(actual_out) == expected_out
+
+def test_asub_stream__bytes_pattern__executor():
+    # Given
+    dtmatcher = DatetimeMatcher()
+    data = LOG.encode('utf-8')
+    expected_out = dtmatcher.compile(rb'\[%Y-%m-%d %H:%M\]').sub(rb'<%Y%m%d>', data)
+    # When
+    with ThreadPoolExecutor(2) as executor:
+        actual_out = _collect(lambda reader: dtmatcher.asub_stream(
+            rb'\[%Y-%m-%d %H:%M\]', rb'<%Y%m%d>', reader, chunk_size=64, overlap=32, executor=executor
+        ), data)
+    # Then
+    assert b''.join(actual_out) == expected_out
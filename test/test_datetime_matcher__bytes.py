@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+
+@pytest.mark.parametrize('text', [
+    b'[2021-Mar-04 10:11:12 +0100] caf\xc3\xa9',
+    bytearray(b'[2021-Mar-04 10:11:12 +0100] caf\xc3\xa9'),
+    memoryview(b'[2021-Mar-04 10:11:12 +0100] caf\xc3\xa9'),
+])
+def test_extract_datetime__bytes_like_texts__extracted(text):
+    # Given
+    dfregex = rb'\[%Y-%b-%d %H:%M:%S %z\]'
+    # When
+    actual_out = DatetimeMatcher().extract_datetime(dfregex, text)
+    # Then
+    assert actual_out == datetime.strptime('2021-03-04 10:11:12 +0100', '%Y-%m-%d %H:%M:%S %z')
+
+def test_compile__bytes__bytes_regexes():
+    # When
+    actual_out = DatetimeMatcher().compile(rb'\xff%Y')
+    # Then
+    assert actual_out.pattern == rb'\xff%Y'
+    assert actual_out.regex.pattern == rb'\xff(?:[0-9]{4})'
+    assert actual_out.search(b'\xff2020').group() == b'\xff2020'
+
+def test_sub__bytes__groups_and_format_codes_substituted():
+    # Given
+    dfregex = rb'(\w+)_%Y-%b-%d\.jpe?g'
+    replacement = rb'%Y%m%d-\1 %B.jpg'
+    text = b'MyLovelyPicture_2020-Mar-10.jpeg'
+    # When
+    actual_out = DatetimeMatcher().sub(dfregex, replacement, text)
+    # Then
+    assert actual_out == b'20200310-MyLovelyPicture March.jpg'
+
+def test_extract_datetimes_from_file__bytes_pattern__byte_offsets(tmp_path):
+    # Given
+    content = 'é 2021-03-04 ü 2022-05-06\n'.encode('utf-8') * 3
+    path = tmp_path / 'app.log'
+    path.write_bytes(content)
+    # When
+    actual_out = list(DatetimeMatcher().extract_datetimes_from_file(rb'%Y-%m-%d', path, chunk_size=4, overlap=16))
+    # Then
+    assert [record.datetime for record in actual_out] == [datetime(2021, 3, 4), datetime(2022, 5, 6)] * 3
+    for record in actual_out:
+        assert content[record.offset:record.end] == record.datetime.strftime('%Y-%m-%d').encode('ascii')
+
+def test_extract_datetimes_from_file__mmap__same_as_chunked(tmp_path):
+    # Given
+    content = 'é 2021-03-04 ü 2022-05-06\n'.encode('utf-8') * 100
+    path = tmp_path / 'app.log'
+    path.write_bytes(content)
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = list(dtm.extract_datetimes_from_file(rb'%Y-%m-%d', path, use_mmap=True))
+    # Then
+    assert actual_out == list(dtm.extract_datetimes_from_file(rb'%Y-%m-%d', path, chunk_size=64, overlap=16))
+    assert len(actual_out) == 200
+
+def test_extract_datetimes_from_file__mmap_with_str_pattern__raises(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'2021-03-04')
+    # When / Then
+    with pytest.raises(ValueError):
+        list(DatetimeMatcher().extract_datetimes_from_file(r'%Y-%m-%d', path, use_mmap=True))
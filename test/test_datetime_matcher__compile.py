@@ -0,0 +1,112 @@
+import re
+from datetime import datetime
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.dfregex_pattern import DfregexPattern
+
+
+def test_compile__sanity__holds_compiled_regexes(pipeline_of_data_factory):
+    # Given
+    test_pipeline = dict(pipeline_of_data_factory('TEST_JPEG_FILE'))
+    dfregex = test_pipeline['dfregex']
+    # When
+    actual_out = DatetimeMatcher().compile(dfregex)
+    # Then
+    assert isinstance(actual_out, DfregexPattern)
+    assert actual_out.pattern == dfregex
+    assert list(actual_out.tokens) == test_pipeline['dftokens']
+    assert isinstance(actual_out.regex, re.Pattern)
+    assert actual_out.regex.pattern == test_pipeline['user_regex']
+    assert actual_out.extractor_regex.pattern == test_pipeline['dt_extractor_regex']
+    assert actual_out.df_group_format_codes == {'DF___0': '%Y', 'DF___1': '%b', 'DF___2': '%d'}
+
+def test_compile__reused_across_texts__same_results_as_matcher(pipeline_of_data_factory):
+    # Given
+    test_pipeline = dict(pipeline_of_data_factory('TEST_JPEG_FILE'))
+    dfregex = test_pipeline['dfregex']
+    replacement = r'%Y%m%d-\1.jpg'
+    texts = [
+        r'MyLovelyPicture%38E7F8AEA5_2020-Mar-10.jpeg',
+        r'MyNotSoLovelyPicture%-flameos_2011-Jul-05.jpg',
+        r'MyLovelyPicture_2020-Mar-10.jpeg',
+    ]
+    dtm = DatetimeMatcher()
+    # When
+    pattern = dtm.compile(dfregex)
+    # Then
+    for text in texts:
+        assert pattern.sub(replacement, text) == dtm.sub(dfregex, replacement, text)
+        assert list(pattern.extract_datetimes(text)) == list(dtm.extract_datetimes(dfregex, text))
+        assert pattern.findall(text) == dtm.findall(dfregex, text)
+
+def test_compile__extract_datetime__returns_leftmost():
+    # Given
+    dfregex = r'%Y-%m-%d'
+    text = r'from 2021-03-04 to 2022-05-06'
+    # When
+    actual_out = DatetimeMatcher().compile(dfregex).extract_datetime(text)
+    # Then
+    assert actual_out == datetime(2021, 3, 4)
+
+def test_compile__name_case_insensitive__only_names_ignore_case():
+    # Given
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = dtm.compile(r'on %d %b %Y', is_name_case_insensitive=True)
+    # Then
+    assert actual_out.is_name_case_insensitive
+    assert actual_out.extract_datetime('on 10 MAR 2020') == datetime(2020, 3, 10)
+    assert actual_out.search('ON 10 Mar 2020') is None
+    assert dtm.compile(r'on %d %b %Y').search('on 10 MAR 2020') is None
+
+def test_compile__minus_day_at_end__matches_whole_number():
+    # Given
+    pattern = DatetimeMatcher().compile(r'%Y-%-m-%-d')
+    # When
+    actual_out = pattern.extract_datetime('2020-12-25')
+    # Then
+    assert actual_out == datetime(2020, 12, 25)
+
+def test_compile__safe__numbers_are_not_split():
+    # Given
+    safe_dtm = DatetimeMatcher(is_safe=True)
+    # When
+    actual_out = [
+        safe_dtm.search(r'day %-d', 'day 123'),
+        safe_dtm.extract_datetime(r'%Y%m%d', 'at 20200310.'),
+        safe_dtm.extract_datetime(r'%-d\d+x', '1' * 5000 + ' x'),
+    ]
+    # Then
+    assert DatetimeMatcher().search(r'day %-d', 'day 123').group() == 'day 12'
+    assert actual_out == [None, datetime(2020, 3, 10), None]
+
+def test_compile__safe__quantifiers_after_format_codes__same_matches_as_default():
+    # Given
+    cases = [
+        (r'x%-d?y', 'xy'),
+        (r'x%-d?y', 'x5y'),
+        (r'%H:%M%S?', '10:30'),
+        (r'%H:%M%S?', '10:3045'),
+        (r'(?:%-d )+x', '1 2 3 x'),
+        (r'%Y+', '2020'),
+        (r'(?:%m-){2}%d', '01-02-03'),
+        (r'v(?:%-m ){2}', 'v12 3 '),
+        (r'%-d{1}/%-m', '12/3'),
+    ]
+    default_dtm = DatetimeMatcher()
+    safe_dtm = DatetimeMatcher(is_safe=True)
+    for dfregex, text in cases:
+        # When
+        actual_out = safe_dtm.search(dfregex, text)
+        # Then
+        expected = default_dtm.search(dfregex, text)
+        assert actual_out is not None, dfregex
+        assert actual_out.group() == expected.group(), dfregex
+
+def test_compile_set__safe__numbers_are_not_split():
+    # Given
+    dfregex_set = DatetimeMatcher(is_safe=True).compile_set([r'%Y-%-m', r'%-d/%-m'])
+    # When
+    actual_out = [set_match.match.group() for set_match in dfregex_set.finditer('2020-123 12/3')]
+    # Then
+    assert actual_out == ['12/3']
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+
+def test_compile_set__finditer__reports_pattern_and_datetime_per_match():
+    # Given
+    dfregex_set = DatetimeMatcher().compile_set([r'ERROR \w+ %Y-%m-%d', r'%d/%m/%Y', r'WARN \w+ %H:%M'])
+    text = 'ERROR disk 2020-01-02; then 03/04/2021; WARN cpu 12:30'
+    # When
+    actual_out = [(m.pattern_index, m.match.group(), m.datetime) for m in dfregex_set.finditer(text)]
+    # Then
+    assert actual_out == [
+        (0, 'ERROR disk 2020-01-02', datetime(2020, 1, 2)),
+        (1, '03/04/2021', datetime(2021, 4, 3)),
+        (2, 'WARN cpu 12:30', datetime(1900, 1, 1, 12, 30)),
+    ]
+
+def test_compile_set__search__same_as_each_pattern_on_its_own():
+    # Given
+    dfregexes = [r'(\w+)_%Y-%b-%d\.jpe?g', r'%Y%m%d-(\w+)\.jpg', r'on %A']
+    texts = ['MyLovelyPicture_2020-Mar-10.jpeg', '20200310-MyLovelyPicture.jpg', 'on Tuesday', 'nope']
+    dtm = DatetimeMatcher()
+    dfregex_set = dtm.compile_set(dfregexes)
+    for text in texts:
+        # When
+        actual_out = dfregex_set.search(text)
+        # Then
+        expected_index = next((idx for idx, dfregex in enumerate(dfregexes) if dtm.search(dfregex, text)), None)
+        if expected_index is None:
+            assert actual_out is None
+        else:
+            assert actual_out.pattern_index == expected_index
+            assert actual_out.datetime == dtm.extract_datetime(dfregexes[expected_index], text)
+
+def test_compile_set__same_position__first_pattern_wins():
+    # Given
+    dfregex_set = DatetimeMatcher().compile_set([r'%Y-%m', r'%Y-%m-%d'])
+    # When
+    actual_out = dfregex_set.search('2020-03-10')
+    # Then
+    assert actual_out.pattern_index == 0
+    assert actual_out.datetime == datetime(2020, 3, 1)
+
+def test_compile_set__invalid_datetime__none_datetime():
+    # Given
+    dfregex_set = DatetimeMatcher().compile_set([r'%Y-%m-%d'])
+    # When
+    actual_out = dfregex_set.search('2021-02-30')
+    # Then
+    assert actual_out.pattern_index == 0
+    assert actual_out.datetime is None
+
+def test_compile_set__bytes__matches_bytes():
+    # Given
+    dfregex_set = DatetimeMatcher().compile_set([rb'%Y-%m-%d', rb'%b %d'])
+    # When
+    actual_out = [(m.pattern_index, m.datetime) for m in dfregex_set.finditer(b'Mar 10, 2020-01-01')]
+    # Then
+    assert actual_out == [(1, datetime(1900, 3, 10)), (0, datetime(2020, 1, 1))]
+
+def test_compile_set__mixed_str_and_bytes__raises_type_error():
+    # Given
+    dtm = DatetimeMatcher()
+    # When / Then
+    with pytest.raises(TypeError):
+        dtm.compile_set([r'%Y', rb'%Y'])
+
+def test_compile_set__empty__raises_value_error():
+    # Given
+    dtm = DatetimeMatcher()
+    # When / Then
+    with pytest.raises(ValueError):
+        dtm.compile_set([])
+
+def test_compile_set__overlapping_patterns__finditer_reports_first_matches_reports_all():
+    # Given
+    dfregex_set = DatetimeMatcher().compile_set([r'%Y-%m', r'%Y-%m-%d', r'%d/%m/%Y', r'at %H:%M'])
+    text = 'on 2020-03-10 at noon'
+    # When
+    actual_out = dfregex_set.matches(text)
+    # Then
+    assert [set_match.pattern_index for set_match in dfregex_set.finditer(text)] == [0]
+    assert actual_out == [0, 1]
+
+def test_compile_set__matches__same_as_each_pattern_on_its_own():
+    # Given
+    dfregexes = [r'%Y-%m-%d', r'%d/%m/%Y', r'%H:%M', r'on %A']
+    texts = ['2020-01-02 12:30', '03/04/2021 and 2020-01-02', 'on Tuesday at 10:15', 'nope', '']
+    dtm = DatetimeMatcher()
+    dfregex_set = dtm.compile_set(dfregexes)
+    for text in texts:
+        # When
+        actual_out = dfregex_set.matches(text)
+        # Then
+        assert actual_out == [idx for idx, dfregex in enumerate(dfregexes) if dtm.search(dfregex, text)]
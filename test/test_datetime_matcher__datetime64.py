@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+np = pytest.importorskip('numpy')
+
+
+def test_extract_datetime64__sanity__leftmost_datetime_per_text():
+    # Given
+    texts = ['at 2020-03-10 12:34:56 and 2021-04-11 00:00:00', 'none here', '2021-02-28 23:59:59']
+    # When
+    actual_out = DatetimeMatcher().extract_datetime64(r'%Y-%m-%d %H:%M:%S', texts)
+    # Then
+    assert actual_out.dtype == np.dtype('datetime64[us]')
+    assert actual_out[0] == np.datetime64('2020-03-10T12:34:56')
+    assert np.isnat(actual_out[1])
+    assert actual_out[2] == np.datetime64('2021-02-28T23:59:59')
+
+def test_extract_datetime64__return_mask__true_where_extracted():
+    # Given
+    texts = ['2020-03-10', 'nope', '2021-02-30', '']
+    # When
+    actual_out, actual_mask = DatetimeMatcher().extract_datetime64(r'%Y-%m-%d', texts, return_mask=True)
+    # Then
+    assert actual_mask.tolist() == [True, False, False, False]
+    assert np.isnat(actual_out[1:]).all()
+
+def test_extract_datetime64__invalid_leftmost__looks_past_it_like_extract_datetime():
+    # Given
+    text = '2021-02-30 then 2021-03-01'
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = dtm.extract_datetime64(r'%Y-%m-%d', [text])
+    # Then
+    assert actual_out[0] == np.datetime64(dtm.extract_datetime(r'%Y-%m-%d', text))
+
+def test_extract_datetime64__names_and_12_hour_clock__same_as_extract_datetime():
+    # Given
+    dfregex = r'%a %d %b %Y %I:%M %p'
+    texts = ['Tue 10 Mar 2020 12:05 AM', 'Tue 10 Mar 2020 12:05 PM', 'Sat 21 Nov 1981 07:30 pm']
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = dtm.extract_datetime64(dfregex, texts)
+    # Then
+    assert actual_out.tolist() == [dtm.extract_datetime(dfregex, text) for text in texts]
+
+def test_extract_datetime64__day_of_year_and_week__same_as_extract_datetime():
+    # Given
+    texts = ['2020 060', '2021 366']
+    week_texts = ['2020 10 2', '2021 00 0']
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = dtm.extract_datetime64(r'%Y %j', texts)
+    actual_week_out = dtm.extract_datetime64(r'%Y %U %w', week_texts)
+    # Then
+    assert actual_out.tolist() == [dtm.extract_datetime(r'%Y %j', text) for text in texts]
+    assert actual_week_out.tolist() == [dtm.extract_datetime(r'%Y %U %w', text) for text in week_texts]
+
+def test_extract_datetime64__utc_offset__normalized_to_utc():
+    # Given
+    texts = ['2020-03-10 12:00 +0530', '2020-03-10 12:00 -0100']
+    # When
+    actual_out = DatetimeMatcher().extract_datetime64(r'%Y-%m-%d %H:%M %z', texts)
+    # Then
+    assert actual_out.tolist() == [datetime(2020, 3, 10, 6, 30), datetime(2020, 3, 10, 13, 0)]
+
+def test_extract_datetime64__bytes__same_as_str():
+    # Given
+    texts = ['2020-03-10T01:02:03.000004', 'x']
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = dtm.extract_datetime64(rb'%Y-%m-%dT%H:%M:%S.%f', [text.encode() for text in texts])
+    # Then
+    assert actual_out.tolist() == dtm.extract_datetime64(r'%Y-%m-%dT%H:%M:%S.%f', texts).tolist()
+    assert actual_out[0] == np.datetime64('2020-03-10T01:02:03.000004')
@@ -0,0 +1,232 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.timestamp_index import TimestampIndex
+
+DFREGEX = rb'(?m)^%Y-%m-%d %H:%M:%S'
+
+
+def _make_lines(num_lines, first=datetime(2021, 6, 15), seed=0):
+    rng = random.Random(seed)
+    dt = first
+    lines = []
+    for idx in range(num_lines):
+        dt += timedelta(seconds=rng.choice([0, 1, 1, 2, 30]))
+        lines.append(f'{dt:%Y-%m-%d %H:%M:%S} INFO request {idx}\n'.encode())
+        if rng.random() < 0.1:
+            lines.append(b'  at handler (' + str(idx).encode() + b')\n')
+    return lines
+
+
+def _scan(path):
+    return [
+        (record.offset, record.datetime)
+        for record in DatetimeMatcher().extract_datetimes_from_file(DFREGEX, path)
+    ]
+
+
+def _as_pairs(records):
+    return [(record.offset, record.datetime) for record in records]
+
+
+def test_index_file__new_index__same_records_as_scanning(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(_make_lines(1000)))
+    dtmatcher = DatetimeMatcher()
+    # When
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == _scan(path)
+    assert os.path.exists(str(path) + '.dtmidx')
+
+def test_index_file__str_dfregex__encoded_as_utf8(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(_make_lines(10)))
+    dtmatcher = DatetimeMatcher()
+    # When
+    with dtmatcher.index_file(DFREGEX.decode(), path, tmp_path / 'app.idx') as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == _scan(path)
+
+def test_index_file__str_pattern__raises_value_error(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(_make_lines(10)))
+    pattern = DatetimeMatcher().compile(DFREGEX.decode())
+    # When, Then
+    with pytest.raises(ValueError):
+        pattern.index_file(path)
+
+def test_search_time_range__random_ranges__same_as_filtering_a_scan(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(_make_lines(2000)))
+    expected_all = _scan(path)
+    rng = random.Random(1)
+    first = datetime(2021, 6, 15)
+    with DatetimeMatcher().index_file(DFREGEX, path) as index:
+        for _ in range(50):
+            start = first + timedelta(seconds=rng.randrange(-100, 14400))
+            end = start + timedelta(seconds=rng.choice([0, 1, 60, 600, 20000]))
+            # When
+            actual_out = _as_pairs(index.search_time_range(start, end))
+            # Then
+            assert actual_out == [pair for pair in expected_all if start <= pair[1] < end]
+
+def test_index_file__up_to_date__reused_without_writing(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(_make_lines(100)))
+    dtmatcher = DatetimeMatcher()
+    dtmatcher.index_file(DFREGEX, path).close()
+    index_path = str(path) + '.dtmidx'
+    os.utime(index_path, ns=(0, 0))
+    # When
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        actual_out = len(index)
+    # Then
+    assert actual_out == len(_scan(path))
+    assert os.stat(index_path).st_mtime_ns == 0
+
+def test_index_file__appended__entries_appended_in_place(tmp_path):
+    # Given
+    lines = _make_lines(300)
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(lines[:200]))
+    dtmatcher = DatetimeMatcher()
+    dtmatcher.index_file(DFREGEX, path).close()
+    index_path = str(path) + '.dtmidx'
+    inode = os.stat(index_path).st_ino
+    # When
+    with open(path, 'ab') as log:
+        log.write(b''.join(lines[200:]))
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == _scan(path)
+    assert os.stat(index_path).st_ino == inode
+
+def test_index_file__unfinished_last_line__indexed_again_once_finished(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'2021-06-15 10:00:00 a\n2021-06-15 10:00:0')
+    dtmatcher = DatetimeMatcher()
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        assert len(index) == 1
+    # When
+    with open(path, 'ab') as log:
+        log.write(b'5 b\n2021-06-15 10:00:03 c\n')
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == [
+        (0, datetime(2021, 6, 15, 10, 0, 0)),
+        (44, datetime(2021, 6, 15, 10, 0, 3)),
+        (22, datetime(2021, 6, 15, 10, 0, 5)),
+    ]
+
+def test_index_file__rewritten__rebuilt(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(_make_lines(100)))
+    dtmatcher = DatetimeMatcher()
+    dtmatcher.index_file(DFREGEX, path).close()
+    # When
+    path.write_bytes(b''.join(_make_lines(150, first=datetime(2022, 1, 1), seed=2)))
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == _scan(path)
+
+def test_index_file__other_dfregex__rebuilt(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'2021-06-15 10:00:00 a\n')
+    dtmatcher = DatetimeMatcher()
+    dtmatcher.index_file(DFREGEX, path).close()
+    # When
+    with dtmatcher.index_file(rb'(?m)^%Y-%m-%d', path) as index:
+        actual_out = [(record.offset, record.end) for record in index.iter_records()]
+    # Then
+    assert actual_out == [(0, 10)]
+
+def test_index_file__aware_datetimes__indexed_in_utc(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'2021-06-15 10:00:00 +0200 a\n2021-06-15 09:30:00 +0000 b\n')
+    dtmatcher = DatetimeMatcher()
+    # When
+    with dtmatcher.index_file(rb'(?m)^%Y-%m-%d %H:%M:%S %z', path) as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == [
+        (0, datetime(2021, 6, 15, 8, 0, tzinfo=timezone.utc)),
+        (28, datetime(2021, 6, 15, 9, 30, tzinfo=timezone.utc)),
+    ]
+
+def test_timestamp_index__not_an_index__raises_value_error(tmp_path):
+    # Given
+    path = tmp_path / 'app.log.dtmidx'
+    path.write_bytes(b'not an index')
+    # When, Then
+    with pytest.raises(ValueError):
+        TimestampIndex(path)
+
+def test_index_file__empty_file__empty_index(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'')
+    # When
+    with DatetimeMatcher().index_file(DFREGEX, path) as index:
+        actual_out = list(index.iter_records())
+    # Then
+    assert actual_out == []
+
+
+def test_search_time_range__naive_bounds_on_aware_index__raises_value_error(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'2021-06-15 10:00:00 +0200 a\n')
+    with DatetimeMatcher().index_file(rb'(?m)^%Y-%m-%d %H:%M:%S %z', path) as index:
+        # When, Then
+        with pytest.raises(ValueError):
+            list(index.search_time_range(datetime(2021, 6, 15), datetime(2021, 6, 16)))
+        assert len(list(index.search_time_range(
+            datetime(2021, 6, 15, tzinfo=timezone.utc), datetime(2021, 6, 16, tzinfo=timezone.utc)
+        ))) == 1
+
+
+def test_search_time_range__aware_bounds_on_naive_index__raises_value_error(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'2021-06-15 10:00:00 a\n')
+    with DatetimeMatcher().index_file(DFREGEX, path) as index:
+        # When, Then
+        with pytest.raises(ValueError):
+            index.search_time_range(datetime(2021, 6, 15, tzinfo=timezone.utc), datetime(2021, 6, 16))
+
+
+def test_index_file__earlier_content_rewritten_in_place__rebuilt(tmp_path):
+    # Given
+    lines = _make_lines(5000)
+    path = tmp_path / 'app.log'
+    path.write_bytes(b''.join(lines))
+    dtmatcher = DatetimeMatcher()
+    dtmatcher.index_file(DFREGEX, path).close()
+    # When
+    content = bytearray(path.read_bytes())
+    content[:4] = b'2019'
+    path.write_bytes(bytes(content) + b'2022-01-01 00:00:00 appended\n')
+    with dtmatcher.index_file(DFREGEX, path) as index:
+        actual_out = _as_pairs(index.iter_records())
+    # Then
+    assert actual_out == sorted(_scan(path), key=lambda pair: (pair[1], pair[0]))
+    assert actual_out[0][1].year == 2019
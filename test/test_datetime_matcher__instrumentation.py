@@ -0,0 +1,126 @@
+import pickle
+from datetime import datetime
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.instrumentation import STAGES, MatcherHooks, MatcherStats
+
+
+class RecordingHooks(MatcherHooks):
+    def __init__(self):
+        self.events = []
+    def on_stage(self, stage, seconds):
+        self.events.append(('stage', stage))
+    def on_extraction(self, seconds, is_parsed):
+        self.events.append(('extraction', is_parsed))
+    def on_cache_lookup(self, is_hit):
+        self.events.append(('cache', is_hit))
+
+
+def test_stats__compile__times_each_compile_stage_once():
+    # Given
+    stats = MatcherStats()
+    dtmatcher = DatetimeMatcher(hooks=stats)
+    # When
+    dtmatcher.compile(r'%Y-%m-%d')
+    dtmatcher.compile(r'%Y-%m-%d')
+    # Then
+    info = stats.info()
+    assert [info.stages[stage].calls for stage in STAGES] == [1, 1, 1, 0, 0]
+    assert all(info.stages[stage].total_seconds > 0 for stage in ('tokenize', 'generate', 'compile'))
+    assert (info.cache_hits, info.cache_misses, info.cache_hit_rate) == (1, 1, 0.5)
+
+def test_stats__extract__counts_matches_and_parse_failures():
+    # Given
+    stats = MatcherStats()
+    dtmatcher = DatetimeMatcher(hooks=stats)
+    text = '2020-02-29 2021-02-29 2021-03-01'
+    # When
+    actual_out = list(dtmatcher.extract_datetimes(r'%Y-%m-%d', text))
+    # Then
+    assert actual_out == [datetime(2020, 2, 29), datetime(2021, 3, 1)]
+    info = stats.info()
+    assert (info.matches, info.parse_failures) == (3, 1)
+    assert info.stages['extract'].calls == 3
+    assert info.stages['scan'].calls == 1
+
+def test_stats__sub__scans_once_and_extracts_each_match():
+    # Given
+    stats = MatcherStats()
+    dtmatcher = DatetimeMatcher(hooks=stats)
+    # When
+    actual_out = dtmatcher.sub(r'%Y-%m-%d', r'%d/%m/%Y', 'from 2020-01-02 to 2020-13-01')
+    # Then
+    assert actual_out == 'from 02/01/2020 to 2020-13-01'
+    info = stats.info()
+    assert (info.matches, info.parse_failures) == (1, 0)
+    assert info.stages['scan'].calls == 1
+
+def test_stats__same_results_as_without_hooks():
+    # Given
+    texts = ['IMG_20200310_074512.jpg', 'IMG_20201310_074512.jpg', 'none']
+    plain = DatetimeMatcher().compile(r'IMG_%Y%m%d_%H%M%S')
+    instrumented = DatetimeMatcher(hooks=MatcherStats()).compile(r'IMG_%Y%m%d_%H%M%S')
+    # When / Then
+    assert instrumented.extract_datetimes_many(texts) == plain.extract_datetimes_many(texts)
+    assert instrumented.sub_many(r'%Y', texts) == plain.sub_many(r'%Y', texts)
+    assert [m.span() for m in instrumented.finditer(texts[0])] == [m.span() for m in plain.finditer(texts[0])]
+    assert instrumented.findall(texts[0]) == plain.findall(texts[0])
+    assert instrumented.regex is not None and instrumented.regex.pattern == plain.regex.pattern
+
+def test_stats__reset__zeroes_everything():
+    # Given
+    stats = MatcherStats()
+    dtmatcher = DatetimeMatcher(hooks=stats)
+    dtmatcher.extract_datetime(r'%Y', '2020')
+    # When
+    stats.reset()
+    # Then
+    info = stats.info()
+    assert all(stage_stats.calls == 0 for stage_stats in info.stages.values())
+    assert (info.matches, info.parse_failures, info.cache_hits, info.cache_misses) == (0, 0, 0, 0)
+
+def test_hooks__custom_hooks__receive_events_in_order():
+    # Given
+    hooks = RecordingHooks()
+    dtmatcher = DatetimeMatcher(hooks=hooks)
+    # When
+    dtmatcher.extract_datetime(r'%Y', 'in 2020')
+    # Then
+    assert hooks.events == [
+        ('cache', False),
+        ('stage', 'tokenize'),
+        ('stage', 'generate'),
+        ('stage', 'compile'),
+        ('extraction', True),
+        ('stage', 'scan'),
+    ]
+
+def test_hooks__no_hooks__patterns_are_plain():
+    # When
+    pattern = DatetimeMatcher().compile(r'%Y')
+    # Then
+    assert pattern.hooks is None
+    assert pickle.loads(pickle.dumps(pattern)).extract_datetime('2020') == datetime(2020, 1, 1)
+
+def test_with_hooks__plain_pattern__instruments_a_copy():
+    # Given
+    stats = MatcherStats()
+    pattern = DatetimeMatcher().compile(r'%Y')
+    # When
+    instrumented = pattern.with_hooks(stats)
+    instrumented.extract_datetime('2020')
+    pattern.extract_datetime('2021')
+    # Then
+    assert instrumented.hooks is stats and pattern.hooks is None
+    assert stats.info().matches == 1
+
+def test_disk_cache__with_hooks__stores_plain_patterns(tmp_path):
+    # Given
+    dtmatcher = DatetimeMatcher(disk_cache_dir=tmp_path, hooks=MatcherStats())
+    # When
+    pattern = dtmatcher.compile(r'%Y-%m')
+    # Then
+    assert pattern.hooks is not None
+    loaded = DatetimeMatcher(disk_cache_dir=tmp_path).compile(r'%Y-%m')
+    assert loaded.hooks is None
+    assert loaded.extract_datetime('2020-05') == datetime(2020, 5, 1)
@@ -0,0 +1,147 @@
+import locale
+import threading
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher import locale_names
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+GERMAN_NAMES = {
+    'a': ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So'],
+    'A': ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag'],
+    'b': ['Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez'],
+    'B': ['Januar', 'Februar', 'März', 'April', 'Mai', 'Juni', 'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'],
+    'p': ['', ''],
+}
+
+
+@pytest.fixture
+def fake_german_locale(monkeypatch):
+    """Makes a fake 'de_TEST' LC_TIME locale available, since the real ones may not be installed."""
+    real_setlocale = locale.setlocale
+    real_read_names = locale_names._read_names_by_format_code
+    current = {'name': None}
+
+    def setlocale(category, name=None):
+        if category != locale.LC_TIME or (name is None and current['name'] is None):
+            return real_setlocale(category, name)
+        if name is not None:
+            current['name'] = 'de_TEST' if name == 'de_TEST' else None
+            if name != 'de_TEST':
+                return real_setlocale(category, name)
+        return current['name'] or real_setlocale(category)
+
+    monkeypatch.setattr(locale, 'setlocale', setlocale)
+    monkeypatch.setattr(
+        locale_names,
+        '_read_names_by_format_code',
+        lambda: GERMAN_NAMES if current['name'] == 'de_TEST' else real_read_names(),
+    )
+    return 'de_TEST'
+
+
+def test_compile__locale__matches_and_extracts_its_names(fake_german_locale):
+    # Given
+    dtmatcher = DatetimeMatcher()
+    previous_locale_name = locale.setlocale(locale.LC_TIME)
+    # When
+    pattern = dtmatcher.compile(r'%-d\. %B %Y', locale=fake_german_locale)
+    # Then
+    assert pattern.locale == 'de_TEST'
+    assert pattern.extract_datetime('am 3. März 2021') == datetime(2021, 3, 3)
+    assert pattern.extract_datetime('am 3. March 2021') is None
+    assert locale.setlocale(locale.LC_TIME) == previous_locale_name
+
+def test_compile__locale__cached_separately(fake_german_locale):
+    # Given
+    dtmatcher = DatetimeMatcher()
+    # When
+    default_pattern = dtmatcher.compile(r'%b %Y')
+    german_pattern = dtmatcher.compile(r'%b %Y', locale=fake_german_locale)
+    # Then
+    assert default_pattern is not german_pattern
+    assert default_pattern.extract_datetime('Oct 2021') == datetime(2021, 10, 1)
+    assert german_pattern.extract_datetime('Okt 2021') == datetime(2021, 10, 1)
+
+def test_matcher__default_locale__used_by_every_method(fake_german_locale):
+    # Given
+    dtmatcher = DatetimeMatcher(locale=fake_german_locale)
+    # When
+    actual_out = dtmatcher.sub(r'%-d %b %Y', r'%Y-%m-%d', 'Montag 1 Dez 2020')
+    # Then
+    assert actual_out == 'Montag 2020-12-01'
+
+def test_compile__locale__conflicting_codes_use_locale_names(fake_german_locale):
+    # Given
+    pattern = DatetimeMatcher().compile(r'%Y-%m/%b', locale=fake_german_locale)
+    # When
+    actual_out = pattern.extract_datetime('2020-01/Mär')
+    # Then
+    assert actual_out == datetime(2020, 3, 1)
+
+def test_compile_set__patterns_of_different_locales(fake_german_locale):
+    # Given
+    dtmatcher = DatetimeMatcher()
+    dfregex_set = dtmatcher.compile_set([r'%B %Y'], locale=fake_german_locale)
+    # When
+    actual_out = [set_match.datetime for set_match in dfregex_set.finditer('Mai 2020, May 2020, März 2021')]
+    # Then
+    assert actual_out == [datetime(2020, 5, 1), datetime(2021, 3, 1)]
+
+def test_compile__locale__from_many_threads(fake_german_locale):
+    # Given
+    dtmatcher = DatetimeMatcher()
+    results = []
+
+    def compile_and_extract(thread_idx):
+        locale_name = fake_german_locale if thread_idx % 2 else None
+        text = 'Dezember 2020' if thread_idx % 2 else 'December 2020'
+        results.append(dtmatcher.compile(r'%B %Y', locale=locale_name).extract_datetime(text))
+
+    threads = [threading.Thread(target=compile_and_extract, args=(idx,)) for idx in range(8)]
+    # When
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Then
+    assert results == [datetime(2020, 12, 1)] * 8
+
+def test_compile__locale__bytes_pattern_matches_non_ascii_names(fake_german_locale):
+    # Given
+    pattern = DatetimeMatcher().compile(rb'%a, %-d\. %B %Y', locale=fake_german_locale)
+    # When
+    actual_out = [
+        pattern.extract_datetime('Mi, 3. März 2021'.encode('utf-8')),
+        pattern.extract_datetime('Mo, 1. März 2021'.encode('utf-8')),
+    ]
+    # Then
+    assert actual_out == [datetime(2021, 3, 3), datetime(2021, 3, 1)]
+
+def test_compile__locale_without_am_pm__12_hour_clock_is_am(fake_german_locale):
+    # Given
+    pattern = DatetimeMatcher().compile(r'%I:%M %p', locale=fake_german_locale)
+    # When
+    actual_out = [pattern.extract_datetime('09:30 '), pattern.extract_datetime('12:15 ')]
+    # Then
+    assert actual_out == [datetime(1900, 1, 1, 9, 30), datetime(1900, 1, 1, 0, 15)]
+
+def test_compile__unavailable_locale__raises():
+    # When / Then
+    with pytest.raises(locale.Error):
+        DatetimeMatcher().compile(r'%B %Y', locale='xx_NOT_A_LOCALE')
+
+def test_matcher__locale__names_read_at_construction(fake_german_locale):
+    # Given
+    locale_names.get_names_by_format_code.cache_clear()
+    # When
+    dtmatcher = DatetimeMatcher(locale=fake_german_locale)
+    # Then
+    assert locale_names.get_names_by_format_code.cache_info().currsize == 1
+    assert dtmatcher.extract_datetime(r'%-d\. %B %Y', 'am 3. März 2021') == datetime(2021, 3, 3)
+
+def test_matcher__unavailable_locale__raises_at_construction():
+    # When / Then
+    with pytest.raises(locale.Error):
+        DatetimeMatcher(locale='xx_NOT_A_LOCALE')
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+
+def test_sub_many__sanity__same_as_sub_in_order(pipeline_of_data_factory):
+    # Given
+    test_pipeline = dict(pipeline_of_data_factory('TEST_JPEG_FILE'))
+    search_dfregex = test_pipeline['dfregex']
+    replacement = r'%Y%m%d-\1.jpg'
+    texts = [
+        r'MyLovelyPicture%38E7F8AEA5_2020-Mar-10.jpeg',
+        r'MyLovelyPicture_2020-Mar-10.jpeg',
+        r'TheirVeryLovelyPicture%-linuxwoop_1981-Nov-21.jpg',
+    ]
+    dtm = DatetimeMatcher()
+    # When
+    actual_out = dtm.sub_many(search_dfregex, replacement, texts)
+    # Then
+    assert actual_out == [dtm.sub(search_dfregex, replacement, text) for text in texts]
+    assert actual_out[0] == '20200310-MyLovelyPicture.jpg'
+
+def test_sub_many__streaming__lazy_iterator():
+    # Given
+    texts = (text for text in ['2020-03-10', 'nope', '2021-04-11'])
+    # When
+    actual_out = DatetimeMatcher().sub_many(r'%Y-%m-%d', r'%d/%m/%Y', texts, is_streaming=True)
+    # Then
+    assert not isinstance(actual_out, list)
+    assert list(actual_out) == ['10/03/2020', 'nope', '11/04/2021']
+
+def test_extract_datetimes_many__sanity__lists_per_text():
+    # Given
+    texts = ['2020-03-10 and 2021-04-11', 'none here', '2021-02-30 and 2022-05-12']
+    # When
+    actual_out = DatetimeMatcher().extract_datetimes_many(r'%Y-%m-%d', texts)
+    # Then
+    assert actual_out == [
+        [datetime(2020, 3, 10), datetime(2021, 4, 11)],
+        [],
+        [datetime(2022, 5, 12)],
+    ]
+
+def test_extract_datetimes_many__with_count__limits_per_text():
+    # Given
+    texts = ['2020-03-10 and 2021-04-11', '2021-02-30 and 2022-05-12 and 2023-06-13']
+    # When
+    actual_out = list(DatetimeMatcher().extract_datetimes_many(r'%Y-%m-%d', texts, 1, is_streaming=True))
+    # Then
+    assert actual_out == [[datetime(2020, 3, 10)], [datetime(2022, 5, 12)]]
@@ -0,0 +1,96 @@
+import pickle
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.instrumentation import MatcherStats
+
+LOG_LINES = [
+    '2021-06-15 08:30:01 GET /',
+    '2021-06-15 08:30:01 GET /favicon.ico',
+    '2021-06-15 08:30:01 POST /login',
+    '2021-06-15 08:30:02 GET /home',
+    '2021-02-30 08:30:02 GET /bad-date',
+    '2021-02-30 08:30:02 GET /bad-date-again',
+]
+
+
+def test_memo__repeated_timestamps__hits():
+    # Given
+    dtmatcher = DatetimeMatcher(memo_size=16)
+    pattern = dtmatcher.compile(r'%Y-%m-%d %H:%M:%S')
+    # When
+    actual_out = pattern.extract_datetimes_many(LOG_LINES)
+    # Then
+    assert actual_out == DatetimeMatcher().compile(r'%Y-%m-%d %H:%M:%S').extract_datetimes_many(LOG_LINES)
+    memo_info = pattern.memo_info()
+    assert (memo_info.hits, memo_info.misses, memo_info.maxsize, memo_info.currsize) == (3, 3, 16, 3)
+    assert memo_info.hit_rate == 0.5
+
+def test_memo__shared_datetime_objects():
+    # Given
+    pattern = DatetimeMatcher(memo_size=16).compile(r'%Y-%m-%d %H:%M:%S')
+    # When
+    first, second = pattern.extract_datetimes_many(LOG_LINES[:2])
+    # Then
+    assert first == [datetime(2021, 6, 15, 8, 30, 1)]
+    assert first[0] is second[0]
+
+def test_memo__bounded__evicts_least_recently_used():
+    # Given
+    pattern = DatetimeMatcher(memo_size=1).compile(r'%H:%M')
+    # When
+    list(pattern.extract_datetimes('10:00 11:00 10:00'))
+    # Then
+    memo_info = pattern.memo_info()
+    assert (memo_info.hits, memo_info.misses, memo_info.currsize) == (0, 3, 1)
+
+def test_memo__single_group():
+    # Given
+    pattern = DatetimeMatcher(memo_size=None).compile(r'%Y')
+    # When
+    actual_out = list(pattern.extract_datetimes('2020 2020 2021'))
+    # Then
+    assert actual_out == [datetime(2020, 1, 1), datetime(2020, 1, 1), datetime(2021, 1, 1)]
+    assert pattern.memo_info().hits == 1
+
+def test_memo__sub__uses_memo():
+    # Given
+    pattern = DatetimeMatcher().compile(r'%Y-%m-%d').with_memo(8)
+    # When
+    actual_out = pattern.sub(r'%d/%m/%Y', '2020-01-02 and 2020-01-02')
+    # Then
+    assert actual_out == '02/01/2020 and 02/01/2020'
+    assert pattern.memo_info().hits == 1
+
+def test_memo__default__none():
+    # When
+    pattern = DatetimeMatcher().compile(r'%Y')
+    # Then
+    assert pattern.memo_size == 0
+    assert pattern.memo_info() is None
+
+def test_memo__with_hooks__keeps_memo_and_counts_every_extraction():
+    # Given
+    stats = MatcherStats()
+    pattern = DatetimeMatcher(hooks=stats, memo_size=8).compile(r'%Y-%m-%d %H:%M:%S')
+    # When
+    pattern.extract_datetimes_many(LOG_LINES)
+    # Then
+    assert pattern.memo_info().hits == 3
+    assert (stats.info().matches, stats.info().parse_failures) == (6, 2)
+
+def test_memo__disk_cache__stores_plain_patterns(tmp_path):
+    # Given
+    DatetimeMatcher(disk_cache_dir=tmp_path, memo_size=8).compile(r'%Y-%m')
+    # When
+    loaded = DatetimeMatcher(disk_cache_dir=tmp_path).compile(r'%Y-%m')
+    # Then
+    assert loaded.memo_info() is None
+    assert pickle.loads(pickle.dumps(loaded)).extract_datetime('2020-05') == datetime(2020, 5, 1)
+
+def test_memo__negative_size__raises():
+    # When / Then
+    with pytest.raises(ValueError):
+        DatetimeMatcher(memo_size=-1)
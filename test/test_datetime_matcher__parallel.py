@@ -0,0 +1,107 @@
+from datetime import datetime
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+TEXTS = [f'log_{2000 + i % 30}-{1 + i % 12:02d}-{1 + i % 28:02d}.txt' for i in range(50)] + ['no date']
+
+
+def test_parallel_extract__ordered__same_as_batch():
+    # Given
+    dfregex = r'%Y-%m-%d'
+    with DatetimeMatcher() as dtm:
+        # When
+        actual_out = list(dtm.parallel_extract(dfregex, TEXTS, workers=2, chunksize=7))
+        # Then
+        assert actual_out == dtm.extract_datetimes_many(dfregex, TEXTS)
+        assert actual_out[1] == [datetime(2001, 2, 2)]
+        assert actual_out[-1] == []
+
+def test_parallel_sub__unordered__indexed_results_cover_all():
+    # Given
+    dfregex = r'log_%Y-%m-%d\.txt'
+    replacement = r'%d%m%Y.log'
+    with DatetimeMatcher() as dtm:
+        # When
+        actual_out = dict(dtm.parallel_sub(dfregex, replacement, TEXTS, workers=2, chunksize=7, is_ordered=False))
+        # Then
+        assert sorted(actual_out) == list(range(len(TEXTS)))
+        assert [actual_out[i] for i in range(len(TEXTS))] == dtm.sub_many(dfregex, replacement, TEXTS)
+
+def test_parallel__pool_reused_across_calls():
+    # Given
+    with DatetimeMatcher() as dtm:
+        first_out = list(dtm.parallel_sub(r'%Y', r'%y', ['1999', '2000'], workers=2))
+        # When
+        second_out = list(dtm.parallel_sub(r'%Y', r'%y', ['2001'], workers=2))
+    # Then
+    assert first_out == ['99', '00']
+    assert second_out == ['01']
+
+def test_parallel__concurrent_first_calls__one_pool_started(monkeypatch):
+    # Given
+    import threading
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    import datetime_matcher.parallel
+
+    started_pools = []
+
+    class SlowToStartProcessPoolExecutor(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            # Widen the window in which another thread could start a second pool
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+            started_pools.append(self)
+
+    monkeypatch.setattr(datetime_matcher.parallel, 'ProcessPoolExecutor', SlowToStartProcessPoolExecutor)
+    barrier = threading.Barrier(4)
+    results = []
+    with DatetimeMatcher() as dtm:
+        def run():
+            barrier.wait()
+            results.append(list(dtm.parallel_sub(r'%Y', r'%y', ['1999'], workers=2)))
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        # When
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    # Then
+    assert results == [['99']] * 4
+    assert len(started_pools) == 1
+
+def test_parallel__default_locale__resolved_in_caller(monkeypatch):
+    # Given
+    import locale
+    from concurrent.futures import Future
+
+    import datetime_matcher.parallel
+
+    submitted_args = []
+
+    class InlineExecutor:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def submit(self, task, *args):
+            submitted_args.append(args)
+            future = Future()
+            future.set_result(task(*args))
+            return future
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(datetime_matcher.parallel, 'ProcessPoolExecutor', InlineExecutor)
+    with DatetimeMatcher() as dtm:
+        # When
+        actual_out = [
+            list(dtm.parallel_extract(r'%Y-%m-%d', ['2020-01-02'], workers=1)),
+            list(dtm.parallel_sub(r'%Y', r'%y', ['1999'], workers=1)),
+        ]
+    # Then
+    assert actual_out == [[[datetime(2020, 1, 2)]], ['99']]
+    current_locale_name = locale.setlocale(locale.LC_TIME)
+    assert submitted_args[0][2] == current_locale_name
+    assert submitted_args[1][2:4] == (current_locale_name, current_locale_name)
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+
+@pytest.mark.parametrize('dfregex, text', [
+    (r'(%Y)(%m)(%d)', 'x 20200102 y'),
+    (r'%Y(%m%d)', 'x 20200102 y'),
+    (r'%Y-?%m-?%d', 'x 20200102 y'),
+    (r'%Y-?%m-?%d', 'x 2020-01-02 y'),
+    (r'(?P<y>%Y)%m%d', 'x 20200102 y'),
+    (r'(%Y)%m', '202001'),
+    (r'%Y{2}', '20202021'),
+    (r'(?:%Y)+', '20202021'),
+    (r'%Y(?:-%m)?%d', '2020-0102'),
+    (r'%H:?%M', '1030'),
+    (r'x%-d?y', 'xy'),
+    (r'%H:%M%S?', '10:30'),
+    (r'(?:%-d )+x', '1 2 3 x'),
+    (r'v(?:%-m ){2}', 'v12 3 '),
+])
+def test_safe__adjacent_or_quantified_format_codes__same_match_as_default(dfregex, text):
+    # Given
+    default_dtm = DatetimeMatcher()
+    safe_dtm = DatetimeMatcher(is_safe=True)
+    # When
+    actual_out = safe_dtm.search(dfregex, text)
+    # Then
+    expected = default_dtm.search(dfregex, text)
+    assert expected is not None
+    assert actual_out is not None
+    assert actual_out.span() == expected.span()
+    assert safe_dtm.extract_datetime(dfregex, text) == default_dtm.extract_datetime(dfregex, text)
+
+def test_safe__grouped_format_codes__extract_whole_date():
+    # Given
+    safe_dtm = DatetimeMatcher(is_safe=True)
+    # When
+    actual_out = safe_dtm.extract_datetime(r'(%Y)(%m)(%d)', 'x 20200102 y')
+    # Then
+    assert actual_out == datetime(2020, 1, 2)
+
+@pytest.mark.parametrize('dfregex, text', [
+    (r'day %-d', 'day 123'),
+    (r'(%Y)', '202001'),
+    (r'^|(%-d)x', '123x'),
+])
+def test_safe__numbers_still_stand_on_their_own(dfregex, text):
+    # When
+    actual_out = DatetimeMatcher(is_safe=True).search(dfregex, text)
+    # Then
+    assert actual_out is None or actual_out.group() == ''
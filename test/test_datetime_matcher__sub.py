@@ -34,3 +34,47 @@ def test_sub__many_matches__subs_all():
     actual_out = DatetimeMatcher().sub(search_dfregex, replacement, text)
     # Then
     assert actual_out == expected_out
+
+def test_sub__groups_after_datetimes__numbered_as_in_search_regex():
+    # Given
+    search_dfregex = r'%Y-%m-%d_(\w+)_(\w+)\.txt'
+    replacement = r'\2_\1_%d.%m.%Y.txt'
+    text = r'2020-03-10_hello_world.txt'
+    expected_out = r'world_hello_10.03.2020.txt'
+    # When
+    actual_out = DatetimeMatcher().sub(search_dfregex, replacement, text)
+    # Then
+    assert actual_out == expected_out
+
+def test_sub__named_and_escaped_group_refs__preserved():
+    # Given
+    search_dfregex = r'%Y(?P<sep>-)%m(\w)'
+    replacement = r'\g<2>\g<sep>\\1%m'
+    text = r'2020-03x'
+    expected_out = 'x-\\103'
+    # When
+    actual_out = DatetimeMatcher().sub(search_dfregex, replacement, text)
+    # Then
+    assert actual_out == expected_out
+
+def test_sub__with_count__subs_only_first_matches():
+    # Given
+    search_dfregex = r'%Y-%m-%d'
+    replacement = r'%d/%m/%Y'
+    text = r'2020-03-10 2021-04-11 2022-05-12'
+    expected_out = r'10/03/2020 11/04/2021 2022-05-12'
+    # When
+    actual_out = DatetimeMatcher().sub(search_dfregex, replacement, text, 2)
+    # Then
+    assert actual_out == expected_out
+
+def test_sub__invalid_datetime__replacement_left_unformatted():
+    # Given
+    search_dfregex = r'%Y-%m-%d'
+    replacement = r'<%Y>'
+    text = r'2021-02-30 2021-02-28'
+    expected_out = r'<%Y> <2021>'
+    # When
+    actual_out = DatetimeMatcher().sub(search_dfregex, replacement, text)
+    # Then
+    assert actual_out == expected_out
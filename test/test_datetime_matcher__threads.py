@@ -0,0 +1,61 @@
+import _strptime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+
+DFREGEXES = [
+    r'%Y-%m-%d',
+    r'%d %b %Y %I:%M %p',
+    r'%A, %B %-d, %Y',
+    r'%Y%m%d_%H%M%S',
+    r'%Y-%m/%b',
+    r'%Y week %W day %w',
+]
+
+TEXTS = [
+    'on 2020-03-10 at 2021-12-31',
+    'Tue 10 Mar 2020 07:45 PM and 01 Jan 1999 12:00 AM',
+    'Wednesday, January 5, 2022',
+    'IMG_20200310_074512.jpg',
+    'filed 2020-01/Mar',
+    '2021 week 10 day 3',
+    'no datetimes here',
+]
+
+
+def _run_workload(dtmatcher):
+    results = []
+    for dfregex in DFREGEXES:
+        pattern = dtmatcher.compile(dfregex)
+        results.append(pattern.extract_datetimes_many(TEXTS))
+        results.append(pattern.sub_many(r'<%Y/%m/%d %H:%M>', TEXTS))
+        results.append([dtmatcher.extract_datetime(dfregex, text) for text in TEXTS])
+    return results
+
+
+def test_shared_matcher__many_threads__same_results_as_one_thread():
+    # Given
+    expected_out = _run_workload(DatetimeMatcher())
+    dtmatcher = DatetimeMatcher(cache_size=2)
+    # When
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        actual_outs = list(executor.map(lambda _: _run_workload(dtmatcher), range(64)))
+    # Then
+    assert all(actual_out == expected_out for actual_out in actual_outs)
+
+def test_extraction__does_not_use_strptime(monkeypatch):
+    # Given
+    def fail_strptime(*args):
+        raise AssertionError('strptime was called')
+
+    monkeypatch.setattr(_strptime, '_strptime_datetime', fail_strptime)
+    dtmatcher = DatetimeMatcher()
+    # When
+    actual_out = [
+        dtmatcher.compile(dfregex).extract_datetimes_many(TEXTS) for dfregex in DFREGEXES
+    ]
+    # Then
+    assert actual_out[1][1] == [datetime(2020, 3, 10, 19, 45), datetime(1999, 1, 1, 0, 0)]
+    assert actual_out[4][4] == [datetime(2020, 3, 1)]
+    assert actual_out[5][5] == [datetime(2021, 3, 10)]
@@ -0,0 +1,117 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.instrumentation import MatcherStats
+
+DFREGEX = rb'(?m)^%Y-%m-%d %H:%M:%S'
+
+
+def _write_log(tmp_path, num_lines, seed=0):
+    rng = random.Random(seed)
+    dt = datetime(2021, 6, 15)
+    lines = []
+    for idx in range(num_lines):
+        dt += timedelta(seconds=rng.choice([0, 1, 1, 2, 30]))
+        lines.append(f'{dt:%Y-%m-%d %H:%M:%S} INFO request {idx}'.encode())
+        if rng.random() < 0.1:
+            # A multi-line record, like a stack trace
+            lines.append(b'  at handler (' + str(idx).encode() + b')')
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'\n'.join(lines) + b'\n')
+    return path, lines
+
+
+def _brute_force(lines, start, end):
+    expected = []
+    current = None
+    for line in lines:
+        if line[:1].isdigit():
+            current = datetime.strptime(line[:19].decode(), '%Y-%m-%d %H:%M:%S')
+        if current is not None and start <= current < end:
+            expected.append(line)
+    return expected
+
+
+def test_search_time_range__random_ranges__same_as_scanning_everything(tmp_path):
+    # Given
+    path, lines = _write_log(tmp_path, 2000)
+    dtmatcher = DatetimeMatcher()
+    rng = random.Random(1)
+    first, last = datetime(2021, 6, 15), datetime(2021, 6, 15, 4)
+    for _ in range(50):
+        start = first + timedelta(seconds=rng.randrange(-100, 14400))
+        end = start + timedelta(seconds=rng.choice([0, 1, 60, 600, 20000]))
+        # When
+        actual_out = [line.line for line in dtmatcher.search_time_range(DFREGEX, path, start, end)]
+        # Then
+        assert actual_out == _brute_force(lines, start, end)
+
+def test_search_time_range__continuation_lines__kept_with_their_record(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(
+        b'2021-06-15 10:00:00 a\n'
+        b'  continued a\n'
+        b'2021-06-15 10:00:05 b\n'
+        b'  continued b\n'
+        b'2021-06-15 10:00:10 c'
+    )
+    # When
+    actual_out = list(DatetimeMatcher().search_time_range(DFREGEX, path, datetime(2021, 6, 15, 10, 0, 1), datetime(2021, 6, 15, 10, 0, 11)))
+    # Then
+    assert [(line.offset, line.line, line.datetime) for line in actual_out] == [
+        (36, b'2021-06-15 10:00:05 b', datetime(2021, 6, 15, 10, 0, 5)),
+        (58, b'  continued b', None),
+        (72, b'2021-06-15 10:00:10 c', datetime(2021, 6, 15, 10, 0, 10)),
+    ]
+
+def test_search_time_range__str_dfregex__encoded(tmp_path):
+    # Given
+    path, lines = _write_log(tmp_path, 100)
+    start, end = datetime(2021, 6, 15, 0, 0, 30), datetime(2021, 6, 15, 0, 2)
+    # When
+    actual_out = [line.line for line in DatetimeMatcher().search_time_range(r'(?m)^%Y-%m-%d %H:%M:%S', str(path), start, end)]
+    # Then
+    assert actual_out == _brute_force(lines, start, end)
+
+def test_search_time_range__open_file(tmp_path):
+    # Given
+    path, lines = _write_log(tmp_path, 100)
+    start, end = datetime(2021, 6, 15), datetime(2021, 6, 15, 0, 1)
+    # When
+    with open(path, 'rb') as log:
+        actual_out = [line.line for line in DatetimeMatcher().compile(DFREGEX).search_time_range(log, start, end)]
+    # Then
+    assert actual_out == _brute_force(lines, start, end)
+
+def test_search_time_range__scans_only_probes_and_range(tmp_path):
+    # Given
+    path, lines = _write_log(tmp_path, 20000)
+    stats = MatcherStats()
+    start = datetime(2021, 6, 15, 10)
+    # When
+    actual_out = list(DatetimeMatcher(hooks=stats).search_time_range(DFREGEX, path, start, start + timedelta(seconds=10)))
+    # Then
+    assert len(actual_out) == len(_brute_force(lines, start, start + timedelta(seconds=10)))
+    assert stats.info().stages['scan'].calls < 200
+
+@pytest.mark.parametrize('contents', [b'', b'no dates\nat all\n'])
+def test_search_time_range__nothing_dated__empty(tmp_path, contents):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_bytes(contents)
+    # When
+    actual_out = list(DatetimeMatcher().search_time_range(DFREGEX, path, datetime(2000, 1, 1), datetime(2100, 1, 1)))
+    # Then
+    assert actual_out == []
+
+def test_search_time_range__str_pattern__raises(tmp_path):
+    # Given
+    path, _ = _write_log(tmp_path, 10)
+    pattern = DatetimeMatcher().compile(r'%Y-%m-%d')
+    # When / Then
+    with pytest.raises(ValueError):
+        list(pattern.search_time_range(path, datetime(2000, 1, 1), datetime(2100, 1, 1)))
@@ -0,0 +1,53 @@
+import io
+import re
+from datetime import datetime
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.datetime_stream import iter_stream_matches
+
+LOG_TEXT = ''.join(
+    f'[2021-03-{1 + i % 28:02d} 10:{i % 60:02d}:00] événement numéro {i}\n' for i in range(200)
+)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1000, 100000])
+def test_iter_stream_matches__any_chunk_size__same_as_whole_text(chunk_size):
+    # Given
+    regex = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+    expected_out = [(match.start(), match.group()) for match in regex.finditer(LOG_TEXT)]
+    # When
+    actual_out = [
+        (offset, match.group())
+        for offset, match in iter_stream_matches(regex, io.StringIO(LOG_TEXT), chunk_size, overlap=32)
+    ]
+    # Then
+    assert actual_out == expected_out
+
+def test_iter_stream_matches__binary_split_multibyte__decoded_with_char_offsets():
+    # Given
+    regex = re.compile(r'é\w+')
+    stream = io.BytesIO(LOG_TEXT.encode('utf-8'))
+    expected_out = [(match.start(), match.group()) for match in regex.finditer(LOG_TEXT)]
+    # When
+    actual_out = [
+        (offset, match.group())
+        for offset, match in iter_stream_matches(regex, stream, chunk_size=5, overlap=16)
+    ]
+    # Then
+    assert actual_out == expected_out
+
+def test_extract_datetimes_from_file__path__records_with_offsets(tmp_path):
+    # Given
+    path = tmp_path / 'app.log'
+    path.write_text(LOG_TEXT, encoding='utf-8')
+    dfregex = r'%Y-%m-%d %H:%M:%S'
+    # When
+    actual_out = list(DatetimeMatcher().extract_datetimes_from_file(dfregex, path, chunk_size=50, overlap=32))
+    # Then
+    assert len(actual_out) == 200
+    assert actual_out[0].datetime == datetime(2021, 3, 1, 10, 0, 0)
+    assert actual_out[1].datetime == datetime(2021, 3, 2, 10, 1, 0)
+    for record in actual_out:
+        assert LOG_TEXT[record.offset:record.end] == record.datetime.strftime('%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,139 @@
+import io
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.delta_extractor import DeltaDatetimeExtractor, iter_ordered_records
+from datetime_matcher.model_types import DatetimeRecord
+
+# Each dfregex with a strftime format which produces text it matches
+DFREGEX_FORMATS = [
+    (r'%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S'),
+    (r'%Y-%m-%dT%H:%M:%S\.%f%z', '%Y-%m-%dT%H:%M:%S.%f%z'),
+    (r'%d/%b/%Y:%H:%M:%S', '%d/%b/%Y:%H:%M:%S'),
+    (r'%a %b %d %I:%M:%S %p %Y', '%a %b %d %I:%M:%S %p %Y'),
+    (r'%b %d %H:%M:%S', '%b %d %H:%M:%S'),
+    (r'%Y day %j %H:%M', '%Y day %j %H:%M'),
+    (r'%Y week %W day %w %H', '%Y week %W day %w %H'),
+    (r'%m %Y %b', '%m %Y %b'),
+]
+
+
+def _plain_and_delta(dfregex, texts):
+    pattern = DatetimeMatcher().compile(dfregex)
+    plan = pattern.extraction_plan
+    extractor = DeltaDatetimeExtractor(plan)
+    expected = [[pattern.extract_datetime(text)] for text in texts]
+    actual = [[extractor.extract_datetime_from_match(plan.regex.search(text), plan)] for text in texts]
+    return expected, actual
+
+
+@pytest.mark.parametrize('dfregex, strftime_format', DFREGEX_FORMATS)
+def test_extract_datetime_from_match__ordered__same_as_plain(dfregex, strftime_format):
+    # Given
+    rng = random.Random(0)
+    dt = datetime(2019, 12, 30, 22, 59, 58)
+    texts = []
+    for _ in range(500):
+        dt += timedelta(seconds=rng.choice([0, 0, 1, 7, 61, 3599, 86400, 2678400]), microseconds=rng.randrange(3))
+        texts.append(dt.replace(tzinfo=timezone_for(rng)).strftime(strftime_format))
+    # When
+    expected_out, actual_out = _plain_and_delta(dfregex, texts)
+    # Then
+    assert actual_out == expected_out
+
+@pytest.mark.parametrize('dfregex, strftime_format', DFREGEX_FORMATS)
+def test_extract_datetime_from_match__shuffled__same_as_plain(dfregex, strftime_format):
+    # Given
+    rng = random.Random(1)
+    texts = [
+        datetime(2000, 1, 1) + timedelta(seconds=rng.randrange(40 * 365 * 86400))
+        for _ in range(300)
+    ]
+    texts = [dt.replace(tzinfo=timezone_for(rng)).strftime(strftime_format) for dt in texts]
+    # When
+    expected_out, actual_out = _plain_and_delta(dfregex, texts)
+    # Then
+    assert actual_out == expected_out
+
+def test_extract_datetime_from_match__invalid_then_valid():
+    # Given
+    texts = ['2021-02-28', '2021-02-29', '2021-02-30', '2021-03-01', '2021-03-31', '2021-04-31', '2021-04-30']
+    # When
+    expected_out, actual_out = _plain_and_delta(r'%Y-%m-%d', texts)
+    # Then
+    assert actual_out == expected_out
+    assert [dts[0] is None for dts in actual_out] == [False, True, True, False, False, True, False]
+
+def test_extract_datetime_from_match__unchanged_values__same_object():
+    # Given
+    pattern = DatetimeMatcher().compile(r'%H:%M')
+    plan = pattern.extraction_plan
+    extractor = DeltaDatetimeExtractor(plan)
+    # When
+    first = extractor.extract_datetime_from_match(plan.regex.search('10:30'), plan)
+    second = extractor.extract_datetime_from_match(plan.regex.search('at 10:30'), plan)
+    # Then
+    assert first == datetime(1900, 1, 1, 10, 30)
+    assert first is second
+
+def test_iter_ordered_records__raise():
+    # Given
+    records = [_record(0, 1), _record(10, 3), _record(20, 2)]
+    # When / Then
+    with pytest.raises(ValueError, match='offset 20'):
+        list(iter_ordered_records(records))
+
+def test_iter_ordered_records__skip__compares_with_last_kept():
+    # Given
+    records = [_record(0, 1), _record(10, 5), _record(20, 2), _record(30, 4), _record(40, 5)]
+    reported = []
+    # When
+    actual_out = list(iter_ordered_records(records, 'skip', lambda previous, record: reported.append((previous.offset, record.offset))))
+    # Then
+    assert [record.offset for record in actual_out] == [0, 10, 40]
+    assert reported == [(10, 20), (10, 30)]
+
+def test_iter_ordered_records__keep__compares_with_previous():
+    # Given
+    records = [_record(0, 1), _record(10, 5), _record(20, 2), _record(30, 4), _record(40, 4)]
+    reported = []
+    # When
+    actual_out = list(iter_ordered_records(records, 'keep', lambda previous, record: reported.append(record.offset)))
+    # Then
+    assert actual_out == records
+    assert reported == [20]
+
+def test_iter_ordered_records__unknown_policy__raises():
+    # When / Then
+    with pytest.raises(ValueError):
+        list(iter_ordered_records([], 'sort'))
+
+def test_extract_ordered_datetimes_from_file():
+    # Given
+    log = io.StringIO(
+        '2021-06-15 08:30:01 GET /\n'
+        '2021-06-15 08:30:01 GET /a\n'
+        '2021-06-15 08:30:59 GET /b\n'
+        '2021-06-15 08:29:00 GET /late\n'
+        '2021-06-16 00:00:00 GET /c\n'
+    )
+    # When
+    actual_out = list(DatetimeMatcher().extract_ordered_datetimes_from_file(r'%Y-%m-%d %H:%M:%S', log, on_disorder='skip'))
+    # Then
+    assert [record.datetime for record in actual_out] == [
+        datetime(2021, 6, 15, 8, 30, 1),
+        datetime(2021, 6, 15, 8, 30, 1),
+        datetime(2021, 6, 15, 8, 30, 59),
+        datetime(2021, 6, 16),
+    ]
+    assert [record.offset for record in actual_out] == [0, 26, 53, 110]
+
+
+def timezone_for(rng):
+    return timezone(timedelta(minutes=rng.choice([0, 0, 0, 60, -330])))
+
+def _record(offset, day):
+    return DatetimeRecord(offset, offset + 10, datetime(2021, 1, day))
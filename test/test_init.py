@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+import datetime_matcher
+
+
+def test_import__package__defers_submodules():
+    # Given
+    statement = 'import sys, datetime_matcher; print(sorted(m for m in sys.modules if m.startswith("datetime_matcher.")))'
+    # When
+    result = subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True)
+    # Then
+    assert result.stdout.strip() == '[]'
+
+def test_import__public_name__loads_on_first_use():
+    # Given
+    statement = (
+        'import sys; from datetime_matcher import DatetimeMatcher; DatetimeMatcher(); '
+        'print(all(m not in sys.modules for m in ("datetime_matcher.parallel", "datetime_matcher.pattern_disk_cache", "multiprocessing")))'
+    )
+    # When
+    result = subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True)
+    # Then
+    assert result.stdout.strip() == 'True'
+
+def test_getattr__public_names():
+    # When
+    actual_out = [getattr(datetime_matcher, name).__name__ for name in datetime_matcher.__all__]
+    # Then
+    assert actual_out == ['DatetimeMatcher', 'DfregexPattern', 'DfregexSet', 'MatcherHooks', 'MatcherStats', 'MatcherStatsInfo']
+    assert set(datetime_matcher.__all__) <= set(dir(datetime_matcher))
+
+def test_getattr__unknown_name__raises_attribute_error():
+    # When / Then
+    with pytest.raises(AttributeError):
+        datetime_matcher.NotAName
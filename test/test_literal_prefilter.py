@@ -0,0 +1,67 @@
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.dfregex_lexer import DfregexLexer
+from datetime_matcher.literal_prefilter import extract_required_literals
+
+
+@pytest.mark.parametrize('dfregex, expected_literals', [
+    (r'ERROR ts=\[%Y-%m-%d\] (\w+)_backup_', ('ERROR ts=[', '_backup_', '] ', '-')),
+    (r'(foo%Ybar)?baz', ('baz',)),
+    (r'abc+d?e{2}x{y', ('x{y', 'ab')),
+    (r'%Y\%done', ('%done',)),
+    (r'[a-z]]x', (']x',)),
+    (r'\xffab\d{2}zz', ('ab', 'zz')),
+    (r'(a)\1bc', ('bc',)),
+    (r'%Y%m%d', ()),
+])
+def test_extract_required_literals__top_level_plain_runs(dfregex, expected_literals):
+    # Given
+    tokens = DfregexLexer().tokenize(dfregex)
+    # When
+    actual_out = extract_required_literals(tokens)
+    # Then
+    assert actual_out == expected_literals
+
+@pytest.mark.parametrize('dfregex', [r'ERROR %Y|WARN %Y', r'(?i)error %Y', r'(?x)error %Y', r'(?i:e)rror %Y'])
+def test_extract_required_literals__unreliable_literals__none(dfregex):
+    # Given
+    tokens = DfregexLexer().tokenize(dfregex)
+    # When
+    actual_out = extract_required_literals(tokens)
+    # Then
+    assert actual_out == ()
+
+def test_compile__required_literals__excluded_texts_same_results():
+    # Given
+    pattern = DatetimeMatcher().compile(r'(\w+)_backup_%Y-%m-%d\.tar')
+    texts = ['db_backup_2020-03-10.tar', 'db_backup-2020-03-10.tar', 'no date here', 'db_backup_2020-03-10.zip']
+    for text in texts:
+        # When
+        actual_search = pattern.search(text)
+        # Then
+        expected_search = pattern.regex.search(text)
+        assert (actual_search and actual_search.group()) == (expected_search and expected_search.group())
+        assert pattern.findall(text) == pattern.regex.findall(text)
+    assert pattern.required_literals == ('_backup_', '.tar', '-')
+    assert pattern.sub(r'%d/%m/%Y', 'no date here') == 'no date here'
+    assert pattern.extract_datetimes_many(texts) == [[pattern.extract_datetime(texts[0])], [], [], []]
+
+def test_compile__bytes_required_literals__bytes():
+    # Given
+    pattern = DatetimeMatcher().compile(rb'at %Y')
+    # When
+    actual_out = pattern.required_literals
+    # Then
+    assert actual_out == (b'at ',)
+    assert pattern.search(bytearray(b'at 2020')) is not None
+    assert pattern.search(b'on 2020') is None
+
+def test_compile_set__literal_gate__no_literal_no_match():
+    # Given
+    dfregex_set = DatetimeMatcher().compile_set([r'ERROR %Y', r'WARN %Y'])
+    # When
+    actual_out = [dfregex_set.search(text) for text in ['INFO 2020', 'WARN 2020']]
+    # Then
+    assert actual_out[0] is None
+    assert actual_out[1].pattern_index == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.pattern_cache import PatternCache
+
+
+def test_get__missing__returns_none_and_counts_miss():
+    # Given
+    cache = PatternCache(2)
+    # When
+    actual_out = cache.get(('%Y',))
+    # Then
+    assert actual_out is None
+    assert cache.cache_info().misses == 1
+
+def test_put__over_maxsize__evicts_least_recently_used():
+    # Given
+    dtm = DatetimeMatcher(cache_size=0)
+    cache = PatternCache(2)
+    cache.put(('%Y',), dtm.compile('%Y'))
+    cache.put(('%m',), dtm.compile('%m'))
+    cache.get(('%Y',))
+    # When
+    cache.put(('%d',), dtm.compile('%d'))
+    # Then
+    assert cache.get(('%m',)) is None
+    assert cache.get(('%Y',)) is not None
+    assert cache.get(('%d',)) is not None
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+    assert info.maxsize == 2
+
+def test_put__maxsize_zero__caches_nothing():
+    # Given
+    cache = PatternCache(0)
+    # When
+    cache.put(('%Y',), DatetimeMatcher(cache_size=0).compile('%Y'))
+    # Then
+    assert len(cache) == 0
+
+def test_init__negative_maxsize__raises():
+    with pytest.raises(ValueError):
+        PatternCache(-1)
+
+def test_matcher__repeated_calls__hit_cache():
+    # Given
+    dtm = DatetimeMatcher()
+    # When
+    for text in ['a_2020-Mar-10.jpg', 'b_2021-Apr-11.jpg', 'c_2022-May-12.jpg']:
+        dtm.sub(r'(\w+)_%Y-%b-%d\.jpg', r'%Y%m%d-\1.jpg', text)
+    # Then
+    info = dtm.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert dtm.compile(r'(\w+)_%Y-%b-%d\.jpg') is dtm.compile(r'(\w+)_%Y-%b-%d\.jpg')
+
+def test_matcher__purge__empties_cache():
+    # Given
+    dtm = DatetimeMatcher()
+    dtm.compile('%Y')
+    # When
+    dtm.purge()
+    # Then
+    assert dtm.cache_info().currsize == 0
@@ -0,0 +1,80 @@
+import os
+import pickle
+from datetime import datetime
+
+from datetime_matcher.datetime_matcher import DatetimeMatcher
+from datetime_matcher.pattern_disk_cache import PatternDiskCache
+
+
+def test_pickle__pattern__round_trips():
+    # Given
+    pattern = DatetimeMatcher().compile(r'(\w+)_%Y-%b-%d %I%p', is_name_case_insensitive=True)
+    # When
+    actual_out = pickle.loads(pickle.dumps(pattern))
+    # Then
+    assert actual_out.pattern == pattern.pattern
+    assert actual_out.is_name_case_insensitive
+    assert actual_out.extract_datetime('a_2020-MAR-10 10pm') == datetime(2020, 3, 10, 22)
+    assert actual_out.sub(r'%Y%m%d-\1', 'a_2020-Mar-10 10PM') == '20200310-a'
+
+def test_get__after_put__returns_equivalent_pattern(tmp_path):
+    # Given
+    cache = PatternDiskCache(tmp_path / 'cache')
+    cache.put(('%Y-%m-%d', False), DatetimeMatcher().compile('%Y-%m-%d'))
+    # When
+    actual_out = PatternDiskCache(tmp_path / 'cache').get(('%Y-%m-%d', False))
+    # Then
+    assert actual_out.extract_datetime('on 2020-03-10') == datetime(2020, 3, 10)
+    assert cache.get(('%Y-%m-%d', True)) is None
+
+def test_get__corrupt_entry__returns_none(tmp_path):
+    # Given
+    cache = PatternDiskCache(tmp_path)
+    cache.put(('%Y',), DatetimeMatcher().compile('%Y'))
+    for file_name in os.listdir(tmp_path):
+        (tmp_path / file_name).write_bytes(b'not a pickle')
+    # When
+    actual_out = cache.get(('%Y',))
+    # Then
+    assert actual_out is None
+
+def test_warm_cache_from_manifest__fills_disk_cache_for_other_matchers(tmp_path):
+    # Given
+    manifest_path = tmp_path / 'patterns.txt'
+    manifest_path.write_text('%Y-%m-%d\n\n(\\w+)_%H:%M\n', encoding='utf-8')
+    cache_dir = tmp_path / 'cache'
+    # When
+    actual_out = DatetimeMatcher(disk_cache_dir=cache_dir).warm_cache_from_manifest(manifest_path)
+    # Then
+    assert actual_out == 2
+    assert len(os.listdir(cache_dir)) == 2
+    other_dtm = DatetimeMatcher(disk_cache_dir=cache_dir)
+    assert other_dtm.extract_datetime(r'(\w+)_%H:%M', 'x_10:11') == datetime(1900, 1, 1, 10, 11)
+    assert len(os.listdir(cache_dir)) == 2
+
+def test_disk_cache__safe_mode__keyed_separately(tmp_path):
+    # Given
+    DatetimeMatcher(disk_cache_dir=tmp_path).compile('day %-d')
+    # When
+    actual_out = DatetimeMatcher(disk_cache_dir=tmp_path, is_safe=True).compile('day %-d')
+    # Then
+    assert actual_out.search('day 123') is None
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_disk_cache__default_locale__keyed_by_resolved_locale_name(tmp_path, monkeypatch):
+    # Given
+    import locale
+
+    current_locale_name = locale.setlocale(locale.LC_TIME)
+    DatetimeMatcher(disk_cache_dir=tmp_path).compile('%b %Y')
+
+    def setlocale(*args):
+        raise AssertionError('the disk cache must not read the locale itself')
+
+    # When
+    monkeypatch.setattr(locale, 'setlocale', setlocale)
+    actual_out = PatternDiskCache(tmp_path).get(('%b %Y', False, False, current_locale_name))
+    # Then
+    assert actual_out is not None
+    assert actual_out.locale == current_locale_name
+    assert len(os.listdir(tmp_path)) == 1
@@ -1,4 +1,8 @@
-from datetime_matcher.regex_generator import RegexGenerator
+import re
+import sys
+
+from datetime_matcher.model_types import DfregexToken
+from datetime_matcher.regex_generator import RegexGenerator, get_name_alternation_regex
 
 
 def test_sanity_no_capture(pipeline_of_data_factory):
@@ -79,4 +83,101 @@ def test_date_long_form_with_capture(pipeline_of_data_factory):
     # When
     actual_out = ''.join(RegexGenerator().generate_regex(tokens_in, True))
     # Then
-    assert actual_out == expected_out
\ No newline at end of file
+    assert actual_out == expected_out
+
+def test_bytes_regex_capture_dfs(pipeline_of_data_factory):
+    # Given
+    test_pipeline = dict(pipeline_of_data_factory('TEST_JPEG_FILE'))
+    tokens_in = test_pipeline['dftokens']
+    expected_out = test_pipeline['dt_extractor_regex'].encode('ascii')
+    # When
+    actual_out = RegexGenerator().generate_bytes_regex(tokens_in, True)
+    # Then
+    assert actual_out == expected_out
+
+def test_name_alternation__trie__factors_common_prefixes():
+    # Given
+    names_in = ['Jan', 'Jun', 'Jul', 'Mar', 'May']
+    # When
+    actual_out = get_name_alternation_regex(names_in)
+    # Then
+    assert actual_out == 'J(?:an|u[ln])|Ma[ry]'
+
+def test_name_alternation__prefix_name__prefers_longest():
+    # Given
+    names_in = ['Mar', 'March', 'Ma.']
+    # When
+    actual_out = get_name_alternation_regex(names_in)
+    # Then
+    assert actual_out == r'Ma(?:r(?:ch)?|\.)'
+    assert re.fullmatch(actual_out, 'March') is not None
+    assert re.match(actual_out, 'Marching').group() == 'March'
+
+def test_name_alternation__non_ascii_names__match_as_utf8_bytes():
+    # Given
+    names_in = ['Пн', 'Пт', 'Ср', 'M', 'Mä', 'ab', 'aé']
+    # When
+    actual_out = re.compile(get_name_alternation_regex(names_in).encode('utf-8'))
+    # Then
+    for name in names_in:
+        assert actual_out.fullmatch(name.encode('utf-8')) is not None, name
+    # A class or a quantifier must not apply to a single byte of a character
+    assert actual_out.fullmatch(b'a\xc3') is None
+    assert actual_out.fullmatch('П'.encode('utf-8') + b'\xd0') is None
+    assert actual_out.fullmatch(b'M\xc3') is None
+
+def test_name_case_insensitive__scoped_flag():
+    # Given
+    tokens_in = [DfregexToken('OTHER_REGEX_CHAR', 'X '), DfregexToken('DATETIME_FORMAT_CODE', '%p')]
+    # When
+    actual_out = RegexGenerator().generate_regex(tokens_in, False, is_name_case_insensitive=True)
+    # Then
+    assert actual_out == 'X (?:(?i:AM|PM))'
+
+def test_safe__numeric_run__digit_boundaries_and_atomic_groups():
+    # Given
+    tokens_in = [
+        DfregexToken('DATETIME_FORMAT_CODE', '%Y'),
+        DfregexToken('DATETIME_FORMAT_CODE', '%m'),
+        DfregexToken('OTHER_REGEX_CHAR', r'_\d+_'),
+        DfregexToken('DATETIME_FORMAT_CODE', '%-d'),
+    ]
+    atomic = (lambda part: f'(?>{part})') if sys.version_info >= (3, 11) else (lambda part: part)
+    # When
+    actual_out = RegexGenerator(is_safe=True).generate_regex(tokens_in, False)
+    # Then
+    assert actual_out == (
+        '(?:(?<![0-9])(?:[0-9]{4}))'
+        + '(?:' + atomic('(?:0[1-9]|1[0-2])') + '(?![0-9]))'
+        + r'_\d+_'
+        + '(?:' + atomic('(?:[12][0-9]|3[01]|[1-9])') + '(?![0-9]))'
+    )
+
+def test_safe__quantified_format_code__quantifier_applies_to_guards_too():
+    # Given
+    tokens_in = [
+        DfregexToken('DATETIME_FORMAT_CODE', '%Y'),
+        DfregexToken('OTHER_REGEX_CHAR', '?'),
+    ]
+    # When
+    actual_out = RegexGenerator(is_safe=True).generate_regex(tokens_in, False)
+    # Then
+    assert actual_out.startswith('(?:(?<![0-9])')
+    assert actual_out.endswith('(?![0-9]))?')
+
+def test_safe__repeated_format_code__not_guarded_against_digits():
+    # Given
+    tokens_in = [
+        DfregexToken('DATETIME_FORMAT_CODE', '%Y'),
+        DfregexToken('OTHER_REGEX_CHAR', '{2}'),
+    ]
+    # When
+    actual_out = RegexGenerator(is_safe=True).generate_regex(tokens_in, False)
+    # Then
+    assert actual_out == '(?:(?:[0-9]{4})){2}'
+def test_format_code_to_regex_map__shared_across_generators():
+    # When
+    actual_out = RegexGenerator().format_code_to_regex_map
+    # Then
+    assert actual_out is RegexGenerator(is_safe=True).format_code_to_regex_map
+    assert actual_out['b'] == get_name_alternation_regex(RegexGenerator().months_abbr)